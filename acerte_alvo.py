@@ -19,6 +19,13 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from atlas_sprites import blit_circle
+from particulas import ParticleSystem
+from roi_maos import HandROITracker
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +33,8 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 320
 WEBCAM_HEIGHT = 240
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
+SHOW_HAND_ROI = False  # Desenha na webcam o recorte usado pelo rastreamento de mãos (depuração)
 
 # Cores modernas
 DARK_BG = (15, 15, 25)
@@ -48,6 +57,8 @@ GAME_DURATION = 60  # Segundos
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
 pygame.display.set_caption("🎯 Acerte o Alvo")
 clock = pygame.time.Clock()
 
@@ -58,9 +69,10 @@ font_medium = pygame.font.Font(None, 50)
 font_small = pygame.font.Font(None, 40)
 font_tiny = pygame.font.Font(None, 30)
 
-# MediaPipe Hands
+# MediaPipe Hands (roda só num recorte em volta da mão, ver roi_maos.py)
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
+hands = HandROITracker(
+    inference_width=INFERENCE_WIDTH,
     static_image_mode=False,
     max_num_hands=2,
     min_detection_confidence=0.6,
@@ -103,9 +115,7 @@ class Target:
         if self.hit:
             # Animação de explosão
             size = int(self.size * 1.5)
-            alpha_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(alpha_surface, (*self.color, 100), (size, size), size)
-            surface.blit(alpha_surface, (self.x - size, self.y - size))
+            blit_circle(surface, self.color, (self.x, self.y), size, 100)
             return
         
         # Círculo pulsante
@@ -125,7 +135,7 @@ class Target:
         pygame.draw.circle(surface, TEXT_PRIMARY, (self.x, self.y), 8)
         
         # Pontos
-        points_text = font_small.render(str(self.points), True, TEXT_PRIMARY)
+        points_text = render_text(font_small, str(self.points), TEXT_PRIMARY)
         points_rect = points_text.get_rect(center=(self.x, self.y - self.size - 25))
         surface.blit(points_text, points_rect)
     
@@ -137,43 +147,19 @@ class Target:
             return self.points
         return 0
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-5, 5)
-        self.vy = random.uniform(-8, -2)
-        self.life = 1.0
-        self.color = color
-        self.size = random.randint(3, 8)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.3  # Gravidade
-        self.life -= 0.02
-        return self.life > 0
-    
-    def draw(self, surface):
-        alpha = int(self.life * 255)
-        color_with_alpha = (*self.color, alpha)
-        s = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, color_with_alpha, (self.size, self.size), self.size)
-        surface.blit(s, (int(self.x), int(self.y)))
-
 # --- Funções de UI ---
 def draw_rounded_rect(surface, color, rect, radius=20):
     pygame.draw.rect(surface, color, rect, border_radius=radius)
 
 def draw_text(surface, text, font, color, x, y, center=True):
-    text_obj = font.render(text, True, (0, 0, 0))
+    text_obj = render_text(font, text, (0, 0, 0))
     if center:
         rect = text_obj.get_rect(center=(x+3, y+3))
     else:
         rect = (x+3, y+3)
     surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -253,7 +239,7 @@ def main_menu():
 
 def game_loop():
     """Loop principal do jogo"""
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return
@@ -263,7 +249,7 @@ def game_loop():
     combo = 0
     max_combo = 0
     targets = []
-    particles = []
+    particles = ParticleSystem(gravity=0.3, decay=0.02)
     cursors = []
     
     game_start_time = time.time()
@@ -294,6 +280,8 @@ def game_loop():
         frame = cv2.flip(frame, 1)
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
+        if SHOW_HAND_ROI:
+            hands.draw_roi(frame)
         
         # Detecta mãos
         cursors = []
@@ -333,8 +321,7 @@ def game_loop():
                     hit_this_frame = True
                     
                     # Cria partículas
-                    for _ in range(15):
-                        particles.append(Particle(target.x, target.y, target.color))
+                    particles.emit_spray(target.x, target.y, target.color, 15)
         
         if not hit_this_frame:
             combo = 0
@@ -343,7 +330,7 @@ def game_loop():
         targets = [t for t in targets if not t.hit or (time.time() - t.spawn_time < 0.3)]
         
         # Atualiza partículas
-        particles = [p for p in particles if p.update()]
+        particles.update()
         
         # --- Renderização ---
         screen.fill(DARK_BG)
@@ -371,8 +358,7 @@ def game_loop():
         draw_text(screen, f"⏱️  {int(time_left)}s", font_large, time_color, SCREEN_WIDTH - 200, 80)
         
         # Desenha partículas (atrás)
-        for particle in particles:
-            particle.draw(screen)
+        particles.draw(screen)
         
         # Desenha alvos
         for target in targets:
@@ -384,8 +370,7 @@ def game_loop():
             draw_cursor(screen, cx, cy, colors[i % 2])
         
         # Webcam (pequena)
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -407,8 +392,10 @@ def game_loop():
 
 def show_results(score, max_combo):
     """Mostra resultados finais"""
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -459,7 +446,7 @@ def show_results(score, max_combo):
         draw_text(screen, "ESPAÇO para jogar novamente  |  ESC para sair", 
                   font_small, TEXT_SECONDARY, SCREEN_WIDTH//2, card_y + 580)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
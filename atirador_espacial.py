@@ -3,6 +3,9 @@
 Atire em alienígenas usando gestos das mãos!
 
 Controles: Movimente mãos para mirar | Feche o punho para atirar
+
+Modo estresse (mede o custo das colisões com centenas de inimigos e tiros):
+    python atirador_espacial.py --stress      # B alterna hash espacial / força bruta
 """
 
 # Suprime warnings do TensorFlow/MediaPipe
@@ -19,6 +22,14 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from cache_texto import render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from particulas import ParticleSystem
+from hash_espacial import SpatialHash, BruteForce
+from roi_maos import HandROITracker
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +37,8 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 320
 WEBCAM_HEIGHT = 240
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
+SHOW_HAND_ROI = False  # Desenha na webcam o recorte usado pelo rastreamento de mãos (depuração)
 
 # Cores espaciais
 SPACE_BG = (5, 5, 20)
@@ -42,10 +55,18 @@ PLAYER_SIZE = 60
 BULLET_SPEED = 15
 ENEMY_SPEED = 3
 FIRE_COOLDOWN = 15  # Frames entre tiros
+COLLISION_CELL = 100  # Célula do hash espacial (px), ~ diâmetro do maior inimigo
+
+# Modo estresse
+STRESS_MODE = '--stress' in sys.argv  # Também pode ser ligado aqui com True
+STRESS_ENEMIES = 400  # Inimigos mantidos na tela
+STRESS_BULLETS_PER_FRAME = 10  # Tiros automáticos disparados por frame
+STRESS_HUD_REFRESH = 0.5  # Segundos entre atualizações do texto de tempos (não enche o cache de texto)
 
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
 pygame.display.set_caption("🚀 Atirador Espacial")
 clock = pygame.time.Clock()
 
@@ -55,9 +76,10 @@ font_medium = pygame.font.Font(None, 50)
 font_small = pygame.font.Font(None, 40)
 font_tiny = pygame.font.Font(None, 30)
 
-# MediaPipe Hands
+# MediaPipe Hands (roda só num recorte em volta da mão, ver roi_maos.py)
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
+hands = HandROITracker(
+    inference_width=INFERENCE_WIDTH,
     static_image_mode=False,
     max_num_hands=2,
     min_detection_confidence=0.6,
@@ -109,9 +131,7 @@ class Player:
         # Escudo
         if self.shield > 0:
             shield_radius = self.size + 15
-            s = pygame.Surface((shield_radius * 2, shield_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*POWER_COLOR, 100), (shield_radius, shield_radius), shield_radius)
-            surface.blit(s, (self.x - shield_radius, self.y - shield_radius))
+            blit_circle(surface, POWER_COLOR, (self.x, self.y), shield_radius, 100)
         
         # Nave espacial
         points = [
@@ -172,9 +192,7 @@ class Bullet:
         for i, (tx, ty) in enumerate(self.trail):
             alpha = int(200 * (i / len(self.trail)))
             size = int(self.radius * (0.5 + 0.5 * i / len(self.trail)))
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*BULLET_COLOR, alpha), (size, size), size)
-            surface.blit(s, (tx - size, ty - size))
+            blit_circle(surface, BULLET_COLOR, (tx, ty), size, alpha)
         
         # Bala
         pygame.draw.circle(surface, BULLET_COLOR, (int(self.x), int(self.y)), self.radius)
@@ -201,9 +219,7 @@ class Enemy:
         wobble_x = math.sin(math.radians(self.angle)) * 10
         
         # Glow
-        s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, 80), (self.size, self.size), self.size)
-        surface.blit(s, (self.x + wobble_x - self.size, self.y - self.size))
+        blit_circle(surface, self.color, (self.x + wobble_x, self.y), self.size, 80)
         
         # Corpo
         pygame.draw.circle(surface, self.color, (int(self.x + wobble_x), int(self.y)), 
@@ -236,42 +252,12 @@ class Enemy:
         self.health -= 1
         return self.health <= 0
     
+    def collision_radius(self):
+        return self.size // 2
+    
     def check_collision_bullet(self, bullet):
         dist = math.sqrt((self.x - bullet.x)**2 + (self.y - bullet.y)**2)
-        return dist < self.size // 2 + bullet.radius
-
-class Explosion:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.particles = []
-        for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': 1.0,
-                'size': random.randint(3, 8)
-            })
-    
-    def update(self):
-        for p in self.particles:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['life'] -= 0.03
-        return any(p['life'] > 0 for p in self.particles)
-    
-    def draw(self, surface):
-        for p in self.particles:
-            if p['life'] > 0:
-                alpha = int(p['life'] * 255)
-                s = pygame.Surface((p['size'] * 2, p['size'] * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s, (*self.color, alpha), (p['size'], p['size']), p['size'])
-                surface.blit(s, (int(p['x'] - p['size']), int(p['y'] - p['size'])))
+        return dist < self.collision_radius() + bullet.radius
 
 # --- Detecção de Gestos ---
 def detect_fist(hand_landmarks):
@@ -293,11 +279,11 @@ def detect_fist(hand_landmarks):
 # --- UI ---
 def draw_text(surface, text, font, color, x, y, center=True, shadow=True):
     if shadow:
-        text_obj = font.render(text, True, (0, 0, 0))
+        text_obj = render_text(font, text, (0, 0, 0))
         rect = text_obj.get_rect(center=(x+2, y+2)) if center else (x+2, y+2)
         surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     rect = text_obj.get_rect(center=(x, y)) if center else (x, y)
     surface.blit(text_obj, rect)
 
@@ -326,9 +312,7 @@ def main_menu():
         
         card_x = SCREEN_WIDTH // 2 - 450
         card_y = 300
-        s = pygame.Surface((900, 450), pygame.SRCALPHA)
-        pygame.draw.rect(s, (20, 20, 40, 230), (0, 0, 900, 450), border_radius=20)
-        screen.blit(s, (card_x, card_y))
+        blit_overlay(screen, (20, 20, 40), 230, (card_x, card_y, 900, 450), border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, (card_x, card_y, 900, 450), 4, border_radius=20)
         
         instructions = [
@@ -357,7 +341,7 @@ def main_menu():
         clock.tick(FPS)
 
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return 0
@@ -366,7 +350,14 @@ def game_loop():
     player = Player()
     bullets = []
     enemies = []
-    explosions = []
+    explosions = ParticleSystem(decay=0.03)  # Partículas de todas as explosões
+    
+    broad_phases = {'hash': SpatialHash(COLLISION_CELL), 'força bruta': BruteForce()}
+    broad_phase_name = 'hash'
+    collision_times = {name: [] for name in broad_phases}  # ms por frame, por modo (só no modo estresse)
+    frame_times = {name: [] for name in broad_phases}
+    stress_text = ""
+    stress_text_refresh_at = 0.0
     
     score = 0
     enemies_escaped = 0
@@ -376,12 +367,17 @@ def game_loop():
     running = True
     
     while running and enemies_escaped < max_escaped and player.health > 0:
+        frame_start = time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                if event.key == pygame.K_b and STRESS_MODE:
+                    broad_phase_name = 'força bruta' if broad_phase_name == 'hash' else 'hash'
+                    print(f"💥 Colisões: {broad_phase_name}")
+                    stress_text_refresh_at = 0.0
         
         # Captura frame
         ret, frame = cap.read()
@@ -391,6 +387,8 @@ def game_loop():
         frame = cv2.flip(frame, 1)
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
+        if SHOW_HAND_ROI:
+            hands.draw_roi(frame)
         
         # Detecta mãos
         hand_positions = []
@@ -432,32 +430,48 @@ def game_loop():
         if frame_count % 60 == 0:
             enemies.append(Enemy())
         
+        if STRESS_MODE:
+            while len(enemies) < STRESS_ENEMIES:
+                enemy = Enemy()
+                enemy.y = random.uniform(-50, SCREEN_HEIGHT * 0.6)
+                enemies.append(enemy)
+            for _ in range(STRESS_BULLETS_PER_FRAME):
+                bullets.append(Bullet(random.uniform(0, SCREEN_WIDTH), SCREEN_HEIGHT))
+        
         # Atualiza objetos
         for star in stars:
             star.update()
         
         bullets = [b for b in bullets if b.update()]
         enemies = [e for e in enemies if e.update()]
-        explosions = [exp for exp in explosions if exp.update()]
-        
-        # Colisões
-        for bullet in bullets[:]:
-            for enemy in enemies[:]:
-                if enemy.check_collision_bullet(bullet):
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    if enemy.hit():
-                        score += 100
-                        explosions.append(Explosion(enemy.x, enemy.y, enemy.color))
-                        if enemy in enemies:
-                            enemies.remove(enemy)
-                    break
+        explosions.update()
+        
+        # Colisões: a fase larga só entrega os inimigos perto de cada tiro
+        collision_start = time.perf_counter()
+        broad_phase = broad_phases[broad_phase_name]
+        broad_phase.clear()
+        for enemy in enemies:
+            broad_phase.insert(enemy, enemy.x, enemy.y, enemy.collision_radius())
+        
+        spent = set()
+        for bullet, enemy in broad_phase.first_hits(bullets, Enemy.check_collision_bullet):
+            spent.add(bullet)
+            if enemy.hit():
+                score += 100
+                explosions.emit(enemy.x, enemy.y, enemy.color, 20)
+                broad_phase.remove(enemy)
+        if spent:
+            bullets = [b for b in bullets if b not in spent]
+            enemies = [e for e in enemies if e.health > 0]
+        if STRESS_MODE:
+            collision_times[broad_phase_name].append((time.perf_counter() - collision_start) * 1000)
         
         # Inimigos que escaparam
-        for enemy in enemies[:]:
-            if enemy.y > SCREEN_HEIGHT:
-                enemies_escaped += 1
-                enemies.remove(enemy)
+        escaped = [e for e in enemies if e.y > SCREEN_HEIGHT]
+        if escaped:
+            if not STRESS_MODE:
+                enemies_escaped += len(escaped)
+            enemies = [e for e in enemies if e.y <= SCREEN_HEIGHT]
         
         # --- Renderização ---
         screen.fill(SPACE_BG)
@@ -465,8 +479,7 @@ def game_loop():
         for star in stars:
             star.draw(screen)
         
-        for explosion in explosions:
-            explosion.draw(screen)
+        explosions.draw(screen)
         
         for enemy in enemies:
             enemy.draw(screen)
@@ -477,9 +490,7 @@ def game_loop():
         player.draw(screen)
         
         # HUD
-        hud_surf = pygame.Surface((SCREEN_WIDTH, 100), pygame.SRCALPHA)
-        pygame.draw.rect(hud_surf, (0, 0, 0, 150), (0, 0, SCREEN_WIDTH, 100))
-        screen.blit(hud_surf, (0, 0))
+        blit_overlay(screen, (0, 0, 0), 150, (0, 0, SCREEN_WIDTH, 100))
         
         draw_text(screen, f"PONTOS: {score}", font_large, TEXT_PRIMARY, 180, 50)
         
@@ -503,9 +514,19 @@ def game_loop():
                   (255, 100, 100) if enemies_escaped > 7 else TEXT_SECONDARY, 
                   SCREEN_WIDTH - 200, 50)
         
+        if STRESS_MODE:
+            if time.perf_counter() >= stress_text_refresh_at:
+                recent = collision_times[broad_phase_name][-30:]
+                recent_frames = frame_times[broad_phase_name][-30:]
+                stress_text = (f"COLISÃO ({broad_phase_name.upper()}, B alterna): "
+                               f"{sum(recent) / len(recent):.2f} ms | FRAME: "
+                               f"{sum(recent_frames) / max(len(recent_frames), 1):.1f} ms | "
+                               f"{len(enemies)} inimigos, {len(bullets)} tiros")
+                stress_text_refresh_at = time.perf_counter() + STRESS_HUD_REFRESH
+            draw_text(screen, stress_text, font_tiny, (255, 255, 0), SCREEN_WIDTH // 2, 120)
+        
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -514,11 +535,22 @@ def game_loop():
         pygame.draw.rect(screen, border_color, (webcam_x, webcam_y, WEBCAM_WIDTH, WEBCAM_HEIGHT), 4)
         
         pygame.display.flip()
+        if STRESS_MODE:
+            frame_times[broad_phase_name].append((time.perf_counter() - frame_start) * 1000)
         clock.tick(FPS)
     
     cap.release()
     cv2.destroyAllWindows()
     
+    if STRESS_MODE:
+        print("\n💥 Colisões no modo estresse (média por frame):")
+        for name in broad_phases:
+            if collision_times[name]:
+                print(f"   {name:12}: colisão {np.mean(collision_times[name]):6.2f} ms, "
+                      f"frame {np.mean(frame_times[name]):6.1f} ms ({len(collision_times[name])} frames)")
+            else:
+                print(f"   {name:12}: não usado")
+    
     return show_results(score, enemies_escaped < max_escaped and player.health > 0)
 
 def show_results(score, won):
@@ -541,9 +573,7 @@ def show_results(score, won):
         
         card_x = SCREEN_WIDTH // 2 - 450
         card_y = 250
-        s = pygame.Surface((900, 400), pygame.SRCALPHA)
-        pygame.draw.rect(s, (20, 20, 40, 240), (0, 0, 900, 400), border_radius=20)
-        screen.blit(s, (card_x, card_y))
+        blit_overlay(screen, (20, 20, 40), 240, (card_x, card_y, 900, 400), border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, (card_x, card_y, 900, 400), 5, border_radius=20)
         
         if won:
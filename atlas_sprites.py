@@ -0,0 +1,81 @@
+"""
+Atlas de sprites de círculos translúcidos (rastros, partículas e brilhos)
+Os efeitos dos jogos criavam um pygame.Surface(SRCALPHA) novo para cada ponto
+de rastro / partícula em todo frame. Aqui cada combinação (cor, raio, alfa) é
+desenhada uma vez e reaproveitada; raio e alfa são quantizados para que o
+número de sprites diferentes continue pequeno.
+
+Uso:
+    from atlas_sprites import blit_circle
+    blit_circle(surface, cor, (x, y), raio, alfa)        # Centralizado em (x, y)
+    blit_circle(surface, cor, (x, y), raio, alfa, 5)     # Anel com 5 px de espessura
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# --- Configurações ---
+ALPHA_LEVELS = 16  # Níveis de transparência distintos (0-255 quantizado)
+EXACT_RADIUS = 24  # Raios até aqui são exatos; acima, arredondados para RADIUS_STEP
+RADIUS_STEP = 2
+MAX_SPRITES = 2048  # Sprites guardados antes de descartar os menos usados
+
+
+def quantize_alpha(alpha):
+    step = 255 / (ALPHA_LEVELS - 1)
+    return int(round(round(min(max(alpha, 0), 255) / step) * step))
+
+
+def quantize_radius(radius):
+    radius = int(round(radius))
+    if radius <= EXACT_RADIUS:
+        return radius
+    return int(round(radius / RADIUS_STEP) * RADIUS_STEP)
+
+
+class SpriteAtlas:
+    """Sprites de círculo prontos, indexados por (cor, raio, alfa, espessura)."""
+
+    def __init__(self, max_sprites=MAX_SPRITES):
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.built = 0
+
+    def circle(self, color, radius, alpha=255, width=0):
+        """Sprite (2r x 2r) do círculo, ou None se ele seria invisível."""
+        radius = quantize_radius(radius)
+        alpha = quantize_alpha(alpha)
+        if radius <= 0 or alpha == 0:
+            return None
+
+        key = (tuple(color[:3]), radius, alpha, width)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*key[0], alpha), (radius, radius), radius, width)
+        self._sprites[key] = sprite
+        self.built += 1
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def stats(self):
+        return {'sprites': len(self._sprites), 'built': self.built, 'hits': self.hits}
+
+
+atlas = SpriteAtlas()
+
+
+def blit_circle(surface, color, center, radius, alpha=255, width=0):
+    """Desenha um círculo translúcido centrado em `center` a partir do atlas."""
+    sprite = atlas.circle(color, radius, alpha, width)
+    if sprite is None:
+        return
+    half = sprite.get_width() // 2
+    surface.blit(sprite, (int(center[0]) - half, int(center[1]) - half))
@@ -0,0 +1,210 @@
+"""
+Backends de inferência YOLO usados pelo servidor de detecção
+    'torch'     - PyTorch/Ultralytics (padrão; FP16 automático em CUDA)
+    'onnx'      - modelo exportado para ONNX rodando no onnxruntime (CPU / OpenVINO)
+    'onnx-int8' - mesmo ONNX com quantização dinâmica INT8 (mais rápido em CPU)
+
+A exportação é feita uma vez e fica em cache em modelos_cache/; as execuções
+seguintes só carregam o arquivo .onnx.
+"""
+
+import ast
+import os
+import time
+
+import cv2
+import numpy as np
+
+YOLO_BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+# --- Configurações ---
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modelos_cache')
+LETTERBOX_COLOR = 114  # Cor de preenchimento usada no treino do YOLO
+
+
+def empty_detections():
+    return (np.zeros((0, 4), dtype=np.float32),
+            np.zeros(0, dtype=np.float32),
+            np.zeros(0, dtype=np.int32))
+
+
+class TorchBackend:
+    """Modelo .pt via Ultralytics, como os jogos usavam originalmente."""
+
+    def __init__(self, model_path):
+        from ultralytics import YOLO
+        import torch
+
+        self.model = YOLO(model_path)
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.model.to(self.device)
+        self.names = self.model.names
+
+    def detect(self, frames, conf, iou, imgsz, max_det, classes=None):
+        results = self.model(frames, conf=conf, iou=iou, imgsz=imgsz, max_det=max_det,
+                             classes=classes, verbose=False, half=self.device == 'cuda')
+        detections = []
+        for r in results:
+            if r.boxes is None or len(r.boxes) == 0:
+                detections.append(empty_detections())
+                continue
+            boxes = r.boxes
+            detections.append((boxes.xyxy.cpu().numpy().astype(np.float32),
+                               boxes.conf.cpu().numpy().astype(np.float32),
+                               boxes.cls.cpu().numpy().astype(np.int32)))
+        return detections
+
+
+# --- ONNX ---
+def export_onnx(model_path, imgsz=640, int8=False):
+    """
+    Exporta o modelo .pt para ONNX (lote dinâmico) e, opcionalmente, quantiza
+    para INT8. Reutiliza o arquivo em cache se ele for mais novo que o .pt.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    base = os.path.splitext(os.path.basename(model_path))[0]
+    onnx_path = os.path.join(CACHE_DIR, f"{base}_{imgsz}.onnx")
+    int8_path = os.path.join(CACHE_DIR, f"{base}_{imgsz}_int8.onnx")
+
+    if not _cache_valid(onnx_path, model_path):
+        from ultralytics import YOLO
+
+        print(f"Exportando {model_path} para ONNX (só na primeira vez)...")
+        exported = YOLO(model_path).export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+        os.replace(exported, onnx_path)
+
+    if not int8:
+        return onnx_path
+
+    if not _cache_valid(int8_path, onnx_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("Quantizando o modelo ONNX para INT8...")
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+    return int8_path
+
+
+def _cache_valid(path, source):
+    if not os.path.exists(path):
+        return False
+    return not os.path.exists(source) or os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def letterbox(frame, size):
+    """Redimensiona mantendo a proporção e centraliza num quadrado size x size."""
+    h, w = frame.shape[:2]
+    ratio = min(size / h, size / w)
+    new_w, new_h = round(w * ratio), round(h * ratio)
+    left, top = (size - new_w) // 2, (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), LETTERBOX_COLOR, dtype=np.uint8)
+    canvas[top:top + new_h, left:left + new_w] = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    return canvas, ratio, left, top
+
+
+class OnnxBackend:
+    """
+    Modelo ONNX no onnxruntime, com o mesmo pré/pós-processamento do Ultralytics
+    (letterbox, limiar de confiança, NMS por classe e max_det).
+    O tamanho de entrada é fixado na exportação; o imgsz do pedido é ignorado.
+    """
+
+    def __init__(self, model_path, imgsz=640, int8=False):
+        import onnxruntime as ort
+
+        onnx_path = export_onnx(model_path, imgsz=imgsz, int8=int8)
+        available = ort.get_available_providers()
+        providers = [p for p in ('OpenVINOExecutionProvider', 'CPUExecutionProvider') if p in available]
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+        self.imgsz = imgsz
+        self.device = 'openvino' if providers[0].startswith('OpenVINO') else 'cpu'
+        if int8:
+            self.device += '-int8'
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = _class_names(metadata, model_path, onnx_path)
+
+    def detect(self, frames, conf, iou, imgsz, max_det, classes=None):
+        boxes_info = []
+        canvases = []
+        for frame in frames:
+            canvas, ratio, left, top = letterbox(frame, self.imgsz)
+            canvases.append(canvas)
+            boxes_info.append((ratio, left, top, frame.shape[1], frame.shape[0]))
+
+        blob = cv2.dnn.blobFromImages(canvases, 1 / 255.0, swapRB=True)
+        outputs = self.session.run(None, {self.input_name: blob})[0]  # (B, 4 + classes, N)
+
+        return [self._postprocess(out, info, conf, iou, max_det, classes)
+                for out, info in zip(outputs, boxes_info)]
+
+    def _postprocess(self, output, info, conf_thres, iou_thres, max_det, classes):
+        ratio, left, top, width, height = info
+        pred = output.T  # (N, 4 + classes)
+        scores = pred[:, 4:]
+        cls = scores.argmax(axis=1)
+        conf = scores[np.arange(len(cls)), cls]
+
+        mask = conf >= conf_thres
+        if classes is not None:
+            mask &= np.isin(cls, classes)
+        if not mask.any():
+            return empty_detections()
+        pred, cls, conf = pred[mask], cls[mask], conf[mask]
+
+        # cx, cy, w, h (espaço do letterbox) -> x, y, w, h para o NMS
+        xywh = pred[:, :4].copy()
+        xywh[:, 0] -= xywh[:, 2] / 2
+        xywh[:, 1] -= xywh[:, 3] / 2
+        keep = cv2.dnn.NMSBoxesBatched(xywh.tolist(), conf.tolist(), cls.tolist(), conf_thres, iou_thres)
+        keep = np.array(keep, dtype=np.int64).reshape(-1)[:max_det]
+        if len(keep) == 0:
+            return empty_detections()
+
+        xywh, cls, conf = xywh[keep], cls[keep], conf[keep]
+        xyxy = np.empty_like(xywh)
+        xyxy[:, 0] = (xywh[:, 0] - left) / ratio
+        xyxy[:, 1] = (xywh[:, 1] - top) / ratio
+        xyxy[:, 2] = (xywh[:, 0] + xywh[:, 2] - left) / ratio
+        xyxy[:, 3] = (xywh[:, 1] + xywh[:, 3] - top) / ratio
+        xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, width)
+        xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, height)
+        return xyxy.astype(np.float32), conf.astype(np.float32), cls.astype(np.int32)
+
+
+def _class_names(metadata, model_path, onnx_path):
+    """
+    Nomes das classes gravados pelo Ultralytics nos metadados do ONNX; sem eles,
+    os do modelo .pt original (os jogos procuram as classes pelo nome).
+    """
+    names = ast.literal_eval(metadata['names']) if 'names' in metadata else {}
+    if not names and os.path.exists(model_path):
+        from ultralytics import YOLO
+
+        print(f"⚠️ {os.path.basename(onnx_path)} sem nomes de classes; usando os de {model_path}")
+        names = YOLO(model_path).names
+    if not names:
+        raise ValueError(f"Modelo ONNX sem nomes de classes: {onnx_path} "
+                         f"(apague o arquivo para exportar de novo a partir de {model_path})")
+    return dict(names)
+
+
+def load_backend(name, model_path, imgsz=640):
+    """Cria o backend pelo nome ('torch', 'onnx' ou 'onnx-int8')."""
+    if name not in YOLO_BACKENDS:
+        raise ValueError(f"Backend YOLO inválido: {name} (use um de {YOLO_BACKENDS})")
+    if name == 'torch':
+        return TorchBackend(model_path)
+    return OnnxBackend(model_path, imgsz=imgsz, int8=name == 'onnx-int8')
+
+
+def warm_up(backend, imgsz=640):
+    """A primeira inferência é sempre mais lenta; roda uma vez no vazio. Retorna os segundos gastos."""
+    dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    backend.detect([dummy], conf=0.25, iou=0.45, imgsz=imgsz, max_det=10)
+    return time.perf_counter() - start
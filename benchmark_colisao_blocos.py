@@ -0,0 +1,156 @@
+"""
+Benchmark da colisão bola x blocos (lista com força bruta x grade com varredura)
+Simula bolas quicando numa arena cheia de blocos, sem janela nem câmera, e
+mede o tempo de colisão por frame nas duas versões:
+  - lista:  todo bloco testado contra toda bola, blocks.remove() (como era)
+  - grade:  BlockGrid.sweep() só nas células atravessadas, remoção O(1)
+
+Também roda com bolas rápidas (passo maior que a altura do bloco): a versão
+discreta deixa passar blocos (tunelamento), a varredura não.
+
+Uso:
+    python benchmark_colisao_blocos.py          # 60 frames por cenário
+    python benchmark_colisao_blocos.py 200      # 200 frames por cenário
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from grade_blocos import BlockGrid
+
+BLOCK_WIDTH = 90
+BLOCK_HEIGHT = 30
+BALL_RADIUS = 12
+GRIDS = ((6, 14), (30, 70), (60, 140))  # (linhas, colunas)
+BALL_COUNTS = (1, 20, 200)
+SPEEDS = {'normal': 8, 'rápida': 45}
+
+
+class SimBlock:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.width = BLOCK_WIDTH
+        self.height = BLOCK_HEIGHT
+
+
+def make_balls(count, speed, rows, width, height, seed):
+    """Bolas espalhadas na faixa livre abaixo dos blocos, subindo."""
+    rng = random.Random(seed)
+    top = rows * BLOCK_HEIGHT + 2 * BALL_RADIUS
+    balls = []
+    for _ in range(count):
+        vx = rng.uniform(-1, 1) * speed
+        balls.append([rng.uniform(BALL_RADIUS, width - BALL_RADIUS),
+                      rng.uniform(top, height - BALL_RADIUS), vx, -abs(speed)])
+    return balls
+
+
+def move(ball, width, height):
+    ball[0] += ball[2]
+    ball[1] += ball[3]
+    if ball[0] < BALL_RADIUS or ball[0] > width - BALL_RADIUS:
+        ball[2] *= -1
+        ball[0] = min(max(ball[0], BALL_RADIUS), width - BALL_RADIUS)
+    if ball[1] < BALL_RADIUS or ball[1] > height - BALL_RADIUS:
+        ball[3] *= -1
+        ball[1] = min(max(ball[1], BALL_RADIUS), height - BALL_RADIUS)
+
+
+def run_list(rows, cols, balls, frames):
+    width, height = cols * BLOCK_WIDTH, (rows + 10) * BLOCK_HEIGHT
+    blocks = []
+    shadow = BlockGrid(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT, rows, cols)  # Só para contar o tunelamento
+    for r in range(rows):
+        for c in range(cols):
+            block = SimBlock(c * BLOCK_WIDTH, r * BLOCK_HEIGHT)
+            blocks.append(block)
+            shadow.add(block, r, c)
+    hits = 0
+    tunneled = 0
+    times = []
+    for _ in range(frames):
+        steps = []
+        start = time.perf_counter()
+        for ball in balls:
+            prev = (ball[0], ball[1])
+            move(ball, width, height)
+            hit = False
+            for block in blocks[:]:
+                if (ball[0] + BALL_RADIUS > block.x and ball[0] - BALL_RADIUS < block.x + block.width and
+                        ball[1] + BALL_RADIUS > block.y and ball[1] - BALL_RADIUS < block.y + block.height):
+                    ball[3] *= -1
+                    blocks.remove(block)
+                    shadow.remove(block)
+                    hits += 1
+                    hit = True
+                    break
+            steps.append((prev, (ball[0], ball[1]), hit))
+        times.append(time.perf_counter() - start)
+
+        # Fora do tempo medido: trechos que cruzaram um bloco sem detectar
+        for (x0, y0), (x1, y1), hit in steps:
+            if not hit and shadow.sweep(x0, y0, x1, y1, BALL_RADIUS):
+                tunneled += 1
+    return np.array(times) * 1000, hits, tunneled
+
+
+def run_grid(rows, cols, balls, frames):
+    width, height = cols * BLOCK_WIDTH, (rows + 10) * BLOCK_HEIGHT
+    grid = BlockGrid(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT, rows, cols)
+    for r in range(rows):
+        for c in range(cols):
+            grid.add(SimBlock(c * BLOCK_WIDTH, r * BLOCK_HEIGHT), r, c)
+    hits = 0
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        for ball in balls:
+            prev_x, prev_y = ball[0], ball[1]
+            move(ball, width, height)
+            hit = grid.sweep(prev_x, prev_y, ball[0], ball[1], BALL_RADIUS)
+            if hit:
+                block, t, axis = hit
+                t = max(0.0, t - 0.01)
+                ball[0] = prev_x + (ball[0] - prev_x) * t
+                ball[1] = prev_y + (ball[1] - prev_y) * t
+                ball[2 if axis == 'x' else 3] *= -1
+                grid.remove(block)
+                hits += 1
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000, hits, 0
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    print("\n" + "="*78)
+    print(f"BENCHMARK DE COLISÃO BOLA x BLOCOS  ({frames} frames por cenário)")
+    print("="*78)
+    print(f"\n{'Grade':>9} {'Bolas':>6} {'Bola':>7} {'Lista ms':>9} {'Grade ms':>9} {'Ganho':>7} "
+          f"{'Acertos':>8} {'Atravessou':>11}")
+    print("-"*78)
+
+    for rows, cols in GRIDS:
+        width, height = cols * BLOCK_WIDTH, (rows + 10) * BLOCK_HEIGHT
+        for count in BALL_COUNTS:
+            for speed_name, speed in SPEEDS.items():
+                seed = rows * 1000 + count
+                list_ms, _, tunneled = run_list(rows, cols, make_balls(count, speed, rows, width, height, seed), frames)
+                grid_ms, grid_hits, _ = run_grid(rows, cols, make_balls(count, speed, rows, width, height, seed), frames)
+                gain = list_ms.mean() / max(grid_ms.mean(), 1e-6)
+                print(f"{rows:>4}x{cols:<4} {count:6d} {speed_name:>7} {list_ms.mean():9.3f} {grid_ms.mean():9.3f} "
+                      f"{gain:6.1f}x {grid_hits:8d} {tunneled:11d}")
+        print()
+
+    print("Tempo = colisão de todas as bolas em um frame (movimento incluído).")
+    print("Acertos: blocos quebrados pela grade. Atravessou: passos em que a lista (que só testa")
+    print("a posição final de cada frame) cruzou um bloco sem detectar a colisão.")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark dos modos de pré-processamento da Caça ao Objeto
+Compara latência de cada modo e a qualidade da detecção YOLO resultante,
+usando o modo 'full' (denoising em resolução cheia, comportamento antigo) como referência.
+
+Uso:
+    python benchmark_preprocessamento.py              # 60 frames da webcam
+    python benchmark_preprocessamento.py 120          # 120 frames da webcam
+    python benchmark_preprocessamento.py pasta/       # Imagens .jpg/.png de uma pasta
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from captura_camera import CameraStream
+from preprocessamento import FramePreprocessor, PREPROCESS_MODES
+from servidor_yolo import DetectionClient
+
+DEFAULT_FRAMES = 60
+IOU_MATCH = 0.5  # IoU mínimo para considerar a mesma detecção da referência
+DETECTION_CONFIDENCE = 0.45  # Mesmo critério de caçaobjeto.py
+MIN_AREA = 5000
+
+
+def load_frames():
+    if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]):
+        folder = sys.argv[1]
+        names = sorted(n for n in os.listdir(folder) if n.lower().endswith(('.jpg', '.jpeg', '.png')))
+        frames = [cv2.imread(os.path.join(folder, n)) for n in names]
+        return [f for f in frames if f is not None]
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FRAMES
+    cap = CameraStream(0, width=1280, height=720)
+    if not cap.isOpened():
+        print("❌ Erro ao abrir a webcam!")
+        sys.exit()
+
+    print(f"📷 Capturando {count} frames...")
+    frames = []
+    last_id = 0
+    while len(frames) < count:
+        last_id, frame = cap.read_latest(last_id, timeout=1.0)
+        if frame is None:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def box_iou(a, b):
+    """IoU entre cada caixa de a (N, 4) e cada caixa de b (M, 4)."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def count_matches(detection, reference):
+    """Detecções que coincidem (mesma classe e IoU >= IOU_MATCH) com a referência."""
+    if len(detection) == 0 or len(reference) == 0:
+        return 0
+    iou = box_iou(detection.xyxy, reference.xyxy)
+    same_class = detection.cls[:, None] == reference.cls[None, :]
+    return int(((iou >= IOU_MATCH) & same_class).any(axis=1).sum())
+
+
+def has_valid_detection(detection):
+    """Frame que encerraria uma rodada no jogo (confiança e área mínimas)."""
+    boxes = detection.as_array()
+    return bool(((boxes['conf'] >= DETECTION_CONFIDENCE) & (boxes['area'] > MIN_AREA)).any())
+
+
+def run_mode(mode, frames, detector):
+    preprocessor = FramePreprocessor(mode)
+    latencies = []
+    detections = []
+    for frame in frames:
+        start = time.perf_counter()
+        processed = preprocessor.process(frame.copy())
+        latencies.append(time.perf_counter() - start)
+        detections.append(detector.detect(processed))
+    return np.array(latencies) * 1000, detections
+
+
+def main():
+    frames = load_frames()
+    if not frames:
+        print("❌ Nenhum frame para testar")
+        return
+    h, w = frames[0].shape[:2]
+
+    print("Conectando ao servidor YOLO...")
+    detector = DetectionClient()
+
+    print("\n" + "="*78)
+    print(f"BENCHMARK DE PRÉ-PROCESSAMENTO  ({len(frames)} frames {w}x{h}, device: {detector.device})")
+    print("="*78)
+
+    results = {}
+    for mode in PREPROCESS_MODES:
+        print(f"⏳ Modo '{mode}'...")
+        results[mode] = run_mode(mode, frames, detector)
+
+    _, reference = results['full']
+    ref_total = sum(len(d) for d in reference)
+
+    print(f"\n{'Modo':12} {'Média ms':>9} {'p95 ms':>8} {'FPS máx':>8} {'Det/frame':>10} "
+          f"{'Precisão':>9} {'Recall':>7} {'Válidos':>8}")
+    print("-"*78)
+    for mode, (latencies, detections) in results.items():
+        total = sum(len(d) for d in detections)
+        matches = sum(count_matches(d, r) for d, r in zip(detections, reference))
+        precision = matches / total if total else 1.0
+        recall = matches / ref_total if ref_total else 1.0
+        valid = sum(has_valid_detection(d) for d in detections)
+        mean_ms = latencies.mean()
+        print(f"{mode:12} {mean_ms:9.1f} {np.percentile(latencies, 95):8.1f} "
+              f"{1000 / max(mean_ms, 1e-3):8.0f} {total / len(frames):10.2f} "
+              f"{precision:9.1%} {recall:7.1%} {valid:8d}")
+
+    print("\nPrecisão/Recall medidos contra o modo 'full' (referência antiga).")
+    print("'Válidos' = frames que encerrariam a rodada no jogo (conf >= 0.45 e área > 5000).")
+    print("="*78)
+    detector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark da resolução de inferência (MediaPipe e YOLO)
+Para cada modelo, roda os mesmos frames em várias larguras de inferência e
+compara latência e qualidade com a resolução cheia da câmera (referência).
+
+Uso:
+    python benchmark_resolucao.py              # 60 frames da webcam (1280x720)
+    python benchmark_resolucao.py 120          # 120 frames da webcam
+    python benchmark_resolucao.py pasta/       # Imagens .jpg/.png de uma pasta
+"""
+
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from benchmark_preprocessamento import count_matches, load_frames
+from inferencia_async import resize_for_inference
+from servidor_yolo import DetectionClient
+
+WIDTHS = (None, 960, 640, 480, 320)  # None = resolução da câmera (referência)
+
+MEDIAPIPE_MODELS = {
+    'hands': lambda: mp.solutions.hands.Hands(
+        max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6),
+    'pose': lambda: mp.solutions.pose.Pose(
+        min_detection_confidence=0.5, min_tracking_confidence=0.5),
+    'face_mesh': lambda: mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1, min_detection_confidence=0.5, min_tracking_confidence=0.5),
+}
+
+
+def first_landmarks(name, results):
+    """Landmarks (N, 2) normalizados da primeira mão/pose/rosto, ou None."""
+    if name == 'hands':
+        found = results.multi_hand_landmarks and results.multi_hand_landmarks[0]
+    elif name == 'pose':
+        found = results.pose_landmarks
+    else:
+        found = results.multi_face_landmarks and results.multi_face_landmarks[0]
+    if not found:
+        return None
+    return np.array([(lm.x, lm.y) for lm in found.landmark], dtype=np.float32)
+
+
+def run_mediapipe(name, frames, width):
+    model = MEDIAPIPE_MODELS[name]()
+    latencies = []
+    points = []
+    for frame in frames:
+        start = time.perf_counter()
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, width), cv2.COLOR_BGR2RGB)
+        results = model.process(frame_rgb)
+        latencies.append(time.perf_counter() - start)
+        points.append(first_landmarks(name, results))
+    model.close()
+    return np.array(latencies) * 1000, points
+
+
+def landmark_error(points, reference, frame_size):
+    """Erro médio (px do frame cheio) nos frames em que os dois detectaram."""
+    w, h = frame_size
+    errors = [np.linalg.norm((p - r) * (w, h), axis=1).mean()
+              for p, r in zip(points, reference)
+              if p is not None and r is not None and p.shape == r.shape]
+    return float(np.mean(errors)) if errors else float('nan')
+
+
+def run_yolo(detector, frames, width):
+    detector.inference_width = width
+    latencies = []
+    detections = []
+    for frame in frames:
+        start = time.perf_counter()
+        detections.append(detector.detect(frame))
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000, detections
+
+
+def width_label(width, frame_size):
+    w, h = frame_size
+    if width is None or width >= w:
+        return f"{w}x{h}"
+    return f"{width}x{round(h * width / w)}"
+
+
+def main():
+    frames = load_frames()
+    if not frames:
+        print("❌ Nenhum frame para testar")
+        return
+    h, w = frames[0].shape[:2]
+    frame_size = (w, h)
+
+    print("\n" + "="*78)
+    print(f"BENCHMARK DE RESOLUÇÃO DE INFERÊNCIA  ({len(frames)} frames {w}x{h})")
+    print("="*78)
+    print(f"\n{'Modelo':10} {'Entrada':>10} {'Média ms':>9} {'p95 ms':>8} {'FPS máx':>8} "
+          f"{'Detectou':>9} {'Erro px':>8} {'Recall':>7}")
+    print("-"*78)
+
+    for name in MEDIAPIPE_MODELS:
+        reference = None
+        for width in WIDTHS:
+            latencies, points = run_mediapipe(name, frames, width)
+            if reference is None:
+                reference = points
+            detected = sum(p is not None for p in points) / len(points)
+            error = landmark_error(points, reference, frame_size)
+            mean_ms = latencies.mean()
+            print(f"{name:10} {width_label(width, frame_size):>10} {mean_ms:9.1f} "
+                  f"{np.percentile(latencies, 95):8.1f} {1000 / max(mean_ms, 1e-3):8.0f} "
+                  f"{detected:9.1%} {error:8.1f} {'-':>7}")
+        print()
+
+    print("Conectando ao servidor YOLO...")
+    detector = DetectionClient()
+    reference = None
+    for width in WIDTHS:
+        latencies, detections = run_yolo(detector, frames, width)
+        if reference is None:
+            reference = detections
+        ref_total = sum(len(d) for d in reference)
+        matches = sum(count_matches(d, r) for d, r in zip(detections, reference))
+        recall = matches / ref_total if ref_total else 1.0
+        detected = sum(len(d) > 0 for d in detections) / len(detections)
+        mean_ms = latencies.mean()
+        print(f"{'yolo':10} {width_label(width, frame_size):>10} {mean_ms:9.1f} "
+              f"{np.percentile(latencies, 95):8.1f} {1000 / max(mean_ms, 1e-3):8.0f} "
+              f"{detected:9.1%} {'-':>8} {recall:7.1%}")
+    detector.close()
+
+    print("\nLatência inclui redução + conversão de cor (MediaPipe) ou envio + resposta (YOLO).")
+    print(f"Erro px: distância média dos landmarks à referência {w}x{h}, em pixels do frame cheio.")
+    print("Recall: caixas YOLO que coincidem com a referência (mesma classe e IoU >= 0.5).")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
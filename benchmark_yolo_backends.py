@@ -0,0 +1,78 @@
+"""
+Benchmark dos backends de inferência YOLO (PyTorch x ONNX Runtime x ONNX INT8)
+Carrega cada backend no próprio processo (sem o servidor) e mede latência,
+FPS e concordância das detecções com o PyTorch, usado como referência.
+
+Uso:
+    python benchmark_yolo_backends.py              # 60 frames da webcam
+    python benchmark_yolo_backends.py 120          # 120 frames da webcam
+    python benchmark_yolo_backends.py pasta/       # Imagens .jpg/.png de uma pasta
+"""
+
+import time
+
+import numpy as np
+
+from backends_yolo import YOLO_BACKENDS, load_backend, warm_up
+from benchmark_preprocessamento import count_matches, load_frames
+from servidor_yolo import DEFAULT_PARAMS, YOLO_MODEL, DetectionResult
+
+
+def run_backend(name, frames):
+    backend = load_backend(name, YOLO_MODEL, imgsz=DEFAULT_PARAMS['imgsz'])
+    warmup = warm_up(backend, imgsz=DEFAULT_PARAMS['imgsz'])
+
+    latencies = []
+    detections = []
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        xyxy, conf, cls = backend.detect([frame], **DEFAULT_PARAMS)[0]
+        latencies.append(time.perf_counter() - start)
+        detections.append(DetectionResult(i, xyxy, conf, cls, latencies[-1]))
+    return backend.device, warmup * 1000, np.array(latencies) * 1000, detections
+
+
+def main():
+    frames = load_frames()
+    if not frames:
+        print("❌ Nenhum frame para testar")
+        return
+    h, w = frames[0].shape[:2]
+
+    print("\n" + "="*78)
+    print(f"BENCHMARK DE BACKENDS YOLO  ({len(frames)} frames {w}x{h}, modelo: {YOLO_MODEL})")
+    print("="*78)
+
+    results = {}
+    for name in YOLO_BACKENDS:
+        print(f"⏳ Backend '{name}'...")
+        try:
+            results[name] = run_backend(name, frames)
+        except Exception as e:
+            print(f"   ⚠️ Não foi possível usar '{name}': {e}")
+
+    if 'torch' not in results:
+        print("❌ Backend de referência 'torch' indisponível")
+        return
+    _, _, torch_latencies, reference = results['torch']
+    ref_total = sum(len(d) for d in reference)
+    torch_fps = 1000 / max(torch_latencies.mean(), 1e-3)
+
+    print(f"\n{'Backend':10} {'Device':13} {'Aquec. ms':>9} {'Média ms':>9} {'p95 ms':>8} "
+          f"{'FPS':>6} {'Ganho':>6} {'Recall':>7}")
+    print("-"*78)
+    for name, (device, warmup_ms, latencies, detections) in results.items():
+        mean_ms = latencies.mean()
+        fps = 1000 / max(mean_ms, 1e-3)
+        matches = sum(count_matches(d, r) for d, r in zip(detections, reference))
+        recall = matches / ref_total if ref_total else 1.0
+        print(f"{name:10} {device:13} {warmup_ms:9.0f} {mean_ms:9.1f} "
+              f"{np.percentile(latencies, 95):8.1f} {fps:6.1f} {fps / torch_fps:5.2f}x {recall:7.1%}")
+
+    print("\nRecall medido contra o backend 'torch' (mesma classe e IoU >= 0.5).")
+    print("Use o mais rápido com recall aceitável em YOLO_BACKEND (caçaobjeto.py).")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
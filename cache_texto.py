@@ -0,0 +1,88 @@
+"""
+Cache LRU de superfícies de texto compartilhado pelos jogos
+font.render() é caro e a maior parte do texto desenhado por frame não muda
+(títulos, "ESC para sair", placar parado). O cache guarda a Surface pronta por
+(fonte, texto, cor, efeito) e descarta as menos usadas quando passa do limite.
+
+Uso:
+    from cache_texto import render_text
+    surface.blit(render_text(font, "Pontos: 10", WHITE), (x, y))
+
+Efeitos (sombra, brilho etc.) são funções builder(font, text, color) -> Surface
+registradas com register_effect(); o resultado também fica em cache.
+"""
+
+import atexit
+from collections import OrderedDict
+
+# --- Configurações ---
+MAX_ENTRIES = 512  # Superfícies guardadas antes de descartar as menos usadas
+PRINT_STATS_ON_EXIT = True  # Mostra acertos do cache ao fechar o jogo
+
+_effects = {}
+
+
+def register_effect(name, builder):
+    """Registra um efeito de texto: builder(font, text, color) -> Surface."""
+    _effects[name] = builder
+
+
+class TextCache:
+    """Cache LRU de font.render() com contadores de acerto/erro."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, effect=None):
+        key = (font, text, tuple(color), effect)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if effect is None:
+            surface = font.render(text, True, color)
+        else:
+            surface = _effects[effect](font, text, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._surfaces),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color, effect=None):
+    """font.render(text, True, color) com cache (ou o efeito registrado)."""
+    return text_cache.render(font, text, color, effect)
+
+
+def _print_stats():
+    stats = text_cache.stats()
+    if PRINT_STATS_ON_EXIT and stats['hits'] + stats['misses'] > 0:
+        print(f"📝 Cache de texto: {stats['hits']} renders evitados, {stats['misses']} renderizados "
+              f"({stats['hit_rate']:.1%} de acerto, {stats['evictions']} descartes)")
+
+
+atexit.register(_print_stats)
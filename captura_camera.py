@@ -0,0 +1,202 @@
+"""
+Captura de webcam em thread separada, compartilhada por todos os jogos
+Lê o cv2.VideoCapture em segundo plano para um buffer circular pré-alocado e
+entrega sempre o frame mais recente sem bloquear o loop de renderização
+
+Uso (substitui cv2.VideoCapture):
+    cap = CameraStream(0, width=1280, height=720)
+    ret, frame = cap.read()
+    cap.release()
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# --- Configurações ---
+DEFAULT_BUFFER_SIZE = 3  # Slots no buffer circular (mínimo 2)
+READ_FAILURE_LIMIT = 30  # Falhas seguidas de leitura antes de considerar a câmera perdida
+
+
+class CameraStream:
+    """
+    Captura contínua da webcam em uma thread daemon.
+
+    A thread escreve cada frame diretamente no próximo slot do buffer circular
+    (sem alocar novos arrays) e publica o índice do slot mais recente. O jogo
+    chama read() e recebe uma cópia do último frame imediatamente.
+    Frames capturados e nunca lidos são contados como descartados.
+    """
+
+    def __init__(self, src=0, width=None, height=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.src = src
+        self.buffer_size = max(2, buffer_size)
+
+        self._cap = cv2.VideoCapture(src)
+        if width is not None:
+            self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height is not None:
+            self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        self._cond = threading.Condition()
+        self._buffer = None
+        self._timestamps = [0.0] * self.buffer_size  # time.perf_counter() da captura de cada slot
+        self._latest_slot = -1
+        self._running = False
+        self._thread = None
+
+        # Contadores de desempenho
+        self.frame_id = 0  # Id do frame mais recente publicado
+        self._last_read_id = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0  # Capturados e sobrescritos antes de serem lidos
+        self.frames_repeated = 0  # Leituras que devolveram um frame já entregue
+        self.read_failures = 0
+        self._started_at = time.time()
+
+        if self._cap.isOpened():
+            self._start()
+
+    # --- Ciclo de vida ---
+    def _start(self):
+        """Lê o primeiro frame para dimensionar o buffer e inicia a thread."""
+        ret, frame = self._cap.read()
+        if not ret or frame is None:
+            self._cap.release()
+            return
+
+        self._allocate(frame.shape, frame.dtype)
+        np.copyto(self._buffer[0], frame)
+        self._publish(0, time.perf_counter())
+
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="CameraStream", daemon=True)
+        self._thread.start()
+
+    def _allocate(self, shape, dtype):
+        self._buffer = np.empty((self.buffer_size,) + tuple(shape), dtype=dtype)
+
+    def _capture_loop(self):
+        consecutive_failures = 0
+        while self._running:
+            slot = (self._latest_slot + 1) % self.buffer_size
+            target = self._buffer[slot]
+            ret, frame = self._cap.read(target)
+            captured_at = time.perf_counter()
+
+            if not ret or frame is None:
+                self.read_failures += 1
+                consecutive_failures += 1
+                if consecutive_failures >= READ_FAILURE_LIMIT:
+                    break
+                time.sleep(0.005)
+                continue
+            consecutive_failures = 0
+
+            # Resolução mudou: o OpenCV devolve um array novo em vez de usar o slot
+            if frame is not target and frame.shape != target.shape:
+                with self._cond:
+                    self._allocate(frame.shape, frame.dtype)
+                    np.copyto(self._buffer[slot], frame)
+                    self._publish(slot, captured_at)
+                continue
+            if frame is not target:
+                np.copyto(target, frame)
+
+            self._publish(slot, captured_at)
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _publish(self, slot, captured_at):
+        with self._cond:
+            if self.frame_id > self._last_read_id:
+                self.frames_dropped += 1
+                # O frame anterior não foi lido: ele não conta como pendente
+                self._last_read_id = self.frame_id
+            self._latest_slot = slot
+            self._timestamps[slot] = captured_at
+            self.frame_id += 1
+            self.frames_captured += 1
+            self._cond.notify_all()
+
+    def isOpened(self):
+        """
+        Compatível com cv2.VideoCapture.isOpened(): False depois que a thread de
+        captura termina (câmera perdida ou release()), mesmo que já tenha havido frames.
+        """
+        return self._buffer is not None and self._running
+
+    def release(self):
+        """Para a thread de captura e libera a câmera."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._cap.release()
+
+    # --- Leitura ---
+    def read(self):
+        """
+        Retorna (ret, frame) com uma cópia do frame mais recente, sem esperar
+        por um frame novo. Retorna (False, None) se a câmera foi perdida.
+        """
+        with self._cond:
+            if self._buffer is None or self._latest_slot < 0:
+                return False, None
+            if not self._running and self._thread is not None:
+                return False, None
+            return True, self._take_latest()
+
+    def read_latest(self, last_id=0, timeout=None):
+        """
+        Espera até existir um frame mais novo que last_id e retorna
+        (frame_id, frame). Usado por consumidores em outras threads (ex.: inferência).
+        Retorna (last_id, None) em caso de timeout ou câmera encerrada.
+        """
+        frame_id, frame, _ = self.read_latest_timed(last_id, timeout)
+        return frame_id, frame
+
+    def read_latest_timed(self, last_id=0, timeout=None):
+        """
+        Como read_latest(), mas retorna (frame_id, frame, captured_at), com o
+        time.perf_counter() do momento em que a câmera entregou o frame
+        (None junto com frame None).
+        """
+        with self._cond:
+            if self._buffer is None:
+                return last_id, None, None
+            ready = self._cond.wait_for(
+                lambda: self.frame_id > last_id or not self._running, timeout=timeout
+            )
+            if not ready or self.frame_id <= last_id:
+                return last_id, None, None
+            return self.frame_id, self._take_latest(), self._timestamps[self._latest_slot]
+
+    def _take_latest(self):
+        # Chamado com o lock adquirido: a thread de captura nunca escreve no slot publicado
+        if self._last_read_id == self.frame_id:
+            self.frames_repeated += 1
+        self._last_read_id = self.frame_id
+        return self._buffer[self._latest_slot].copy()
+
+    # --- Estatísticas ---
+    def stats(self):
+        """Contadores de captura para depuração de desempenho."""
+        elapsed = max(time.time() - self._started_at, 1e-6)
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'repeated': self.frames_repeated,
+            'read_failures': self.read_failures,
+            'capture_fps': self.frames_captured / elapsed,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -3,8 +3,12 @@ import pygame
 import sys
 import random
 import time
-from ultralytics import YOLO # Usaremos YOLOv5 da biblioteca ultralytics
-import torch # Necessário para verificar a disponibilidade de GPU
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from cache_texto import render_text
+from servidor_yolo import DetectionClient, detections_array # Modelo YOLOv5 fica carregado no servidor local
+from preprocessamento import FramePreprocessor
+from rastreamento import DetectionScheduler, BoxTracker
 
 # --- Configurações do Jogo ---
 SCREEN_WIDTH = 1280
@@ -19,7 +23,16 @@ MAX_ROUNDS = 10
 YOLO_CONFIDENCE = 0.35  # Threshold de confiança reduzido para detectar mais objetos
 YOLO_IOU = 0.4  # Threshold de IOU para NMS
 YOLO_IMGSZ = 640  # Tamanho da imagem para inferência
+INFERENCE_WIDTH = 640  # Largura do frame enviado ao YOLO (a webcam e o preview continuam em 1280x720)
 DETECTION_CONFIDENCE = 0.45  # Confiança mínima para considerar objeto encontrado
+MIN_BOX_AREA = 5000  # Área mínima (px) para evitar falsos positivos
+PREPROCESS_MODE = 'adaptive'  # none, full, downscaled, bilateral, temporal ou adaptive (ver preprocessamento.py)
+DETECTION_INTERVAL = 5  # YOLO roda a cada N frames (mínimo); o rastreador cobre os intermediários
+ADAPTIVE_INTERVAL = True  # Ajusta o intervalo pela latência medida do servidor
+YOLO_BACKEND = 'torch'  # torch, onnx ou onnx-int8 (CPU sem GPU: onnx-int8 é o mais rápido)
+TARGET_ONLY = True  # Detecta só as classes do alvo da rodada (NMS, pós-processamento e desenho mais baratos)
+TARGET_MAX_DET = 5  # Máximo de caixas por frame no modo TARGET_ONLY (50 com todas as classes)
+ALL_CLASSES_MAX_DET = 50
 
 # Cores
 WHITE = (255, 255, 255)
@@ -60,44 +73,38 @@ GAME_OBJECTS = list(OBJECT_MAP.keys())
 pygame.init()
 pygame.display.set_caption("Caça ao Objeto com Visão Computacional")
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
 clock = pygame.time.Clock()
 font_large = pygame.font.Font(None, 74)
 font_medium = pygame.font.Font(None, 48)
 font_small = pygame.font.Font(None, 36)
 
-# --- Carregar Modelo YOLOv5 ---
+# --- Conectar ao Servidor YOLOv5 ---
 try:
-    model = YOLO('yolov5su.pt') # Carrega o modelo YOLOv5
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
-    model.to(device)
+    # O servidor mantém o modelo carregado entre jogos; é iniciado aqui se ainda não estiver rodando
+    detector = DetectionClient(backend=YOLO_BACKEND, inference_width=INFERENCE_WIDTH)
+    device = detector.device
     
-    # Configurações do modelo para melhor desempenho
-    model.overrides['conf'] = YOLO_CONFIDENCE
-    model.overrides['iou'] = YOLO_IOU
-    model.overrides['agnostic_nms'] = False
-    model.overrides['max_det'] = 50  # Máximo de detecções por imagem
-    
-    print(f"Modelo YOLOv5 carregado e rodando em: {device}")
+    print(f"Conectado ao servidor YOLOv5 ({detector.backend}), rodando em: {device}")
     print(f"Confiança: {YOLO_CONFIDENCE}, IOU: {YOLO_IOU}")
+    # Nome da classe COCO -> índice usado pelo modelo (para filtrar por alvo)
+    class_ids = {name: class_id for class_id, name in detector.names.items()}
 except Exception as e:
-    print(f"Erro ao carregar o modelo YOLOv5: {e}")
+    print(f"Erro ao conectar ao servidor YOLOv5: {e}")
     print("Certifique-se de ter PyTorch e Ultralytics instalados e que o arquivo do modelo (.pt) pode ser baixado/acessado.")
     sys.exit()
 
 # --- Função de Pré-processamento de Imagem ---
+preprocessor = FramePreprocessor(PREPROCESS_MODE)
+
 def preprocess_frame(frame):
     """Melhora a qualidade da imagem para melhor detecção"""
-    # Aumenta o contraste e brilho
-    frame = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
-    
-    # Aplica denoising leve para reduzir ruído
-    frame = cv2.fastNlMeansDenoisingColored(frame, None, 10, 10, 7, 21)
-    
-    return frame
+    # Contraste/brilho + redução de ruído barata, escolhida pelo ruído medido no frame
+    return preprocessor.process(frame)
 
 # --- Funções de Ajuda ---
 def draw_text(surface, text, font, color, x, y, center_x=False):
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, color)
     if center_x:
         text_rect = text_surface.get_rect(center=(x, y))
         surface.blit(text_surface, text_rect)
@@ -138,24 +145,35 @@ def game_over_screen(score):
 
 # --- Loop Principal do Jogo ---
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0, width=WEBCAM_WIDTH, height=WEBCAM_HEIGHT)
     if not cap.isOpened():
         print("Erro ao abrir a câmera.")
         sys.exit()
-    
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_HEIGHT)
 
     score = 0
     round_num = 0
+    
+    # Detecção a cada N frames + rastreamento por fluxo óptico entre elas
+    scheduler = DetectionScheduler(DETECTION_INTERVAL, adaptive=ADAPTIVE_INTERVAL, fps=FPS)
+    tracker = BoxTracker()
 
     while round_num < MAX_ROUNDS:
         round_num += 1
         target_object_game_name = random.choice(GAME_OBJECTS)
         target_yolo_classes = OBJECT_MAP[target_object_game_name]
+        target_ids = [class_ids[name] for name in target_yolo_classes]
+        if TARGET_ONLY:
+            # O próprio modelo descarta as outras classes antes do NMS
+            detect_params = {'classes': target_ids, 'max_det': TARGET_MAX_DET}
+        else:
+            detect_params = {'max_det': ALL_CLASSES_MAX_DET}
 
         object_found_in_round = False
         round_start_time = time.time()
+        round_first_request = detector.last_request_id
+        last_result_id = round_first_request
+        scheduler.reset()
+        tracker.reset()
 
         while not object_found_in_round and (time.time() - round_start_time < ROUND_TIME_LIMIT):
             for event in pygame.event.get():
@@ -173,15 +191,27 @@ def game_loop():
             # Pré-processa o frame para melhorar a detecção
             processed_frame = preprocess_frame(frame)
             
-            # Executa a detecção YOLO com configurações otimizadas
-            results = model(
-                processed_frame,
-                conf=YOLO_CONFIDENCE,
-                iou=YOLO_IOU,
-                imgsz=YOLO_IMGSZ,
-                verbose=False,
-                half=True if device == 'cuda' else False  # Usa FP16 se GPU disponível
-            )
+            gray = tracker.prepare(processed_frame)
+            
+            # Envia o frame ao servidor YOLO (sem esperar) apenas quando o agendador pede
+            if scheduler.should_detect():
+                request_id = detector.submit(
+                    processed_frame,
+                    conf=YOLO_CONFIDENCE,
+                    iou=YOLO_IOU,
+                    imgsz=YOLO_IMGSZ,
+                    **detect_params
+                )
+                scheduler.on_submit(request_id, gray)
+            
+            # Resultado novo reinicia o rastreador; nos outros frames as caixas são propagadas.
+            # Respostas de frames da rodada anterior são ignoradas.
+            detection = detector.latest()
+            fresh_detection = detection is not None and detection.request_id > last_result_id
+            if fresh_detection:
+                last_result_id = detection.request_id
+                tracker.start(scheduler.on_result(detection), detection)
+            tracker.update(gray)
 
             current_time = time.time()
             time_elapsed = current_time - round_start_time
@@ -195,50 +225,45 @@ def game_loop():
 
             detected_frame = processed_frame.copy()
             
-            # Lista para armazenar detecções válidas
+            # Detecções válidas: alvo com confiança e área suficientes (só resultados novos do YOLO encerram a rodada)
             valid_detections = []
+            if fresh_detection:
+                boxes = detection.as_array(target_ids)
+                valid_detections = boxes[boxes['is_target']
+                                         & (boxes['conf'] >= DETECTION_CONFIDENCE)
+                                         & (boxes['area'] > MIN_BOX_AREA)]
             
-            for r in results:
-                for box in r.boxes:
-                    cls_id = int(box.cls[0])
-                    class_name = model.names[cls_id]
-                    conf = float(box.conf[0])
-                    
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    
-                    # Calcula o tamanho da bounding box (área)
-                    box_area = (x2 - x1) * (y2 - y1)
-                    
-                    # Desenha todas as detecções
-                    is_target = class_name in target_yolo_classes
-                    color = GREEN if is_target else BLUE
-                    thickness = 3 if is_target else 2
-                    
-                    cv2.rectangle(detected_frame, (x1, y1), (x2, y2), color, thickness)
-                    label = f"{class_name} {conf:.2f}"
-                    
-                    # Fundo para o texto para melhor visibilidade
-                    (text_width, text_height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-                    cv2.rectangle(detected_frame, (x1, y1 - text_height - 10), (x1 + text_width, y1), color, -1)
-                    cv2.putText(detected_frame, label, (x1, y1 - 5), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                    
-                    # Verifica se o objeto alvo foi encontrado com confiança suficiente
-                    if is_target and conf >= DETECTION_CONFIDENCE and box_area > 5000:  # Área mínima para evitar falsos positivos
-                        valid_detections.append((class_name, conf, box_area))
+            # Desenha as caixas rastreadas (posição atual entre detecções)
+            for box in detections_array(tracker.xyxy, tracker.conf, tracker.cls, target_ids):
+                x1, y1, x2, y2 = box['xyxy'].tolist()
+                class_name = detector.names[int(box['cls'])]
+                conf = float(box['conf'])
+                
+                # Desenha todas as detecções (no modo TARGET_ONLY só chegam caixas do alvo)
+                is_target = bool(box['is_target'])
+                color = GREEN if is_target else BLUE
+                thickness = 3 if is_target else 2
+                
+                cv2.rectangle(detected_frame, (x1, y1), (x2, y2), color, thickness)
+                label = f"{class_name} {conf:.2f}"
+                
+                # Fundo para o texto para melhor visibilidade
+                (text_width, text_height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+                cv2.rectangle(detected_frame, (x1, y1 - text_height - 10), (x1 + text_width, y1), color, -1)
+                cv2.putText(detected_frame, label, (x1, y1 - 5), 
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
             
             # Se houver detecções válidas, escolhe a com maior confiança
-            if valid_detections and not object_found_in_round:
-                best_detection = max(valid_detections, key=lambda x: x[1])
-                class_name, conf, area = best_detection
+            if len(valid_detections) and not object_found_in_round:
+                best_detection = valid_detections[valid_detections['conf'].argmax()]
+                class_name = detector.names[int(best_detection['cls'])]
+                conf = float(best_detection['conf'])
                 print(f"Objeto '{target_object_game_name}' detectado ({class_name}) com confiança {conf:.2f}!")
                 object_found_in_round = True
                 score += 1
                 time.sleep(1.5)  # Pausa para o jogador ver o acerto 
 
-            frame_rgb = cv2.cvtColor(detected_frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+            frame_surface = webcam_preview.update(detected_frame)
             screen.blit(frame_surface, (SCREEN_WIDTH // 2 - WEBCAM_WIDTH // 2, SCREEN_HEIGHT - WEBCAM_HEIGHT - 20))
             
             pygame.display.flip()
@@ -0,0 +1,135 @@
+"""
+Classificador de poses em lote (tabela de regras sobre um vetor de atributos)
+Cada pose do Simon Diz tinha sua própria função, que recalculava os ângulos
+de que precisava, e só a pose da rodada era avaliada. Aqui os atributos da
+pose (ângulos, alturas relativas, aberturas, distâncias) saem de uma vez num
+vetor por frame, e todas as poses de uma tabela de regras são pontuadas juntas,
+com uma confiança de 0 a 1 por pose (acima de MATCH_CONFIDENCE = todas as
+regras da pose satisfeitas).
+
+Regras de uma pose: lista de condições (atributo, '<' ou '>', limiar), todas
+obrigatórias; uma lista interna de condições vale se qualquer uma delas valer.
+
+Uso:
+    classifier = PoseClassifier({
+        'Y': [('left_wrist_to_nose_y', '<', 0), ('right_wrist_to_nose_y', '<', 0)],
+        'flamingo': [[('ankle_gap_y', '>', 0.2), ('knee_gap_y', '>', 0.15)]],
+    })
+    confidences = classifier.classify(PoseFeatures.from_results(results))
+    confidences['Y'] > MATCH_CONFIDENCE
+    classifier.best(confidences)           # (nome, confiança) da pose mais provável
+"""
+
+import numpy as np
+
+from landmarks_pose import (JOINT_ANGLES, NOSE, LEFT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+                            LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE)
+
+# --- Configurações ---
+MATCH_CONFIDENCE = 0.5  # Confiança acima da qual a pose conta como feita
+ANGLE_SCALE = 15.0  # Graus além do limiar para ~73% de confiança numa condição
+POSITION_SCALE = 0.05  # O mesmo para coordenadas normalizadas da imagem
+
+# --- Atributos ---
+# Combinações lineares de coordenadas: nome -> (eixo, {landmark: peso}, valor absoluto)
+LINEAR_FEATURES = {
+    'left_wrist_to_elbow_y': ('y', {LEFT_WRIST: 1, LEFT_ELBOW: -1}, False),
+    'left_wrist_to_nose_y': ('y', {LEFT_WRIST: 1, NOSE: -1}, False),
+    'right_wrist_to_nose_y': ('y', {RIGHT_WRIST: 1, NOSE: -1}, False),
+    'left_wrist_y': ('y', {LEFT_WRIST: 1}, False),
+    'right_wrist_y': ('y', {RIGHT_WRIST: 1}, False),
+    'nose_to_hips_y': ('y', {NOSE: 1, LEFT_HIP: -0.5, RIGHT_HIP: -0.5}, False),
+    'ankle_gap_y': ('y', {LEFT_ANKLE: 1, RIGHT_ANKLE: -1}, True),
+    'knee_gap_y': ('y', {LEFT_KNEE: 1, RIGHT_KNEE: -1}, True),
+    'ankle_spread_x': ('x', {LEFT_ANKLE: 1, RIGHT_ANKLE: -1}, True),
+    'wrist_spread_x': ('x', {LEFT_WRIST: 1, RIGHT_WRIST: -1}, True),
+}
+# Distâncias (x, y) entre dois landmarks
+DISTANCE_FEATURES = {
+    'left_wrist_to_nose': (LEFT_WRIST, NOSE),
+    'right_wrist_to_nose': (RIGHT_WRIST, NOSE),
+}
+
+FEATURE_NAMES = ([f'{joint}_angle' for joint in JOINT_ANGLES] +
+                 list(LINEAR_FEATURES) + list(DISTANCE_FEATURES))
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+FEATURE_SCALE = np.array([ANGLE_SCALE] * len(JOINT_ANGLES) +
+                         [POSITION_SCALE] * (len(LINEAR_FEATURES) + len(DISTANCE_FEATURES)))
+
+
+def _linear_terms():
+    """Termos de LINEAR_FEATURES achatados: landmark, eixo (0 = x, 1 = y), peso e início de cada atributo."""
+    landmarks, axes, weights, starts = [], [], [], []
+    for axis, terms, _ in LINEAR_FEATURES.values():
+        starts.append(len(landmarks))
+        for landmark, weight in terms.items():
+            landmarks.append(landmark)
+            axes.append('xy'.index(axis))
+            weights.append(weight)
+    return np.array(landmarks), np.array(axes), np.array(weights, dtype=np.float32), np.array(starts)
+
+
+# Só os landmarks citados entram na conta: um NaN em outro landmark não contamina os atributos
+_TERM_LANDMARKS, _TERM_AXES, _TERM_WEIGHTS, _FEATURE_STARTS = _linear_terms()
+_ABSOLUTE = np.array([absolute for _, _, absolute in LINEAR_FEATURES.values()])
+_DIST_A, _DIST_B = (np.array(column) for column in zip(*DISTANCE_FEATURES.values()))
+
+
+def feature_vector(pose):
+    """Todos os atributos de FEATURE_NAMES de uma pose (PoseFeatures), num único array."""
+    linear = np.add.reduceat(pose.points[_TERM_LANDMARKS, _TERM_AXES] * _TERM_WEIGHTS, _FEATURE_STARTS)
+    linear = np.where(_ABSOLUTE, np.abs(linear), linear)
+    distances = np.hypot(pose.x[_DIST_A] - pose.x[_DIST_B], pose.y[_DIST_A] - pose.y[_DIST_B])
+    return np.concatenate((pose.angles, linear, distances))
+
+
+class PoseClassifier:
+    """Pontua todas as poses de uma tabela de regras a partir de um único vetor de atributos."""
+
+    def __init__(self, rules):
+        self.names = list(rules)
+        features, thresholds, signs = [], [], []
+        clause_starts, pose_starts = [], []
+        for name in self.names:
+            if not rules[name]:
+                raise ValueError(f"Pose sem regras: {name}")
+            pose_starts.append(len(clause_starts))
+            for clause in rules[name]:
+                conditions = [clause] if isinstance(clause, tuple) else clause
+                if not conditions:
+                    raise ValueError(f"Cláusula vazia na pose {name}")
+                clause_starts.append(len(features))
+                for feature, op, threshold in conditions:
+                    if op not in ('<', '>'):
+                        raise ValueError(f"Operador inválido na pose {name}: {op}")
+                    features.append(FEATURE_INDEX[feature])
+                    thresholds.append(threshold)
+                    signs.append(1.0 if op == '>' else -1.0)
+
+        self._features = np.array(features)
+        self._thresholds = np.array(thresholds)
+        self._weights = np.array(signs) / FEATURE_SCALE[self._features]
+        self._clause_starts = np.array(clause_starts)
+        self._pose_starts = np.array(pose_starts)
+
+    def scores(self, vector):
+        """
+        Confiança (0 a 1) de cada pose, na ordem de self.names, para um vetor de atributos.
+        Condições sobre atributos indefinidos (landmark NaN) contam como não satisfeitas.
+        """
+        margins = (vector[self._features] - self._thresholds) * self._weights
+        conditions = 1 / (1 + np.exp(-np.clip(margins, -50, 50)))
+        conditions[np.isnan(margins)] = 0.0
+        clauses = np.maximum.reduceat(conditions, self._clause_starts)  # Ou dentro da cláusula
+        return np.minimum.reduceat(clauses, self._pose_starts)  # E entre as cláusulas
+
+    def classify(self, pose):
+        """{nome: confiança} de todas as poses; sem pose (None) tudo fica em 0."""
+        if pose is None:
+            return dict.fromkeys(self.names, 0.0)
+        return dict(zip(self.names, self.scores(feature_vector(pose)).tolist()))
+
+    @staticmethod
+    def best(confidences):
+        """(nome, confiança) da pose com maior confiança."""
+        return max(confidences.items(), key=lambda item: item[1])
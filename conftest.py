@@ -0,0 +1,6 @@
+"""
+Configuração do pytest na raiz do projeto
+Com este arquivo aqui o pytest põe a raiz no sys.path, então os testes em
+tests/ importam os módulos dos jogos (captura_camera, preprocessamento, ...)
+rodando só `pytest` na raiz.
+"""
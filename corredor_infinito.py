@@ -19,6 +19,16 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from particulas import ParticleSystem
+from inferencia_async import InferenceWorker
+from landmarks_pose import (pose_array, PoseFeatures, NOSE, LEFT_SHOULDER, RIGHT_SHOULDER,
+                            LEFT_WRIST, RIGHT_WRIST, LEFT_HIP, RIGHT_HIP)
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +36,7 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 280
 WEBCAM_HEIGHT = 210
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores vibrantes
 SKY_COLOR = (135, 206, 250)
@@ -57,6 +68,8 @@ OBSTACLE_SPAWN_RATE = 75  # Mais frequente
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
 pygame.display.set_caption("🏃 Corredor Infinito PRO - Controle Corporal + Power-ups")
 clock = pygame.time.Clock()
 
@@ -66,6 +79,7 @@ font_large = pygame.font.Font(None, 70)
 font_medium = pygame.font.Font(None, 50)
 font_small = pygame.font.Font(None, 40)
 font_tiny = pygame.font.Font(None, 30)
+font_coin = pygame.font.Font(None, 28)
 
 # MediaPipe Pose
 mp_pose = mp.solutions.pose
@@ -144,7 +158,6 @@ class Player:
         for i, (tx, ty) in enumerate(self.trail[:-1]):
             alpha = int(120 * (i / len(self.trail)))
             size = int(self.size * (0.5 + 0.5 * i / len(self.trail)))
-            s = pygame.Surface((size, size), pygame.SRCALPHA)
             
             # Cor do trail baseada em power-ups
             trail_color = PLAYER_COLOR
@@ -155,8 +168,7 @@ class Player:
             elif self.has_magnet:
                 trail_color = MAGNET_COLOR
             
-            pygame.draw.circle(s, (*trail_color, alpha), (size // 2, size // 2), size // 2)
-            surface.blit(s, (tx - size // 2, ty - size // 2))
+            blit_circle(surface, trail_color, (tx, ty), size // 2, alpha)
         
         # Tamanho baseado em estado
         current_size = self.size if not self.is_ducking else self.size // 2
@@ -169,10 +181,8 @@ class Player:
         if self.has_shield:
             shield_pulse = abs(math.sin(self.animation_frame * 3)) * 5
             shield_radius = current_size // 2 + 20 + int(shield_pulse)
-            s = pygame.Surface((shield_radius * 2 + 20, shield_radius * 2 + 20), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*SHIELD_COLOR, 100), (shield_radius + 10, shield_radius + 10), shield_radius, 5)
-            surface.blit(s, (self.x + current_size // 2 - shield_radius - 10, 
-                           self.y + y_offset + current_size // 2 - shield_radius - 10))
+            blit_circle(surface, SHIELD_COLOR, (self.x + current_size // 2, self.y + y_offset + current_size // 2),
+                        shield_radius, 100, 5)
         
         # Ímã visual
         if self.has_magnet:
@@ -278,19 +288,14 @@ class Coin:
     def draw(self, surface):
         # Glow pulsante mais intenso
         pulse = abs(math.sin(time.time() * 5)) * 12
-        s = pygame.Surface((self.radius * 2 + int(pulse) * 2, self.radius * 2 + int(pulse) * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*COIN_COLOR, 120), 
-                          (self.radius + int(pulse), self.radius + int(pulse)), 
-                          self.radius + int(pulse))
-        surface.blit(s, (self.x - self.radius - int(pulse), self.y - self.radius - int(pulse)))
+        blit_circle(surface, COIN_COLOR, (self.x, self.y), self.radius + int(pulse), 120)
         
         # Moeda
         pygame.draw.circle(surface, COIN_COLOR, (int(self.x), int(self.y)), self.radius)
         pygame.draw.circle(surface, (218, 165, 32), (int(self.x), int(self.y)), self.radius, 4)
         
         # Símbolo
-        font = pygame.font.Font(None, 28)
-        text = font.render("$", True, (218, 165, 32))
+        text = render_text(font_coin, "$", (218, 165, 32))
         text_rect = text.get_rect(center=(int(self.x), int(self.y)))
         surface.blit(text, text_rect)
     
@@ -344,19 +349,14 @@ class PowerUp:
         
         # Glow pulsante
         pulse = abs(math.sin(time.time() * 4)) * 15
-        s = pygame.Surface((self.radius * 2 + int(pulse) * 2, self.radius * 2 + int(pulse) * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*color, 100), 
-                          (self.radius + int(pulse), self.radius + int(pulse)), 
-                          self.radius + int(pulse))
-        surface.blit(s, (self.x - self.radius - int(pulse), self.y - self.radius - int(pulse)))
+        blit_circle(surface, color, (self.x, self.y), self.radius + int(pulse), 100)
         
         # Power-up
         pygame.draw.circle(surface, color, (int(self.x), int(self.y)), self.radius)
         pygame.draw.circle(surface, TEXT_PRIMARY, (int(self.x), int(self.y)), self.radius, 4)
         
         # Ícone
-        font = pygame.font.Font(None, 30)
-        text = font.render(self.icons[self.type], True, TEXT_PRIMARY)
+        text = render_text(font_tiny, self.icons[self.type], TEXT_PRIMARY)
         text_rect = text.get_rect(center=(int(self.x), int(self.y)))
         surface.blit(text, text_rect)
     
@@ -370,65 +370,79 @@ class PowerUp:
         return False
 
 # --- Detecção de Pose ---
-def detect_jump_and_duck(landmarks):
-    if not landmarks:
+def detect_jump_and_duck(points):
+    """points: array (33, 4) de landmarks_pose.pose_array (extrapolado pelo InferenceWorker)"""
+    if points is None:
         return False, False
-    
-    # Pontos-chave
-    left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y
-    right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].y
-    left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y
-    right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y
-    left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y
-    right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y
-    nose = landmarks[mp_pose.PoseLandmark.NOSE.value].y
+    features = PoseFeatures(points)
     
     # Pulo: mãos acima dos ombros (mais sensível)
-    jump = (left_wrist < left_shoulder - 0.05) and (right_wrist < right_shoulder - 0.05)
+    jump = (features.y[LEFT_WRIST] < features.y[LEFT_SHOULDER] - 0.05) and (features.y[RIGHT_WRIST] < features.y[RIGHT_SHOULDER] - 0.05)
     
     # Agachar: cabeça próxima do quadril (mais sensível)
-    avg_hip = (left_hip + right_hip) / 2
-    duck = nose > avg_hip - 0.15
+    avg_hip = (features.y[LEFT_HIP] + features.y[RIGHT_HIP]) / 2
+    duck = features.y[NOSE] > avg_hip - 0.15
     
-    return jump, duck
+    return bool(jump), bool(duck)
 
 # --- Funções UI ---
 def draw_text(surface, text, font, color, x, y, center=True, shadow=True):
     if shadow:
-        text_obj = font.render(text, True, (0, 0, 0))
+        text_obj = render_text(font, text, (0, 0, 0))
         if center:
             rect = text_obj.get_rect(center=(x+3, y+3))
         else:
             rect = (x+3, y+3)
         surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
         rect = (x, y)
     surface.blit(text_obj, rect)
 
-def draw_background(surface, scroll_offset):
+# Camadas do fundo pré-renderizadas (criadas no primeiro desenho)
+_background_layers = {}
+
+def _build_static_background():
+    """Céu em gradiente + chão, desenhados uma única vez."""
+    layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    
     # Gradiente de céu
     for y in range(GROUND_Y):
         factor = y / GROUND_Y
         color = tuple(int(SKY_COLOR[i] * (1 - factor * 0.3)) for i in range(3))
-        pygame.draw.line(surface, color, (0, y), (SCREEN_WIDTH, y))
+        pygame.draw.line(layer, color, (0, y), (SCREEN_WIDTH, y))
     
     # Chão
-    pygame.draw.rect(surface, GROUND_COLOR, (0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y))
+    pygame.draw.rect(layer, GROUND_COLOR, (0, GROUND_Y, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y))
     
     # Linha do chão decorativa
-    pygame.draw.line(surface, (80, 50, 20), (0, GROUND_Y), (SCREEN_WIDTH, GROUND_Y), 5)
+    pygame.draw.line(layer, (80, 50, 20), (0, GROUND_Y), (SCREEN_WIDTH, GROUND_Y), 5)
+    return layer
+
+def _build_cloud_sprite():
+    """Nuvem simples (duas elipses) num sprite com transparência."""
+    sprite = pygame.Surface((120, 70), pygame.SRCALPHA)
+    pygame.draw.ellipse(sprite, (255, 255, 255), (0, 20, 120, 50))
+    pygame.draw.ellipse(sprite, (255, 255, 255), (30, 0, 80, 50))
+    return sprite.convert_alpha()
+
+def draw_background(surface, scroll_offset):
+    if not _background_layers:
+        _background_layers['static'] = _build_static_background()
+        _background_layers['cloud'] = _build_cloud_sprite()
+    
+    # Céu + chão: um único blit por frame
+    surface.blit(_background_layers['static'], (0, 0))
     
     # Nuvens paralaxe
+    cloud = _background_layers['cloud']
     for i in range(5):
         cloud_x = (i * 400 + scroll_offset * 0.2) % (SCREEN_WIDTH + 200) - 100
         cloud_y = 100 + i * 80
-        # Nuvem simples
-        pygame.draw.ellipse(surface, (255, 255, 255, 150), (cloud_x, cloud_y, 120, 50))
-        pygame.draw.ellipse(surface, (255, 255, 255, 150), (cloud_x + 30, cloud_y - 20, 80, 50))
+        surface.blit(cloud, (int(cloud_x), cloud_y - 20))
 
 # --- Telas ---
 def main_menu():
@@ -452,9 +466,7 @@ def main_menu():
         
         # Card
         card_rect = pygame.Rect(SCREEN_WIDTH//2 - 500, 280, 1000, 450)
-        s = pygame.Surface((1000, 450), pygame.SRCALPHA)
-        pygame.draw.rect(s, (255, 255, 255, 220), (0, 0, 1000, 450), border_radius=20)
-        screen.blit(s, card_rect)
+        blit_overlay(screen, (255, 255, 255), 220, card_rect, border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, card_rect, 4, border_radius=20)
         
         instructions = [
@@ -501,11 +513,20 @@ def main_menu():
         clock.tick(FPS)
 
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return 0
     
+    # Pose roda em thread própria; o jogo renderiza a 60 FPS com o último resultado
+    worker = InferenceWorker(cap, pose, extract_points=pose_array, inference_width=INFERENCE_WIDTH).start()
+    if not worker.wait_ready():
+        print("❌ Câmera não entregou frames")
+        worker.stop()
+        cap.release()
+        return 0
+    shown_frame_id = -1
+    
     player = Player()
     obstacles = []
     coins = []
@@ -531,8 +552,8 @@ def game_loop():
     # Cooldown reduzido
     jump_cooldown = 0
     
-    # Partículas de coleta
-    particles = []
+    # Partículas de coleta (20 frames de vida)
+    particles = ParticleSystem(gravity=0.3, decay=1 / 20)
     
     running = True
     game_over = False
@@ -545,26 +566,23 @@ def game_loop():
                 if event.key == pygame.K_ESCAPE:
                     running = False
         
-        # Captura frame
-        ret, frame = cap.read()
-        if not ret:
+        # Último resultado da inferência (não bloqueia)
+        result = worker.latest()
+        if not worker.is_running():
             break
+        frame = result.frame
         
-        frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(frame_rgb)
+        # Detecta pose com os landmarks extrapolados entre atualizações
+        jump_command, duck_command = detect_jump_and_duck(worker.predict_points())
         
-        # Detecta pose
-        jump_command, duck_command = False, False
-        if results.pose_landmarks:
-            jump_command, duck_command = detect_jump_and_duck(results.pose_landmarks.landmark)
-            
-            # Desenha skeleton na webcam
+        # Desenha skeleton na webcam apenas quando chega um resultado novo
+        if result.frame_id != shown_frame_id and result.results.pose_landmarks:
             mp.solutions.drawing_utils.draw_landmarks(
-                frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
+                frame, result.results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
                 mp.solutions.drawing_utils.DrawingSpec(color=(0, 255, 0), thickness=2),
                 mp.solutions.drawing_utils.DrawingSpec(color=(0, 255, 255), thickness=2)
             )
+        shown_frame_id = result.frame_id
         
         # Cooldown reduzido para mais responsividade
         if jump_cooldown > 0:
@@ -637,15 +655,7 @@ def game_loop():
                 coins_collected += 1
                 flash_timer = 5
                 # Adiciona partículas
-                for _ in range(5):
-                    particles.append({
-                        'x': coin.x,
-                        'y': coin.y,
-                        'vx': random.uniform(-3, 3),
-                        'vy': random.uniform(-5, -2),
-                        'life': 20,
-                        'color': COIN_COLOR
-                    })
+                particles.emit_spray(coin.x, coin.y, COIN_COLOR, 5, vx=(-3, 3), vy=(-5, -2), size=4)
         
         # Checa coleta de power-ups
         for pwup in powerups:
@@ -664,13 +674,7 @@ def game_loop():
                 score += 25
         
         # Atualiza partículas
-        for particle in particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.3
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                particles.remove(particle)
+        particles.update()
         
         scroll_offset += current_speed * speed_multiplier
         
@@ -684,18 +688,12 @@ def game_loop():
         
         # Efeito de câmera lenta no fundo
         if player.is_slow_motion:
-            bg_tint = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.rect(bg_tint, (*SLOW_COLOR, 30), (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(bg_tint, (0, 0))
+            blit_overlay(screen, SLOW_COLOR, 30)
         
         draw_background(screen, scroll_offset)
         
         # Desenha partículas
-        for particle in particles:
-            alpha = int(255 * (particle['life'] / 20))
-            s = pygame.Surface((8, 8), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*particle['color'], alpha), (4, 4), 4)
-            screen.blit(s, (particle['x'] + shake_x, particle['y'] + shake_y))
+        particles.draw(screen, offset=(shake_x + 4, shake_y + 4))
         
         # Desenha objetos
         for coin in coins:
@@ -711,15 +709,11 @@ def game_loop():
         
         # Flash de coleta
         if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.rect(flash_surf, (255, 255, 255, 30), (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(flash_surf, (0, 0))
+            blit_overlay(screen, (255, 255, 255), 30)
             flash_timer -= 1
         
         # HUD melhorado
-        hud_surf = pygame.Surface((SCREEN_WIDTH, 140), pygame.SRCALPHA)
-        pygame.draw.rect(hud_surf, (0, 0, 0, 140), (0, 0, SCREEN_WIDTH, 140))
-        screen.blit(hud_surf, (0, 0))
+        blit_overlay(screen, (0, 0, 0), 140, (0, 0, SCREEN_WIDTH, 140))
         
         draw_text(screen, f"PONTOS: {score}", font_large, TEXT_PRIMARY, 200, 50)
         draw_text(screen, f"🪙 {coins_collected}", font_medium, COIN_COLOR, SCREEN_WIDTH//2 - 100, 50)
@@ -781,18 +775,18 @@ def game_loop():
         draw_text(screen, "AGACHAR", font_tiny, TEXT_PRIMARY, control_x + 165, control_y + 40, True, False)
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
         
-        border_color = (0, 255, 0) if results.pose_landmarks else (255, 0, 0)
+        border_color = (0, 255, 0) if result.points is not None else (255, 0, 0)
         pygame.draw.rect(screen, border_color, (webcam_x, webcam_y, WEBCAM_WIDTH, WEBCAM_HEIGHT), 5, border_radius=8)
         
         pygame.display.flip()
         clock.tick(FPS)
     
+    worker.stop()
     cap.release()
     cv2.destroyAllWindows()
     
@@ -800,8 +794,10 @@ def game_loop():
     return show_results(score, distance, coins_collected, game_time, max_combo)
 
 def show_results(score, distance, coins, game_time, max_combo):
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -814,9 +810,7 @@ def show_results(score, distance, coins, game_time, max_combo):
         draw_background(screen, 0)
         
         card_rect = pygame.Rect(SCREEN_WIDTH//2 - 550, 120, 1100, 680)
-        s = pygame.Surface((1100, 680), pygame.SRCALPHA)
-        pygame.draw.rect(s, (255, 255, 255, 240), (0, 0, 1100, 680), border_radius=20)
-        screen.blit(s, card_rect)
+        blit_overlay(screen, (255, 255, 255), 240, card_rect, border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, card_rect, 6, border_radius=20)
         
         draw_text(screen, "🏁 CORRIDA FINALIZADA! 🏁", font_title, PLAYER_COLOR, 
@@ -863,7 +857,7 @@ def show_results(score, distance, coins, game_time, max_combo):
         draw_text(screen, "ESPAÇO para jogar novamente | ESC para sair", 
                   font_small, (100, 100, 100), SCREEN_WIDTH//2, 730)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
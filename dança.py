@@ -4,7 +4,12 @@ import pygame
 import sys
 import random
 import time
-import math
+import numpy as np
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
+from landmarks_pose import PoseFeatures, normalize, points_from_dict
 
 # --- Configurações do Jogo ---
 SCREEN_WIDTH = 1280
@@ -12,6 +17,7 @@ SCREEN_HEIGHT = 720
 WEBCAM_WIDTH = 640
 WEBCAM_HEIGHT = 480
 FPS = 30
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 ROUND_TIME_LIMIT = 5 # Segundos por rodada
 MAX_ROUNDS = 7 # 7 poses no total
 
@@ -27,6 +33,7 @@ YELLOW = (255, 255, 0)
 pygame.init()
 pygame.display.set_caption("Dance Game com Visão Computacional")
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
 clock = pygame.time.Clock()
 font_large = pygame.font.Font(None, 74)
 font_medium = pygame.font.Font(None, 48)
@@ -175,80 +182,37 @@ ALL_POSE_NAMES = list(REFERENCE_POSES.keys())
 
 # --- Funções de Ajuda ---
 def draw_text(surface, text, font, color, x, y, center_x=False):
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, color)
     if center_x:
         text_rect = text_surface.get_rect(center=(x, y))
         surface.blit(text_surface, text_rect)
     else:
         surface.blit(text_surface, (x, y))
 
-def normalize_landmarks_for_comparison(landmarks_dict):
+def reference_for_comparison(landmarks_dict):
     """
-    Normaliza os landmarks em relação a um ponto central do corpo (ex: meio do quadril)
-    e a uma escala (ex: distância entre ombros ou altura do tronco).
-    Isso é crucial para comparar poses de pessoas de tamanhos diferentes ou a distâncias variadas da câmera.
-    
-    Para este exemplo, faremos uma normalização simples baseada no centro do tronco e distância entre os ombros.
+    Prepara uma pose de referência uma única vez: os índices dos landmarks
+    definidos e as coordenadas (x, y) normalizadas em relação ao centro do tronco
+    e à distância entre os ombros (landmarks_pose.normalize), a mesma
+    normalização aplicada à pose da câmera. Isso é crucial para comparar poses
+    de pessoas de tamanhos diferentes ou a distâncias variadas da câmera.
     """
-    if not landmarks_dict:
-        return {}
-
-    # Obter landmarks chave para normalização
-    left_shoulder = landmarks_dict.get(mp_pose.PoseLandmark.LEFT_SHOULDER.value)
-    right_shoulder = landmarks_dict.get(mp_pose.PoseLandmark.RIGHT_SHOULDER.value)
-    left_hip = landmarks_dict.get(mp_pose.PoseLandmark.LEFT_HIP.value)
-    right_hip = landmarks_dict.get(mp_pose.PoseLandmark.RIGHT_HIP.value)
-
-    if not all([left_shoulder, right_shoulder, left_hip, right_hip]):
-        # Se os landmarks centrais não forem detectados, retornamos os originais ou vazios
-        return landmarks_dict
-
-    # Calcula o centro do tronco como ponto de referência (para translação)
-    center_x = (left_shoulder[0] + right_shoulder[0] + left_hip[0] + right_hip[0]) / 4
-    center_y = (left_shoulder[1] + right_shoulder[1] + left_hip[1] + right_hip[1]) / 4
-
-    # Calcula a distância entre os ombros como escala (para scaling)
-    shoulder_distance = math.sqrt((right_shoulder[0] - left_shoulder[0])**2 + (right_shoulder[1] - left_shoulder[1])**2)
-    if shoulder_distance == 0: # Evita divisão por zero
-        shoulder_distance = 0.1 # Um valor pequeno
-
-    # Normaliza todos os landmarks
-    normalized_landmarks = {}
-    for landmark_id, (x, y, z) in landmarks_dict.items():
-        # Translação: subtrai o centro
-        norm_x = (x - center_x) / shoulder_distance
-        norm_y = (y - center_y) / shoulder_distance
-        # Mantém z como está (ou pode normalizar também se necessário)
-        normalized_landmarks[landmark_id] = (norm_x, norm_y, z)
-
-    return normalized_landmarks
-
-def calculate_pose_similarity(pose1_landmarks, pose2_landmarks, threshold=0.3):
+    ids = np.array(sorted(landmarks_dict))
+    return ids, normalize(points_from_dict(landmarks_dict))[ids]
+
+def calculate_pose_similarity(pose, reference, threshold=0.3):
     """
-    Calcula a similaridade entre duas poses baseada na distância euclidiana dos landmarks.
-    Retorna True se a similaridade for maior que o threshold.
+    Calcula a similaridade entre a pose atual (PoseFeatures) e uma referência
+    preparada por reference_for_comparison, pela distância euclidiana média
+    dos landmarks (apenas x e y). Retorna True se a distância média for menor que o threshold.
     """
-    if not pose1_landmarks or not pose2_landmarks:
+    if pose is None:
         return False
+    ids, reference_xy = reference
+    return pose.mean_distance(ids, reference_xy) < threshold
 
-    total_distance = 0
-    valid_landmarks = 0
-
-    for landmark_id in pose1_landmarks:
-        if landmark_id in pose2_landmarks:
-            x1, y1, z1 = pose1_landmarks[landmark_id]
-            x2, y2, z2 = pose2_landmarks[landmark_id]
-            
-            # Calcula distância euclidiana (apenas x e y para simplificar)
-            distance = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-            total_distance += distance
-            valid_landmarks += 1
-
-    if valid_landmarks == 0:
-        return False
-
-    average_distance = total_distance / valid_landmarks
-    return average_distance < threshold
+# Referências já normalizadas (calculadas uma vez, não a cada frame)
+REFERENCE_ARRAYS = {name: reference_for_comparison(pose["landmarks"]) for name, pose in REFERENCE_POSES.items()}
 
 def main_menu():
     while True:
@@ -283,13 +247,10 @@ def game_over_screen(score):
         pygame.display.flip()
 
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0, width=WEBCAM_WIDTH, height=WEBCAM_HEIGHT)
     if not cap.isOpened():
         print("Erro ao abrir a câmera.")
         sys.exit()
-    
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_HEIGHT)
 
     score = 0
     round_num = 0
@@ -316,7 +277,7 @@ def game_loop():
                 break
 
             # Processa o frame com MediaPipe
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
             results = pose_detector.process(frame_rgb)
 
             current_time = time.time()
@@ -340,25 +301,18 @@ def game_loop():
                     connection_drawing_spec=mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2)
                 )
 
-                # Extrai landmarks atuais
-                current_landmarks = {}
-                for landmark_id, landmark in enumerate(results.pose_landmarks.landmark):
-                    current_landmarks[landmark_id] = (landmark.x, landmark.y, landmark.z)
-
-                # Normaliza os landmarks atuais
-                normalized_current = normalize_landmarks_for_comparison(current_landmarks)
+                # Landmarks atuais num array (33, 4), normalizados sob demanda
+                current_pose = PoseFeatures.from_results(results)
                 
                 # Compara com a pose alvo
-                if calculate_pose_similarity(normalized_current, target_pose["landmarks"]):
+                if calculate_pose_similarity(current_pose, REFERENCE_ARRAYS[target_pose_name]):
                     print(f"Pose '{target_pose_name}' detectada!")
                     pose_found_in_round = True
                     score += 1
                     time.sleep(1)  # Pausa para mostrar o acerto
 
             # Exibe o frame da webcam
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+            frame_surface = webcam_preview.update(frame)
             screen.blit(frame_surface, (SCREEN_WIDTH // 2 - WEBCAM_WIDTH // 2, SCREEN_HEIGHT - WEBCAM_HEIGHT - 20))
             
             pygame.display.flip()
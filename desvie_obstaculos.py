@@ -19,6 +19,13 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from inferencia_async import resize_for_inference
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +33,7 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 300
 WEBCAM_HEIGHT = 225
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores vibrantes
 SKY_TOP = (25, 25, 112)
@@ -47,6 +55,8 @@ OBSTACLE_SPEED = 12
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
 pygame.display.set_caption("🚗 Desvie dos Obstáculos")
 clock = pygame.time.Clock()
 
@@ -102,9 +112,7 @@ class Player:
         for i, (tx, ty) in enumerate(self.trail[:-1]):
             alpha = int(150 * (i / len(self.trail)))
             size = int(self.size * (0.4 + 0.6 * i / len(self.trail)))
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*PLAYER_COLOR, alpha), (size, size), size)
-            surface.blit(s, (tx - size, ty - size))
+            blit_circle(surface, PLAYER_COLOR, (tx, ty), size, alpha)
         
         # Blink se invencível
         if self.invincible_time > 0 and self.invincible_time % 10 < 5:
@@ -207,7 +215,7 @@ class Coin:
         pygame.draw.circle(surface, (218, 165, 32), (int(self.x), int(self.y)), self.radius, 3)
         
         # Símbolo
-        text = font_small.render("★", True, (218, 165, 32))
+        text = render_text(font_small, "★", (218, 165, 32))
         text_rect = text.get_rect(center=(int(self.x), int(self.y)))
         surface.blit(text, text_rect)
     
@@ -245,11 +253,11 @@ def detect_face_position(face_landmarks, frame_width):
 # --- UI ---
 def draw_text(surface, text, font, color, x, y, center=True, shadow=True):
     if shadow:
-        text_obj = font.render(text, True, (0, 0, 0))
+        text_obj = render_text(font, text, (0, 0, 0))
         rect = text_obj.get_rect(center=(x+2, y+2)) if center else (x+2, y+2)
         surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     rect = text_obj.get_rect(center=(x, y)) if center else (x, y)
     surface.blit(text_obj, rect)
 
@@ -303,9 +311,7 @@ def main_menu():
         # Card
         card_x = SCREEN_WIDTH // 2 - 450
         card_y = 320
-        s = pygame.Surface((900, 400), pygame.SRCALPHA)
-        pygame.draw.rect(s, (30, 30, 40, 230), (0, 0, 900, 400), border_radius=20)
-        screen.blit(s, (card_x, card_y))
+        blit_overlay(screen, (30, 30, 40), 230, (card_x, card_y, 900, 400), border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, (card_x, card_y, 900, 400), 4, border_radius=20)
         
         instructions = [
@@ -336,7 +342,7 @@ def main_menu():
 def game_loop():
     print("🎮 Iniciando jogo...")
     try:
-        cap = cv2.VideoCapture(0)
+        cap = CameraStream(0)
         if not cap.isOpened():
             print("❌ Erro ao abrir câmera")
             print("⚠️ Verifique se sua webcam está conectada e não está sendo usada por outro programa")
@@ -376,7 +382,7 @@ def game_loop():
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = face_mesh.process(frame_rgb)
         
         # Detecta posição da cabeça
@@ -464,9 +470,7 @@ def game_loop():
         player.draw(screen)
         
         # HUD
-        hud_surf = pygame.Surface((SCREEN_WIDTH, 120), pygame.SRCALPHA)
-        pygame.draw.rect(hud_surf, (0, 0, 0, 150), (0, 0, SCREEN_WIDTH, 120))
-        screen.blit(hud_surf, (0, 0))
+        blit_overlay(screen, (0, 0, 0), 150, (0, 0, SCREEN_WIDTH, 120))
         
         draw_text(screen, f"PONTOS: {score}", font_large, TEXT_PRIMARY, 200, 60)
         
@@ -488,8 +492,7 @@ def game_loop():
                 pygame.draw.circle(screen, color, (lane_x, indicator_y), 15)
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -506,8 +509,10 @@ def game_loop():
     return show_results(score, distance, coins_collected)
 
 def show_results(score, distance, coins):
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -521,9 +526,7 @@ def show_results(score, distance, coins):
         
         card_x = SCREEN_WIDTH // 2 - 450
         card_y = 200
-        s = pygame.Surface((900, 500), pygame.SRCALPHA)
-        pygame.draw.rect(s, (30, 30, 40, 240), (0, 0, 900, 500), border_radius=20)
-        screen.blit(s, (card_x, card_y))
+        blit_overlay(screen, (30, 30, 40), 240, (card_x, card_y, 900, 500), border_radius=20)
         pygame.draw.rect(screen, PLAYER_COLOR, (card_x, card_y, 900, 500), 5, border_radius=20)
         
         draw_text(screen, "🏁 CORRIDA FINALIZADA! 🏁", font_title, PLAYER_COLOR, 
@@ -539,7 +542,7 @@ def show_results(score, distance, coins):
         draw_text(screen, "ESPAÇO para jogar novamente | ESC para sair", 
                   font_small, TEXT_SECONDARY, SCREEN_WIDTH // 2, card_y + 440)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
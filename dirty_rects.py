@@ -0,0 +1,119 @@
+"""
+Atualização parcial da tela (retângulos sujos) com pygame.display.update(rects)
+pygame.display.flip() copia a janela inteira todo frame, mesmo quando quase
+nada mudou (menus, labirinto). Com o modo parcial ligado o jogo marca as
+regiões que mudaram (HUD, sprites que se movem, webcam) e só elas são
+enviadas à tela; as regiões do frame anterior também entram, para apagar o
+que saiu do lugar.
+
+Uso:
+    updater = ScreenUpdater()
+    ...
+    updater.handle_event(event)          # F2 alterna parcial / tela cheia
+    updater.mark(hud_rect, player_rect)  # O que mudou neste frame
+    updater.invalidate()                 # Próximo present() atualiza tudo
+    updater.present()                    # No lugar de pygame.display.flip()
+    updater.report()                     # Compara os dois modos no fim
+"""
+
+import time
+
+import pygame
+
+# --- Configurações ---
+DIRTY_RECTS = False  # Começa no modo parcial (True) ou com flip() da tela cheia (False)
+TOGGLE_KEY = pygame.K_F2  # Tecla que alterna entre os modos
+
+
+class _ModeStats:
+    """Frames, tempo total e tempo gasto em flip()/update() de um modo."""
+
+    def __init__(self):
+        self.frames = 0
+        self.elapsed = 0.0
+        self.present_time = 0.0
+        self.area = 0.0  # Soma da fração da tela enviada por frame
+
+    def fps(self):
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+    def present_ms(self):
+        return 1000 * self.present_time / self.frames if self.frames else 0.0
+
+    def area_fraction(self):
+        return self.area / self.frames if self.frames else 0.0
+
+
+class ScreenUpdater:
+    """Substitui pygame.display.flip() por update() só das regiões marcadas."""
+
+    def __init__(self, enabled=DIRTY_RECTS):
+        self.enabled = enabled
+        self._dirty = []
+        self._previous = []
+        self._full_update = True
+        self._last_present = None
+        self.stats = {True: _ModeStats(), False: _ModeStats()}
+
+    def mark(self, *rects):
+        """Marca regiões (Rect ou (x, y, w, h)) que mudaram neste frame."""
+        self._dirty.extend(pygame.Rect(rect) for rect in rects)
+
+    def invalidate(self):
+        """Força a atualização da tela inteira no próximo present()."""
+        self._full_update = True
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._full_update = True
+        self._last_present = None  # Não mistura o tempo dos dois modos
+        print(f"🖥️ Atualização da tela: {'parcial (retângulos sujos)' if self.enabled else 'tela cheia'}")
+
+    def handle_event(self, event):
+        """Trata a tecla de alternância; devolve True se o evento foi usado."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def present(self):
+        now = time.perf_counter()
+        stats = self.stats[self.enabled]
+        if self._last_present is not None:
+            stats.frames += 1
+            stats.elapsed += now - self._last_present
+
+        screen = pygame.display.get_surface()
+        screen_rect = screen.get_rect()
+        if not self.enabled or self._full_update:
+            pygame.display.flip()
+            area = 1.0
+        else:
+            rects = [r.clip(screen_rect) for r in self._previous + self._dirty]
+            rects = [r for r in rects if r.width and r.height]
+            pygame.display.update(rects)
+            area = min(1.0, sum(r.width * r.height for r in rects) / (screen_rect.width * screen_rect.height))
+
+        done = time.perf_counter()
+        if self._last_present is not None:
+            stats.present_time += done - now
+            stats.area += area
+        self._last_present = done
+
+        self._previous = self._dirty
+        self._dirty = []
+        self._full_update = False
+
+    def fps(self):
+        """FPS médio do modo atual."""
+        return self.stats[self.enabled].fps()
+
+    def report(self):
+        print("\n🖥️ Atualização da tela (F2 alterna):")
+        for enabled, name in ((False, 'Tela cheia'), (True, 'Parcial')):
+            stats = self.stats[enabled]
+            if stats.frames:
+                print(f"   {name:10}: {stats.fps():5.1f} FPS, {stats.present_ms():5.2f} ms por atualização, "
+                      f"{stats.area_fraction():.0%} da tela por frame ({stats.frames} frames)")
+            else:
+                print(f"   {name:10}: não usado")
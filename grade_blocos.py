@@ -0,0 +1,114 @@
+"""
+Índice em grade para os blocos do quebra_blocos (colisão bola x blocos)
+Os blocos ficam numa grade fixa de BLOCK_ROWS x BLOCK_COLS, então a célula de
+cada bloco sai direto da posição: a bola só é testada contra as poucas células
+que o movimento dela atravessa, e remover um bloco é só esvaziar a célula.
+
+A colisão é contínua (swept): o trecho percorrido pela bola no frame é
+testado contra cada bloco expandido pelo raio, e vale o primeiro contato.
+Assim uma bola rápida não atravessa um bloco mais fino que o próprio passo.
+
+Uso:
+    grid = BlockGrid(start_x, start_y, BLOCK_WIDTH, BLOCK_HEIGHT, BLOCK_ROWS, BLOCK_COLS)
+    grid.add(block, row, col)
+    hit = grid.sweep(x_antes, y_antes, x_depois, y_depois, raio)
+    if hit:
+        block, t, axis = hit      # axis 'x' ou 'y': componente da velocidade a inverter
+        grid.remove(block)
+"""
+
+import math
+
+
+class BlockGrid:
+    """Blocos indexados pela célula (linha, coluna) de uma grade regular."""
+
+    def __init__(self, origin_x, origin_y, cell_width, cell_height, rows, cols):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.rows = rows
+        self.cols = cols
+        self._cells = [[None] * cols for _ in range(rows)]
+        self._count = 0
+
+    def add(self, block, row, col):
+        if self._cells[row][col] is None:
+            self._count += 1
+        self._cells[row][col] = block
+        block.cell = (row, col)
+
+    def remove(self, block):
+        """Remove em O(1) usando a célula guardada no próprio bloco."""
+        row, col = block.cell
+        if self._cells[row][col] is block:
+            self._cells[row][col] = None
+            self._count -= 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for row in self._cells:
+            for block in row:
+                if block is not None:
+                    yield block
+
+    def cell_range(self, left, top, right, bottom):
+        """Linhas e colunas (ranges) das células que cobrem o retângulo dado."""
+        col0 = max(0, math.floor((left - self.origin_x) / self.cell_width))
+        col1 = min(self.cols - 1, math.floor((right - self.origin_x) / self.cell_width))
+        row0 = max(0, math.floor((top - self.origin_y) / self.cell_height))
+        row1 = min(self.rows - 1, math.floor((bottom - self.origin_y) / self.cell_height))
+        return range(row0, row1 + 1), range(col0, col1 + 1)
+
+    def candidates(self, left, top, right, bottom):
+        """Blocos das células que o retângulo toca (fase larga)."""
+        rows, cols = self.cell_range(left, top, right, bottom)
+        for row in rows:
+            cells = self._cells[row]
+            for col in cols:
+                if cells[col] is not None:
+                    yield cells[col]
+
+    def sweep(self, x0, y0, x1, y1, radius):
+        """
+        Primeiro bloco tocado pela bola indo de (x0, y0) a (x1, y1).
+
+        Devolve (bloco, t, eixo) com t em [0, 1] ao longo do trecho e eixo
+        'x' (bateu numa lateral) ou 'y' (em cima/embaixo), ou None.
+        """
+        if self._count == 0:
+            return None
+        dx, dy = x1 - x0, y1 - y0
+        best = None
+        for block in self.candidates(min(x0, x1) - radius, min(y0, y1) - radius,
+                                     max(x0, x1) + radius, max(y0, y1) + radius):
+            hit = _segment_box(x0, y0, dx, dy,
+                               block.x - radius, block.y - radius,
+                               block.x + block.width + radius, block.y + block.height + radius)
+            if hit is not None and (best is None or hit[0] < best[1]):
+                best = (block, hit[0], hit[1])
+        return best
+
+
+def _segment_box(x0, y0, dx, dy, left, top, right, bottom):
+    """Interseção do segmento (x0, y0) + t*(dx, dy), t em [0, 1], com o retângulo (slabs)."""
+    t_near, t_far, axis = -math.inf, math.inf, None
+    for p, d, lo, hi, name in ((x0, dx, left, right, 'x'), (y0, dy, top, bottom, 'y')):
+        if d == 0:
+            if p <= lo or p >= hi:
+                return None
+            continue
+        t1, t2 = (lo - p) / d, (hi - p) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_near:
+            t_near, axis = t1, name
+        t_far = min(t_far, t2)
+        if t_near >= t_far:
+            return None
+    if t_far <= 0 or t_near >= 1 or axis is None:
+        return None
+    return max(t_near, 0.0), axis
@@ -0,0 +1,94 @@
+"""
+Hash espacial para a fase larga (broad phase) de colisões entre círculos
+Em vez de testar todo tiro contra todo inimigo, cada alvo é guardado nas
+células de uma grade uniforme que o círculo dele cobre; um tiro só é testado
+(fase estreita, ex.: Enemy.check_collision_bullet) contra os alvos das
+células em volta dele.
+
+Uso:
+    grid = SpatialHash(cell_size=100)
+    grid.clear()
+    for enemy in enemies:
+        grid.insert(enemy, enemy.x, enemy.y, enemy.size // 2)
+    for bullet, enemy in grid.first_hits(bullets, Enemy.check_collision_bullet):
+        ...                      # grid.remove(enemy) se ele for destruído
+
+BruteForce tem a mesma interface sem fase larga (todo alvo é candidato), para
+comparar as duas versões no mesmo código.
+"""
+
+import math
+from collections import defaultdict
+
+# --- Configurações ---
+DEFAULT_CELL_SIZE = 100  # Lado da célula (px); ~ diâmetro do maior alvo
+
+
+class SpatialHash:
+    """Grade uniforme esparsa: (coluna, linha) -> objetos que tocam a célula."""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._objects = {}  # objeto -> (ordem de inserção, células em que foi inserido)
+        self._next_order = 0
+
+    def _cell_keys(self, x, y, radius):
+        size = self.cell_size
+        col0, col1 = math.floor((x - radius) / size), math.floor((x + radius) / size)
+        row0, row1 = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        return [(col, row) for col in range(col0, col1 + 1) for row in range(row0, row1 + 1)]
+
+    def clear(self):
+        self._cells.clear()
+        self._objects.clear()
+        self._next_order = 0
+
+    def insert(self, obj, x, y, radius):
+        keys = self._cell_keys(x, y, radius)
+        for key in keys:
+            self._cells[key].append(obj)
+        self._objects[obj] = (self._next_order, keys)
+        self._next_order += 1
+
+    def remove(self, obj):
+        _, keys = self._objects.pop(obj, (None, ()))
+        for key in keys:
+            self._cells[key].remove(obj)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def query(self, x, y, radius):
+        """Objetos das células que o círculo toca (sem repetição, na ordem de inserção)."""
+        found = set()
+        for key in self._cell_keys(x, y, radius):
+            cell = self._cells.get(key)
+            if cell:
+                found.update(cell)
+        return sorted(found, key=lambda obj: self._objects[obj][0])
+
+    def first_hits(self, projectiles, collide):
+        """
+        Para cada projétil, o primeiro alvo próximo em que collide(alvo, projétil)
+        é verdadeiro. Gera pares (projétil, alvo); o chamador pode remover o alvo
+        da grade entre um par e outro.
+        """
+        for projectile in projectiles:
+            for target in self.query(projectile.x, projectile.y, projectile.radius):
+                if collide(target, projectile):
+                    yield projectile, target
+                    break
+
+
+class BruteForce(SpatialHash):
+    """Mesma interface, mas query() devolve todos os alvos (teste de todos contra todos)."""
+
+    def insert(self, obj, x, y, radius):
+        self._objects[obj] = None
+
+    def remove(self, obj):
+        self._objects.pop(obj, None)
+
+    def query(self, x, y, radius):
+        return list(self._objects)
@@ -0,0 +1,206 @@
+"""
+Inferência MediaPipe assíncrona, desacoplada do loop de renderização
+Uma thread consome frames do CameraStream, roda o modelo (hands / pose / face_mesh)
+e publica o resultado mais recente com timestamp. O jogo renderiza a 60 FPS e
+extrapola os landmarks entre uma atualização e outra.
+
+Uso:
+    cap = CameraStream(0)
+    worker = InferenceWorker(cap, face_mesh, extract_points=extrair_pontos).start()
+    result = worker.latest()            # Último resultado (não bloqueia)
+    points = worker.predict_points()    # Pontos extrapolados para "agora"
+
+Resolução de inferência: o modelo pode receber uma cópia reduzida do frame
+(inference_width / resize_for_inference) enquanto o preview usa o frame cheio.
+Os landmarks do MediaPipe são normalizados (0-1), então valem nos dois tamanhos.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# --- Configurações ---
+MAX_EXTRAPOLATION = 0.12  # Segundos máximos de extrapolação além do último resultado
+VELOCITY_SMOOTHING = 0.5  # Suavização exponencial da velocidade (0 = sem suavizar)
+
+
+def resize_for_inference(frame, width):
+    """
+    Cópia do frame reduzida para `width` pixels de largura, mantendo a proporção.
+    Com width None/0, ou frame já menor, devolve o próprio frame.
+    """
+    if not width or frame.shape[1] <= width:
+        return frame
+    h, w = frame.shape[:2]
+    return cv2.resize(frame, (width, round(h * width / w)), interpolation=cv2.INTER_AREA)
+
+
+class InferenceResult:
+    """Resultado publicado pela thread de inferência."""
+    __slots__ = ('frame_id', 'frame', 'results', 'points', 'timestamp', 'latency')
+
+    def __init__(self, frame_id, frame, results, points, timestamp, latency):
+        self.frame_id = frame_id  # Id do frame da câmera que gerou o resultado
+        self.frame = frame  # Frame BGR (espelhado) usado na inferência
+        self.results = results  # Objeto retornado por model.process()
+        self.points = points  # Array (N, 2+) de pontos normalizados, ou None sem detecção
+        self.timestamp = timestamp  # Momento da captura (time.perf_counter)
+        self.latency = latency  # Segundos gastos em model.process()
+
+
+class LandmarkExtrapolator:
+    """
+    Extrapolação linear de landmarks entre atualizações da inferência.
+    Guarda a última posição e uma velocidade suavizada; a previsão é limitada a
+    max_horizon segundos para não "voar" quando o tracking atrasa.
+    """
+
+    def __init__(self, max_horizon=MAX_EXTRAPOLATION, smoothing=VELOCITY_SMOOTHING):
+        self.max_horizon = max_horizon
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.points = None
+        self.velocity = None
+        self.timestamp = None
+
+    def update(self, points, timestamp):
+        if points is None:
+            self.reset()
+            return
+
+        points = np.asarray(points, dtype=np.float32)
+        if self.points is not None and self.points.shape == points.shape and timestamp > self.timestamp:
+            velocity = (points - self.points) / (timestamp - self.timestamp)
+            if self.velocity is None:
+                self.velocity = velocity
+            else:
+                self.velocity = self.smoothing * self.velocity + (1 - self.smoothing) * velocity
+        else:
+            self.velocity = None
+
+        self.points = points
+        self.timestamp = timestamp
+
+    def predict(self, t=None):
+        """Retorna os pontos previstos para o instante t (padrão: agora)."""
+        if self.points is None:
+            return None
+        if self.velocity is None:
+            return self.points
+
+        t = time.perf_counter() if t is None else t
+        dt = min(max(t - self.timestamp, 0.0), self.max_horizon)
+        return self.points + self.velocity * dt
+
+
+class InferenceWorker:
+    """
+    Thread que roda model.process() no frame mais novo do CameraStream.
+
+    model: solução MediaPipe (Hands, Pose, FaceMesh) ou qualquer objeto com process(rgb)
+    extract_points: função results -> array de pontos normalizados (ou None),
+                    usada para a extrapolação entre atualizações
+    flip: espelha o frame antes da inferência, como os jogos já fazem
+    inference_width: largura do frame entregue ao modelo (None = resolução da câmera);
+                     InferenceResult.frame continua em resolução cheia
+    """
+
+    def __init__(self, camera, model, extract_points=None, flip=True,
+                 max_horizon=MAX_EXTRAPOLATION, inference_width=None):
+        self.camera = camera
+        self.model = model
+        self.extract_points = extract_points
+        self.flip = flip
+        self.inference_width = inference_width
+        self.extrapolator = LandmarkExtrapolator(max_horizon=max_horizon)
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._latest = None
+        self._running = False
+        self._thread = None
+
+        # Estatísticas
+        self.inferences = 0
+        self.total_latency = 0.0
+        self._started_at = None
+
+    # --- Ciclo de vida ---
+    def start(self):
+        self._running = True
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="InferenceWorker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def is_running(self):
+        return self._running
+
+    def wait_ready(self, timeout=5.0):
+        """Espera o primeiro resultado. Retorna False se a câmera não entregou frames."""
+        return self._ready.wait(timeout) and self._latest is not None
+
+    def _run(self):
+        last_id = 0
+        while self._running:
+            frame_id, frame, captured_at = self.camera.read_latest_timed(last_id, timeout=0.5)
+            if frame is None:
+                # Sem frame novo: timeout (segue esperando) ou thread de captura
+                # encerrada, e aí read_latest volta na hora e o loop giraria sem parar
+                if not self.camera.isOpened():
+                    break
+                continue
+            last_id = frame_id
+
+            if self.flip:
+                frame = cv2.flip(frame, 1)
+            frame_rgb = cv2.cvtColor(resize_for_inference(frame, self.inference_width), cv2.COLOR_BGR2RGB)
+
+            start = time.perf_counter()
+            results = self.model.process(frame_rgb)
+            latency = time.perf_counter() - start
+
+            points = self.extract_points(results) if self.extract_points else None
+            result = InferenceResult(frame_id, frame, results, points, captured_at, latency)
+
+            with self._lock:
+                self._latest = result
+                self.extrapolator.update(points, captured_at)
+                self.inferences += 1
+                self.total_latency += latency
+            self._ready.set()
+
+        self._running = False
+        self._ready.set()
+
+    # --- Consulta (thread do jogo) ---
+    def latest(self):
+        """Último resultado publicado (None antes da primeira inferência)."""
+        with self._lock:
+            return self._latest
+
+    def predict_points(self, t=None):
+        """Pontos extrapolados para o instante t, ou None se não há detecção."""
+        with self._lock:
+            return self.extrapolator.predict(t)
+
+    def stats(self):
+        elapsed = max(time.perf_counter() - (self._started_at or time.perf_counter()), 1e-6)
+        with self._lock:
+            inferences = self.inferences
+            avg_latency = self.total_latency / inferences if inferences else 0.0
+        return {
+            'inferences': inferences,
+            'inference_fps': inferences / elapsed,
+            'avg_latency_ms': avg_latency * 1000,
+        }
@@ -3,6 +3,9 @@ import mediapipe as mp
 import pygame
 import random
 import sys
+from captura_camera import CameraStream
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
 
 # --- Configurações do Jogo ---
 SCREEN_WIDTH = 800
@@ -11,6 +14,7 @@ GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 SNAKE_SPEED = 10
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores
 WHITE = (255, 255, 255)
@@ -38,7 +42,7 @@ hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7
 mp_drawing = mp.solutions.drawing_utils
 
 # --- Inicialização da Webcam ---
-cap = cv2.VideoCapture(0)
+cap = CameraStream(0)
 if not cap.isOpened():
     print("Erro ao abrir a câmera.")
     sys.exit()
@@ -95,7 +99,7 @@ class Food:
 
 # --- Função de Desenho da Pontuação ---
 def draw_score(surface, score):
-    score_text = font.render(f"Pontuação: {score}", True, BLACK)
+    score_text = render_text(font, f"Pontuação: {score}", BLACK)
     surface.blit(score_text, (10, 10))
 
 # --- Tela de Início ---
@@ -110,8 +114,8 @@ def start_screen():
                     return
 
         screen.fill(BLUE)
-        title_text = font.render("Jogo da Cobrinha por Mão", True, WHITE)
-        start_text = font.render("Pressione ESPAÇO para começar", True, WHITE)
+        title_text = render_text(font, "Jogo da Cobrinha por Mão", WHITE)
+        start_text = render_text(font, "Pressione ESPAÇO para começar", WHITE)
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 3))
         screen.blit(start_text, (SCREEN_WIDTH // 2 - start_text.get_width() // 2, SCREEN_HEIGHT // 2))
         pygame.display.flip()
@@ -128,9 +132,9 @@ def game_over_screen(final_score):
                     return
 
         screen.fill(BLACK)
-        game_over_text = font.render("GAME OVER", True, RED)
-        score_text = font.render(f"Pontuação Final: {final_score}", True, WHITE)
-        restart_text = font.render("Pressione ESPAÇO para reiniciar", True, WHITE)
+        game_over_text = render_text(font, "GAME OVER", RED)
+        score_text = render_text(font, f"Pontuação Final: {final_score}", WHITE)
+        restart_text = render_text(font, "Pressione ESPAÇO para reiniciar", WHITE)
         screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3))
         screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
         screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
@@ -154,7 +158,7 @@ def game_loop():
             break
 
         frame = cv2.flip(frame, 1)  # Espelha a imagem para uma visualização mais intuitiva
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
 
         if results.multi_hand_landmarks:
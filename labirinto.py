@@ -19,6 +19,13 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from inferencia_async import resize_for_inference
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +33,7 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 320
 WEBCAM_HEIGHT = 240
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores vibrantes
 DARK_BG = (10, 15, 25)
@@ -49,10 +57,14 @@ CELL_SIZE = 60
 MAZE_COLS = 19
 MAZE_ROWS = 13
 PLAYER_SPEED = 5
+SHOW_DRAW_TIME = False  # Mostra no canto da tela o tempo de desenho do labirinto por frame (F3 alterna)
+DRAW_TIME_REFRESH = 0.5  # Segundos entre atualizações do texto do tempo de desenho
 
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # F2 alterna entre flip() e atualização parcial
 pygame.display.set_caption("🧩 Labirinto - Controle por Rosto")
 clock = pygame.time.Clock()
 
@@ -141,6 +153,15 @@ class Player:
                 if len(self.trail) > self.max_trail:
                     self.trail.pop(0)
     
+    def bounds(self, offset_x, offset_y):
+        """Retângulo na tela que cobre o jogador, o brilho e o rastro"""
+        margin = self.radius + 3 * 8 + 2  # Maior círculo de brilho
+        xs = [self.x] + [tx for tx, _ in self.trail]
+        ys = [self.y] + [ty for _, ty in self.trail]
+        left = int(offset_x + min(xs)) - margin
+        top = int(offset_y + min(ys)) - margin
+        return pygame.Rect(left, top, int(max(xs) - min(xs)) + 2 * margin, int(max(ys) - min(ys)) + 2 * margin)
+    
     def draw(self, surface, offset_x, offset_y):
         """Desenha o jogador com efeito brilhante"""
         draw_x = int(offset_x + self.x)
@@ -150,17 +171,13 @@ class Player:
         for i, (tx, ty) in enumerate(self.trail):
             alpha = int(255 * (i / len(self.trail)))
             size = int(self.radius * (0.5 + 0.5 * i / len(self.trail)))
-            s = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*PLAYER_COLOR, alpha), (size, size), size)
-            surface.blit(s, (offset_x + tx - size, offset_y + ty - size))
+            blit_circle(surface, PLAYER_COLOR, (offset_x + tx, offset_y + ty), size, alpha)
         
         # Brilho
         for i in range(3):
             size = self.radius + (3-i) * 8
             alpha = 50 + int(30 * abs(math.sin(time.time() * 3)))
-            s = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*PLAYER_COLOR, alpha), (size, size), size)
-            surface.blit(s, (draw_x - size, draw_y - size))
+            blit_circle(surface, PLAYER_COLOR, (draw_x, draw_y), size, alpha)
         
         # Corpo principal
         pygame.draw.circle(surface, PLAYER_COLOR, (draw_x, draw_y), self.radius)
@@ -177,14 +194,14 @@ def draw_rounded_rect(surface, color, rect, radius=20):
     pygame.draw.rect(surface, color, rect, border_radius=radius)
 
 def draw_text(surface, text, font, color, x, y, center=True):
-    text_obj = font.render(text, True, (0, 0, 0))
+    text_obj = render_text(font, text, (0, 0, 0))
     if center:
         rect = text_obj.get_rect(center=(x+2, y+2))
     else:
         rect = (x+2, y+2)
     surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -195,29 +212,35 @@ def draw_card(surface, x, y, width, height, color=(30, 34, 42)):
     draw_rounded_rect(surface, color, (x, y, width, height), 20)
     pygame.draw.rect(surface, (50, 54, 62), (x, y, width, height), 3, border_radius=20)
 
-def draw_maze(surface, maze, offset_x, offset_y, player):
-    """Desenha o labirinto com efeitos visuais"""
+def build_maze_surface(maze):
+    """Desenha paredes, caminho e entrada uma única vez (refeito só ao gerar um labirinto novo)"""
+    maze_surface = pygame.Surface((MAZE_COLS * CELL_SIZE, MAZE_ROWS * CELL_SIZE)).convert()
     for row in range(MAZE_ROWS):
         for col in range(MAZE_COLS):
-            x = offset_x + col * CELL_SIZE
-            y = offset_y + row * CELL_SIZE
+            x = col * CELL_SIZE
+            y = row * CELL_SIZE
             
             if maze[row][col] == 1:
                 # Parede com gradiente
                 color_variation = int(10 * math.sin(col + row))
                 wall_color = tuple(max(0, min(255, c + color_variation)) for c in WALL_COLOR)
-                pygame.draw.rect(surface, wall_color, (x, y, CELL_SIZE, CELL_SIZE))
-                pygame.draw.rect(surface, (60, 70, 87), (x, y, CELL_SIZE, CELL_SIZE), 1)
+                pygame.draw.rect(maze_surface, wall_color, (x, y, CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(maze_surface, (60, 70, 87), (x, y, CELL_SIZE, CELL_SIZE), 1)
             else:
                 # Caminho
-                pygame.draw.rect(surface, PATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(maze_surface, PATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
     
     # Entrada
-    start_x = offset_x + 0 * CELL_SIZE
-    start_y = offset_y + 1 * CELL_SIZE
-    pygame.draw.rect(surface, START_COLOR, (start_x, start_y, CELL_SIZE, CELL_SIZE))
-    draw_text(surface, "🏁", font_small, TEXT_PRIMARY, 
+    start_x = 0 * CELL_SIZE
+    start_y = 1 * CELL_SIZE
+    pygame.draw.rect(maze_surface, START_COLOR, (start_x, start_y, CELL_SIZE, CELL_SIZE))
+    draw_text(maze_surface, "🏁", font_small, TEXT_PRIMARY, 
               start_x + CELL_SIZE//2, start_y + CELL_SIZE//2)
+    return maze_surface
+
+def draw_maze(surface, maze_surface, offset_x, offset_y):
+    """Desenha o labirinto pronto e, por cima, só a saída pulsante"""
+    surface.blit(maze_surface, (offset_x, offset_y))
     
     # Saída
     end_x = offset_x + (MAZE_COLS - 1) * CELL_SIZE
@@ -232,6 +255,7 @@ def draw_maze(surface, maze, offset_x, offset_y, player):
     pygame.draw.rect(surface, END_COLOR, (end_x, end_y, CELL_SIZE, CELL_SIZE))
     draw_text(surface, "🏆", font_small, TEXT_PRIMARY, 
               end_x + CELL_SIZE//2, end_y + CELL_SIZE//2)
+    return pygame.Rect(end_x - 10, end_y - 10, CELL_SIZE + 20, CELL_SIZE + 20)  # Área que pulsa
 
 def detect_face_movement(face_landmarks, frame_width, frame_height, center_x, center_y):
     """Detecta movimento do rosto na tela para controle em 4 direções"""
@@ -268,8 +292,10 @@ def detect_face_movement(face_landmarks, frame_width, frame_height, center_x, ce
 # --- Telas ---
 def main_menu():
     """Menu principal"""
+    screen_updater.invalidate()
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -324,12 +350,14 @@ def main_menu():
             draw_text(screen, text, font, color, SCREEN_WIDTH//2, y_offset, True)
             y_offset += 50 if i == 0 or i == 7 or i == 9 else 40
         
-        pygame.display.flip()
+        # Só o título e o subtítulo se movem
+        screen_updater.mark((0, 60, SCREEN_WIDTH, 170))
+        screen_updater.present()
         clock.tick(FPS)
 
 def game_loop():
     """Loop principal do jogo"""
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return False
@@ -337,6 +365,7 @@ def game_loop():
     # Gera labirinto
     maze_gen = MazeGenerator(MAZE_COLS, MAZE_ROWS)
     maze = maze_gen.generate()
+    maze_surface = build_maze_surface(maze)
     
     # Cria jogador
     player = Player(CELL_SIZE // 2, CELL_SIZE * 1.5)
@@ -359,20 +388,33 @@ def game_loop():
     
     running = True
     won = False
+    show_draw_time = SHOW_DRAW_TIME
+    draw_ms_avg = None  # Tempo médio (suavizado) de desenho do labirinto + jogador
+    draw_time_text = ""
+    draw_time_refresh_at = 0.0
+    screen_updater.invalidate()
     
     while running:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                if event.key == pygame.K_F3:
+                    show_draw_time = not show_draw_time
+                    draw_ms_avg = None
+                    draw_time_refresh_at = 0.0
+                    screen_updater.invalidate()
                 if event.key == pygame.K_r:
                     # Reinicia
                     maze = maze_gen.generate()
+                    maze_surface = build_maze_surface(maze)
                     player = Player(CELL_SIZE // 2, CELL_SIZE * 1.5)
                     start_time = time.time()
                     won = False
+                    screen_updater.invalidate()
         
         # Captura frame
         ret, frame = cap.read()
@@ -380,7 +422,7 @@ def game_loop():
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = face_mesh.process(frame_rgb)
         
         h, w = frame.shape[:2]
@@ -471,6 +513,7 @@ def game_loop():
         # HUD superior
         hud_height = 80
         draw_card(screen, 20, 20, SCREEN_WIDTH - 40, hud_height, (25, 29, 37))
+        screen_updater.mark((0, 0, SCREEN_WIDTH, hud_height + 30))
         
         # Título
         draw_text(screen, "🧩 LABIRINTO", font_large, ACCENT_PURPLE, 200, 60)
@@ -492,17 +535,25 @@ def game_loop():
             draw_text(screen, "Mova seu rosto para controlar", font_small, TEXT_SECONDARY, 
                      SCREEN_WIDTH//2, 60)
         
-        # Desenha labirinto
-        draw_maze(screen, maze, maze_offset_x, maze_offset_y, player)
-        
-        # Desenha jogador
+        # Desenha labirinto e jogador (tempo medido para o HUD)
+        draw_start = time.perf_counter()
+        exit_rect = draw_maze(screen, maze_surface, maze_offset_x, maze_offset_y)
         player.draw(screen, maze_offset_x, maze_offset_y)
+        screen_updater.mark(exit_rect, player.bounds(maze_offset_x, maze_offset_y))
+        draw_ms = (time.perf_counter() - draw_start) * 1000
+        draw_ms_avg = draw_ms if draw_ms_avg is None else 0.9 * draw_ms_avg + 0.1 * draw_ms
+        if show_draw_time:
+            # O texto só muda algumas vezes por segundo para não encher o cache do render_text
+            if time.perf_counter() >= draw_time_refresh_at:
+                screen_mode = "parcial" if screen_updater.enabled else "cheia"
+                draw_time_text = f"Desenho: {draw_ms_avg:.1f} ms | Tela {screen_mode}: {screen_updater.fps():.0f} FPS"
+                draw_time_refresh_at = time.perf_counter() + DRAW_TIME_REFRESH
+            draw_text(screen, draw_time_text, font_tiny, TEXT_SECONDARY, SCREEN_WIDTH - 250, 90)
         
         # Mensagem de vitória
         if won:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            screen.blit(overlay, (0, 0))
+            blit_overlay(screen, (0, 0, 0), 150)
+            screen_updater.invalidate()
             
             card_x = SCREEN_WIDTH//2 - 400
             card_y = SCREEN_HEIGHT//2 - 200
@@ -522,6 +573,7 @@ def game_loop():
             
             # Card do indicador
             draw_card(screen, indicator_x - 80, indicator_y - 80, 160, 160, (25, 29, 37))
+            screen_updater.mark((indicator_x - 80, indicator_y - 120, 160, 200))
             
             # Círculo central
             pygame.draw.circle(screen, TEXT_SECONDARY, (indicator_x, indicator_y), 40, 2)
@@ -538,8 +590,7 @@ def game_loop():
             draw_text(screen, "Movimento", font_tiny, TEXT_SECONDARY, indicator_x, indicator_y - 100, True)
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -553,8 +604,9 @@ def game_loop():
         status_color = ACCENT_GREEN if face_detected else ACCENT_RED
         draw_text(screen, status_text, font_tiny, status_color, 
                   webcam_x + WEBCAM_WIDTH//2, webcam_y - 20, True)
+        screen_updater.mark((webcam_x - 20, webcam_y - 40, WEBCAM_WIDTH + 40, WEBCAM_HEIGHT + 40))
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
     
     cap.release()
@@ -571,6 +623,7 @@ if __name__ == "__main__":
             else:
                 break
     finally:
+        screen_updater.report()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,130 @@
+"""
+Landmarks de pose do MediaPipe como um array NumPy (33, 4)
+Os jogos de pose liam results.pose_landmarks.landmark atributo por atributo
+(e montavam dicionários) a cada frame. Aqui a pose vira um único array
+[x, y, z, visibilidade] por frame, e ângulos das articulações, distâncias e
+coordenadas normalizadas pelo tronco saem dele em operações vetorizadas.
+
+Uso:
+    points = pose_array(results)          # (33, 4) ou None sem pose
+    if points is not None:
+        pose = PoseFeatures(points)
+        pose.angle('left_elbow')          # Graus, 0 a 180
+        pose.y[LEFT_WRIST] < pose.y[NOSE]
+        pose.distance(LEFT_WRIST, NOSE)
+        pose.normalized                   # (33, 2) centrado no tronco
+
+pose_array também serve de extract_points para o InferenceWorker.
+"""
+
+import numpy as np
+
+# --- Índices dos landmarks (mesma numeração de mp.solutions.pose.PoseLandmark) ---
+NUM_LANDMARKS = 33
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+LEFT_KNEE, RIGHT_KNEE = 25, 26
+LEFT_ANKLE, RIGHT_ANKLE = 27, 28
+
+TORSO = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)  # Centro da normalização
+MIN_SHOULDER_DISTANCE = 0.1  # Escala usada quando os ombros coincidem
+
+# Ângulos das articulações: nome -> (ponta, vértice, base)
+JOINT_ANGLES = {
+    'left_elbow': (LEFT_WRIST, LEFT_ELBOW, LEFT_SHOULDER),
+    'right_elbow': (RIGHT_WRIST, RIGHT_ELBOW, RIGHT_SHOULDER),
+    'left_shoulder': (LEFT_ELBOW, LEFT_SHOULDER, LEFT_HIP),
+    'right_shoulder': (RIGHT_ELBOW, RIGHT_SHOULDER, RIGHT_HIP),
+    'left_hip': (LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE),
+    'right_hip': (RIGHT_SHOULDER, RIGHT_HIP, RIGHT_KNEE),
+    'left_knee': (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+    'right_knee': (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE),
+}
+ANGLE_INDEX = {name: i for i, name in enumerate(JOINT_ANGLES)}
+_ANGLE_A, _ANGLE_B, _ANGLE_C = (np.array(column) for column in zip(*JOINT_ANGLES.values()))
+
+
+def pose_array(results):
+    """results.pose_landmarks -> array (33, 4) float32 [x, y, z, visibilidade], ou None."""
+    if not results.pose_landmarks:
+        return None
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+                    dtype=np.float32)
+
+
+def points_from_dict(landmarks_dict):
+    """Dicionário {índice: (x, y, z)} (poses de referência) -> array (33, 4) com NaN no que falta."""
+    points = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    for landmark_id, coords in landmarks_dict.items():
+        points[landmark_id, :len(coords)] = coords
+    return points
+
+
+def joint_angles(points):
+    """Ângulos (graus, 0 a 180) de todas as articulações de JOINT_ANGLES de uma vez."""
+    xy = points[:, :2]
+    a = xy[_ANGLE_A] - xy[_ANGLE_B]
+    c = xy[_ANGLE_C] - xy[_ANGLE_B]
+    radians = np.arctan2(c[:, 1], c[:, 0]) - np.arctan2(a[:, 1], a[:, 0])
+    angles = np.abs(np.degrees(radians))
+    return np.where(angles > 180, 360 - angles, angles)
+
+
+def normalize(points):
+    """
+    Coordenadas (x, y) centradas no meio do tronco e divididas pela distância
+    entre os ombros, para comparar pessoas de tamanhos e distâncias diferentes.
+    Sem ombros e quadris devolve (x, y) sem normalizar.
+    """
+    xy = points[:, :2]
+    torso = xy[list(TORSO)]
+    if np.isnan(torso).any():
+        return xy.copy()
+    center = torso.mean(axis=0)
+    scale = float(np.hypot(*(xy[RIGHT_SHOULDER] - xy[LEFT_SHOULDER])))
+    if scale == 0:
+        scale = MIN_SHOULDER_DISTANCE
+    return (xy - center) / scale
+
+
+class PoseFeatures:
+    """Atributos de uma pose (33, 4), calculados uma vez por frame e sob demanda."""
+
+    def __init__(self, points):
+        self.points = points
+        self.x = points[:, 0]
+        self.y = points[:, 1]
+        self._angles = None
+        self._normalized = None
+
+    @classmethod
+    def from_results(cls, results):
+        points = pose_array(results)
+        return cls(points) if points is not None else None
+
+    @property
+    def angles(self):
+        """Array com os ângulos de JOINT_ANGLES (na ordem de ANGLE_INDEX)."""
+        if self._angles is None:
+            self._angles = joint_angles(self.points)
+        return self._angles
+
+    def angle(self, name):
+        return float(self.angles[ANGLE_INDEX[name]])
+
+    def distance(self, i, j):
+        """Distância (x, y) entre dois landmarks, em coordenadas normalizadas da imagem."""
+        return float(np.hypot(self.x[i] - self.x[j], self.y[i] - self.y[j]))
+
+    @property
+    def normalized(self):
+        if self._normalized is None:
+            self._normalized = normalize(self.points)
+        return self._normalized
+
+    def mean_distance(self, reference_ids, reference_xy):
+        """Distância média entre os landmarks normalizados e uma referência (ids, xy normalizado)."""
+        return float(np.linalg.norm(self.normalized[reference_ids] - reference_xy, axis=1).mean())
@@ -19,6 +19,11 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +31,7 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 400
 WEBCAM_HEIGHT = 300
 FPS = 30
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores modernas
 DARK_BG = (15, 15, 30)
@@ -46,6 +52,8 @@ STARTING_SEQUENCE = 3
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
 pygame.display.set_caption("🧠 Memória de Gestos")
 clock = pygame.time.Clock()
 
@@ -54,6 +62,7 @@ font_large = pygame.font.Font(None, 70)
 font_medium = pygame.font.Font(None, 50)
 font_small = pygame.font.Font(None, 40)
 font_tiny = pygame.font.Font(None, 30)
+font_emoji = pygame.font.Font(None, 120)
 
 # MediaPipe Hands
 mp_hands = mp.solutions.hands
@@ -164,11 +173,11 @@ def detect_gesture(hand_landmarks):
 # --- UI ---
 def draw_text(surface, text, font, color, x, y, center=True, shadow=True):
     if shadow:
-        text_obj = font.render(text, True, (0, 0, 0))
+        text_obj = render_text(font, text, (0, 0, 0))
         rect = text_obj.get_rect(center=(x+3, y+3)) if center else (x+3, y+3)
         surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     rect = text_obj.get_rect(center=(x, y)) if center else (x, y)
     surface.blit(text_obj, rect)
 
@@ -193,8 +202,7 @@ def draw_gesture_card(surface, x, y, width, height, gesture_key, pulse=False):
     draw_card(surface, x, y, width, height, gesture["cor"], TEXT_PRIMARY)
     
     # Emoji grande
-    emoji_font = pygame.font.Font(None, 120)
-    draw_text(surface, gesture["emoji"], emoji_font, TEXT_PRIMARY, 
+    draw_text(surface, gesture["emoji"], font_emoji, TEXT_PRIMARY, 
               x + width // 2, y + height // 2 - 20, True, False)
     
     # Nome
@@ -290,7 +298,7 @@ def main_menu():
         clock.tick(FPS)
 
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return 0
@@ -328,7 +336,7 @@ def game_loop():
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
         
         # Detecta gesto
@@ -506,8 +514,7 @@ def game_loop():
                       SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -528,8 +535,10 @@ def game_loop():
     return show_results(score, round_num)
 
 def show_results(score, rounds):
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -571,7 +580,7 @@ def show_results(score, rounds):
         draw_text(screen, "ESPAÇO para jogar novamente | ESC para sair", 
                   font_small, TEXT_SECONDARY, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
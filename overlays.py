@@ -0,0 +1,77 @@
+"""
+Camadas translúcidas reaproveitadas (tintas de tela, flashes, HUDs e cards)
+Os jogos criavam um pygame.Surface(SRCALPHA) do tamanho da tela (ou do HUD /
+card) a cada frame só para pintar um retângulo com alfa. Aqui cada camada
+(tamanho, cor, arredondamento) é criada uma vez, sem alfa por pixel, e a
+transparência muda com set_alpha() antes do blit.
+
+Uso:
+    from overlays import blit_overlay
+    blit_overlay(screen, (0, 0, 0), 150)                               # Tela inteira
+    blit_overlay(screen, (0, 0, 0), 140, (0, 0, SCREEN_WIDTH, 140))    # HUD
+    blit_overlay(screen, (20, 20, 40), 230, card_rect, border_radius=20)
+
+Camadas estáticas mais elaboradas (gradientes) podem ser guardadas com
+overlays.cached(nome, builder).
+"""
+
+import pygame
+
+
+class OverlayManager:
+    """Surfaces de cor sólida por (tamanho, cor, arredondamento), criadas uma vez."""
+
+    def __init__(self):
+        self._surfaces = {}
+        self._static = {}
+
+    def get(self, size, color, border_radius=0):
+        key = (tuple(size), tuple(color[:3]), border_radius)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._build(key[0], key[1], border_radius)
+            self._surfaces[key] = surface
+        return surface
+
+    @staticmethod
+    def _build(size, color, border_radius):
+        surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        if border_radius <= 0:
+            surface.fill(color)
+            return surface
+        # Cantos arredondados: fundo com colorkey (transparente) + retângulo na cor
+        key = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+        surface.fill(key)
+        pygame.draw.rect(surface, color, surface.get_rect(), border_radius=border_radius)
+        surface.set_colorkey(key)
+        return surface
+
+    def blit(self, target, color, alpha, rect=None, border_radius=0):
+        """Pinta `color` com transparência `alpha` em `rect` (padrão: target inteiro)."""
+        rect = target.get_rect() if rect is None else pygame.Rect(rect)
+        if alpha <= 0 or rect.width <= 0 or rect.height <= 0:
+            return
+        surface = self.get(rect.size, color, border_radius)
+        surface.set_alpha(min(int(alpha), 255))
+        target.blit(surface, rect.topleft)
+
+    def cached(self, name, builder):
+        """Surface estática construída por builder() na primeira chamada."""
+        surface = self._static.get(name)
+        if surface is None:
+            surface = self._static[name] = builder()
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self._static.clear()
+
+
+overlays = OverlayManager()
+
+
+def blit_overlay(target, color, alpha, rect=None, border_radius=0):
+    """overlays.blit(): retângulo translúcido sem criar Surface a cada frame."""
+    overlays.blit(target, color, alpha, rect, border_radius)
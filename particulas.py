@@ -0,0 +1,143 @@
+"""
+Sistema de partículas em arrays NumPy (structure of arrays)
+Os jogos guardavam cada partícula como objeto/dict e atualizavam uma por uma,
+com particles.remove(p) dentro do laço (O(n²)). Aqui posição, velocidade,
+vida, tamanho e cor ficam em arrays contíguos: o update é vetorizado, as
+partículas mortas são compactadas de uma vez e o desenho sai em lote
+(surface.blits) com os sprites do atlas_sprites.
+
+Uso:
+    particles = ParticleSystem(gravity=0.3, decay=0.02)
+    particles.emit(x, y, cor, 20, speed=(2, 8))                  # Explosão radial
+    particles.emit_spray(x, y, cor, 5, vx=(-3, 3), vy=(-5, -2))   # Jato para cima
+    particles.update()                                           # Uma vez por frame
+    particles.draw(screen)
+"""
+
+import numpy as np
+
+from atlas_sprites import atlas
+
+# --- Configurações ---
+INITIAL_CAPACITY = 1024  # Partículas alocadas de início (cresce dobrando)
+
+_rng = np.random.default_rng()
+
+
+def _uniform(bounds, count):
+    """Sorteia `count` valores em [lo, hi); aceita também um valor fixo."""
+    if np.isscalar(bounds):
+        return np.full(count, bounds, dtype=np.float32)
+    return _rng.uniform(bounds[0], bounds[1], count).astype(np.float32)
+
+
+def _sizes(bounds, count):
+    """Tamanhos inteiros em [lo, hi] (como random.randint), ou um valor fixo."""
+    if np.isscalar(bounds):
+        return np.full(count, bounds, dtype=np.float32)
+    return _rng.integers(bounds[0], bounds[1] + 1, count).astype(np.float32)
+
+
+class ParticleSystem:
+    """
+    Partículas com vida de 1.0 a 0.0, guardadas em arrays paralelos.
+
+    gravity: somado a vy a cada frame; decay: vida perdida por frame;
+    shrink: se True, o raio diminui junto com a vida (alfa sempre diminui).
+    """
+
+    def __init__(self, gravity=0.0, decay=0.02, shrink=False, capacity=INITIAL_CAPACITY):
+        self.gravity = gravity
+        self.decay = decay
+        self.shrink = shrink
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old, n = getattr(self, 'pos', None), self.count
+        pos = np.zeros((capacity, 2), dtype=np.float32)
+        vel = np.zeros((capacity, 2), dtype=np.float32)
+        life = np.zeros(capacity, dtype=np.float32)
+        size = np.zeros(capacity, dtype=np.float32)
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        if old is not None and n:
+            pos[:n], vel[:n], life[:n] = self.pos[:n], self.vel[:n], self.life[:n]
+            size[:n], color[:n] = self.size[:n], self.color[:n]
+        self.pos, self.vel, self.life, self.size, self.color = pos, vel, life, size, color
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, count):
+        """Índices livres para `count` partículas novas (realoca se precisar)."""
+        start, end = self.count, self.count + count
+        if end > len(self.life):
+            self._allocate(max(end, 2 * len(self.life)))
+        self.count = end
+        return slice(start, end)
+
+    def _add(self, x, y, vx, vy, color, size):
+        idx = self._reserve(len(vx))
+        self.pos[idx, 0] = x
+        self.pos[idx, 1] = y
+        self.vel[idx, 0] = vx
+        self.vel[idx, 1] = vy
+        self.life[idx] = 1.0
+        self.size[idx] = size
+        self.color[idx] = color[:3]
+
+    def emit(self, x, y, color, count, speed=(2, 8), size=(3, 8)):
+        """Explosão: direções aleatórias, velocidade sorteada em `speed`."""
+        if count <= 0:
+            return
+        angle = _rng.uniform(0, 2 * np.pi, count)
+        speed = _uniform(speed, count)
+        self._add(x, y, np.cos(angle) * speed, np.sin(angle) * speed, color, _sizes(size, count))
+
+    def emit_spray(self, x, y, color, count, vx=(-5, 5), vy=(-8, -2), size=(3, 8)):
+        """Jato: vx e vy sorteados separadamente (ex.: faíscas subindo)."""
+        if count <= 0:
+            return
+        self._add(x, y, _uniform(vx, count), _uniform(vy, count), color, _sizes(size, count))
+
+    def update(self):
+        """Move todas as partículas e remove as mortas (compactando os arrays)."""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        if self.gravity:
+            self.vel[:n, 1] += self.gravity
+        self.life[:n] -= self.decay
+
+        alive = self.life[:n] > 0
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        for arr in (self.pos, self.vel, self.life, self.size, self.color):
+            arr[:k] = arr[keep]
+        self.count = k
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, surface, offset=(0, 0)):
+        """Desenha todas as partículas vivas com um único surface.blits()."""
+        n = self.count
+        if n == 0:
+            return
+        life = self.life[:n]
+        radius = self.size[:n] * life if self.shrink else self.size[:n]
+        radius = np.maximum(np.rint(radius), 1).astype(np.int32)
+        alpha = np.clip(life * 255, 0, 255).astype(np.int32)
+        x = (self.pos[:n, 0] + offset[0]).astype(np.int32) - radius
+        y = (self.pos[:n, 1] + offset[1]).astype(np.int32) - radius
+
+        blits = []
+        for color, r, a, px, py in zip(map(tuple, self.color[:n].tolist()), radius.tolist(),
+                                       alpha.tolist(), x.tolist(), y.tolist()):
+            sprite = atlas.circle(color, r, a)
+            if sprite is not None:
+                blits.append((sprite, (px, py)))
+        surface.blits(blits, doreturn=False)
@@ -21,6 +21,10 @@ import random
 import time
 import mediapipe as mp
 import numpy as np
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -28,6 +32,7 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 640
 WEBCAM_HEIGHT = 480
 FPS = 30
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores modernas
 DARK_BG = (20, 20, 30)
@@ -42,6 +47,7 @@ TEXT_SECONDARY = (160, 160, 180)
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
 pygame.display.set_caption("✊✋✌️ Pedra, Papel, Tesoura")
 clock = pygame.time.Clock()
 
@@ -51,6 +57,7 @@ font_large = pygame.font.Font(None, 64)
 font_medium = pygame.font.Font(None, 48)
 font_small = pygame.font.Font(None, 36)
 font_tiny = pygame.font.Font(None, 28)
+emoji_fonts = {}  # Tamanho -> Font dos emojis grandes (criada uma vez por tamanho)
 
 # MediaPipe Hands
 mp_hands = mp.solutions.hands
@@ -69,14 +76,14 @@ def draw_rounded_rect(surface, color, rect, radius=20):
 
 def draw_text(surface, text, font, color, x, y, center=True):
     """Desenha texto com sombra"""
-    text_obj = font.render(text, True, (0, 0, 0))
+    text_obj = render_text(font, text, (0, 0, 0))
     if center:
         rect = text_obj.get_rect(center=(x+2, y+2))
     else:
         rect = (x+2, y+2)
     surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -91,7 +98,9 @@ def draw_card(surface, x, y, width, height, color=CARD_BG):
 
 def draw_emoji(surface, emoji, x, y, size=100):
     """Desenha emoji grande"""
-    emoji_font = pygame.font.Font(None, size)
+    emoji_font = emoji_fonts.get(size)
+    if emoji_font is None:
+        emoji_font = emoji_fonts[size] = pygame.font.Font(None, size)
     draw_text(surface, emoji, emoji_font, TEXT_PRIMARY, x, y, True)
 
 def draw_progress_bar(surface, x, y, width, height, progress, color=ACCENT_BLUE):
@@ -204,14 +213,11 @@ def main_menu():
 
 def game_loop():
     """Loop principal do jogo"""
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0, width=WEBCAM_WIDTH, height=WEBCAM_HEIGHT)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return
     
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_HEIGHT)
-    
     # Estatísticas
     player_score = 0
     computer_score = 0
@@ -247,7 +253,7 @@ def game_loop():
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
         
         # Detecta gesto
@@ -302,8 +308,7 @@ def game_loop():
         screen.fill(DARK_BG)
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -19,6 +19,12 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from cache_texto import render_text
+from overlays import blit_overlay, overlays
+from atlas_sprites import blit_circle
+from inferencia_async import resize_for_inference
 
 # --- Configurações ---
 SCREEN_WIDTH = 1500
@@ -26,6 +32,9 @@ SCREEN_HEIGHT = 950
 WEBCAM_WIDTH = 300
 WEBCAM_HEIGHT = 225
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
+CHECKPOINT_INTERVAL = 20  # Traços entre cópias do canvas guardadas para o desfazer
+MAX_CHECKPOINTS = 10  # Cópias guardadas no máximo (as mais antigas são descartadas)
 
 # Paleta de cores vibrante e moderna
 COLORS = {
@@ -105,6 +114,7 @@ TEMPLATES = {
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
 pygame.display.set_caption("🎨 Pintura no Ar Incrível")
 clock = pygame.time.Clock()
 
@@ -226,7 +236,22 @@ def generate_template_points(template_type, width, height):
     return points
 
 # --- Classe de Desenho ---
+def draw_stroke(surface, stroke):
+    """Desenha um traço completo (círculos nos pontos + linhas entre eles)"""
+    for i, (x, y, color, size) in enumerate(stroke):
+        pygame.draw.circle(surface, color, (int(x), int(y)), size)
+        if i > 0:
+            prev_x, prev_y, prev_color, prev_size = stroke[i-1]
+            pygame.draw.line(surface, color, (prev_x, prev_y), (x, y), size * 2)
+
 class DrawingCanvas:
+    """
+    Canvas com histórico de traços e cópias periódicas (checkpoints).
+
+    A cada CHECKPOINT_INTERVAL traços guarda uma cópia do canvas; o desfazer
+    parte da cópia mais próxima e redesenha só os traços depois dela, em vez
+    de repetir o histórico inteiro.
+    """
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -234,6 +259,7 @@ class DrawingCanvas:
         self.surface.fill(BG_COLOR)
         self.history = []
         self.current_stroke = []
+        self.checkpoints = []  # (número de traços, cópia do canvas), em ordem crescente
         self.template_surface = None
     
     def add_point(self, x, y, color, size):
@@ -245,25 +271,45 @@ class DrawingCanvas:
         if self.current_stroke:
             self.history.append(self.current_stroke.copy())
             self.current_stroke = []
+            if len(self.history) % CHECKPOINT_INTERVAL == 0:
+                self._add_checkpoint(len(self.history))
+    
+    def _add_checkpoint(self, count):
+        """Guarda uma cópia do canvas com os primeiros `count` traços"""
+        self.checkpoints.append((count, self.surface.copy()))
+        if len(self.checkpoints) > MAX_CHECKPOINTS:
+            self.checkpoints.pop(0)
     
     def undo(self):
         if self.history:
             self.history.pop()
+            self.current_stroke = []
             self.redraw()
     
     def clear(self):
         self.history = []
         self.current_stroke = []
+        self.checkpoints = []
         self.surface.fill(BG_COLOR)
     
     def redraw(self):
-        self.surface.fill(BG_COLOR)
-        for stroke in self.history:
-            for i, (x, y, color, size) in enumerate(stroke):
-                pygame.draw.circle(self.surface, color, (int(x), int(y)), size)
-                if i > 0:
-                    prev_x, prev_y, prev_color, prev_size = stroke[i-1]
-                    pygame.draw.line(self.surface, color, (prev_x, prev_y), (x, y), size * 2)
+        """Restaura a cópia mais recente que ainda vale e redesenha os traços seguintes"""
+        count = len(self.history)
+        while self.checkpoints and self.checkpoints[-1][0] > count:
+            self.checkpoints.pop()
+        
+        if self.checkpoints:
+            start, snapshot = self.checkpoints[-1]
+            self.surface.blit(snapshot, (0, 0))
+        else:
+            start = 0
+            self.surface.fill(BG_COLOR)
+        
+        for i in range(start, count):
+            draw_stroke(self.surface, self.history[i])
+            # Refaz as cópias descartadas ao voltar para antes da mais antiga
+            if (i + 1) % CHECKPOINT_INTERVAL == 0 and (not self.checkpoints or self.checkpoints[-1][0] < i + 1):
+                self._add_checkpoint(i + 1)
     
     def set_template(self, template_type):
         """Define um template para guiar o desenho"""
@@ -315,11 +361,7 @@ class ColorButton:
         if self.selected:
             pulse = 1.0 + 0.1 * math.sin(time.time() * 5)
             glow_size = int((self.size // 2 + 12) * pulse)
-            glow_surf = pygame.Surface((glow_size * 2 + 10, glow_size * 2 + 10), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*self.color, 80), 
-                             (glow_size + 5, glow_size + 5), glow_size)
-            surface.blit(glow_surf, (self.x + self.size // 2 - glow_size - 5, 
-                                     self.y + self.size // 2 - glow_size - 5))
+            blit_circle(surface, self.color, (self.x + self.size // 2, self.y + self.size // 2), glow_size, 80)
         
         # Botão
         pygame.draw.circle(surface, self.color, 
@@ -335,15 +377,12 @@ class ColorButton:
         
         # Nome (tooltip)
         if self.hover or self.selected:
-            text = font_mini.render(self.name, True, TEXT_PRIMARY)
+            text = render_text(font_mini, self.name, TEXT_PRIMARY)
             text_rect = text.get_rect(center=(self.x + self.size // 2, self.y + self.size + 18))
             
             # Fundo do tooltip
             bg_rect = text_rect.inflate(12, 6)
-            s = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(s, (30, 30, 40, 220), (0, 0, bg_rect.width, bg_rect.height), 
-                           border_radius=8)
-            surface.blit(s, bg_rect)
+            blit_overlay(surface, (30, 30, 40), 220, bg_rect, border_radius=8)
             surface.blit(text, text_rect)
     
     def is_clicked(self, pos):
@@ -375,10 +414,7 @@ class Button:
             bg_color = UI_BG
         
         # Botão
-        s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(s, (*bg_color, 240), (0, 0, self.rect.width, self.rect.height), 
-                        border_radius=12)
-        surface.blit(s, self.rect)
+        blit_overlay(surface, bg_color, 240, self.rect, border_radius=12)
         
         # Borda
         border_color = UI_ACCENT if selected else (100, 100, 120)
@@ -387,7 +423,7 @@ class Button:
         
         # Texto e ícone
         full_text = f"{self.icon} {self.text}" if self.icon else self.text
-        text_surf = font_small.render(full_text, True, TEXT_PRIMARY)
+        text_surf = render_text(font_small, full_text, TEXT_PRIMARY)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
     
@@ -425,7 +461,7 @@ def detect_drawing_gesture(hand_landmarks):
 
 # --- Funções UI ---
 def draw_text(surface, text, font, color, x, y, center=True):
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -434,15 +470,35 @@ def draw_text(surface, text, font, color, x, y, center=True):
 
 def draw_ui_panel(surface, x, y, width, height, title=""):
     # Painel
-    s = pygame.Surface((width, height), pygame.SRCALPHA)
-    pygame.draw.rect(s, (*UI_BG, 230), (0, 0, width, height), border_radius=15)
-    surface.blit(s, (x, y))
+    blit_overlay(surface, UI_BG, 230, (x, y, width, height), border_radius=15)
     pygame.draw.rect(surface, UI_ACCENT, (x, y, width, height), 3, border_radius=15)
     
     # Título
     if title:
         draw_text(surface, title, font_small, UI_ACCENT, x + width // 2, y + 25)
 
+def build_menu_background():
+    """Fundo preto com o gradiente radial do menu (desenhado uma vez)."""
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    background.fill((0, 0, 0))
+    center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    for i in range(5):
+        alpha = 15 - i * 3
+        radius = 600 + i * 100
+        s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        pygame.draw.circle(s, (20, 20, 40, alpha), center, radius)
+        background.blit(s, (0, 0))
+    return background
+
+def build_menu_card(width, height):
+    """Card do menu com gradiente vertical de cor e transparência."""
+    card_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    for i in range(height):
+        alpha = 200 + int(30 * (i / height))
+        color = (25 + i // 20, 25 + i // 20, 45 + i // 15, alpha)
+        pygame.draw.line(card_surf, color, (0, i), (width, i))
+    return card_surf
+
 # --- Telas ---
 def main_menu():
     """Menu principal com opções de modo - UI/UX INCRÍVEL"""
@@ -476,14 +532,10 @@ def main_menu():
             current_size = int(self.size * pulse)
             current_alpha = min(255, int(self.alpha * pulse))  # Limita a 255
             
-            s = pygame.Surface((current_size * 3, current_size * 3), pygame.SRCALPHA)
             # Glow externo
-            pygame.draw.circle(s, (*self.color, max(0, current_alpha // 3)), 
-                             (current_size * 1.5, current_size * 1.5), current_size * 1.5)
+            blit_circle(surf, self.color, (self.x, self.y), current_size * 1.5, max(0, current_alpha // 3))
             # Partícula principal
-            pygame.draw.circle(s, (*self.color, current_alpha), 
-                             (current_size * 1.5, current_size * 1.5), current_size)
-            surf.blit(s, (int(self.x) - current_size * 1.5, int(self.y) - current_size * 1.5))
+            blit_circle(surf, self.color, (self.x, self.y), current_size, current_alpha)
     
     class Star:
         def __init__(self):
@@ -497,9 +549,7 @@ def main_menu():
         def draw(self, surf, time_val):
             twinkle = 0.5 + 0.5 * math.sin(time_val * self.twinkle_speed + self.twinkle_offset)
             alpha = int(self.brightness * twinkle)
-            s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (255, 255, 255, alpha), (self.size, self.size), self.size)
-            surf.blit(s, (int(self.x) - self.size, int(self.y) - self.size))
+            blit_circle(surf, (255, 255, 255), (self.x, self.y), self.size, alpha)
     
     # Cria estrelas de fundo
     for _ in range(150):
@@ -544,16 +594,7 @@ def main_menu():
             btn.check_hover(mouse_pos)
         
         # === FUNDO PRETO COM GRADIENTE ===
-        screen.fill((0, 0, 0))
-        
-        # Gradiente radial sutil do centro
-        for i in range(5):
-            alpha = 15 - i * 3
-            radius = 600 + i * 100
-            center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.circle(s, (20, 20, 40, alpha), center, radius)
-            screen.blit(s, (0, 0))
+        screen.blit(overlays.cached('menu_background', build_menu_background), (0, 0))
         
         # Estrelas cintilantes
         for star in stars:
@@ -574,7 +615,7 @@ def main_menu():
         for i, char in enumerate(title_text):
             color_idx = (i + int(offset_wave * 2)) % len(colors_list)
             wave_offset = int(15 * math.sin(i * 0.5 + offset_wave))
-            char_surf = font_title.render(char, True, (0, 0, 0))
+            char_surf = render_text(font_title, char, (0, 0, 0))
             char_x = SCREEN_WIDTH // 2 - len(title_text) * 18 + i * 36
             screen.blit(char_surf, (char_x + 3, title_y + wave_offset + 3))
         
@@ -584,7 +625,7 @@ def main_menu():
             color = colors_list[color_idx]
             wave_offset = int(15 * math.sin(i * 0.5 + offset_wave))
             
-            # Glow do caractere
+            # Glow do caractere (cópia própria: set_alpha não pode afetar a do cache)
             glow_surf = font_title.render(char, True, color)
             glow_surf.set_alpha(100)
             char_x = SCREEN_WIDTH // 2 - len(title_text) * 18 + i * 36
@@ -592,17 +633,15 @@ def main_menu():
             screen.blit(glow_surf, (char_x + 2, title_y + wave_offset + 2))
             
             # Caractere principal
-            char_surf = font_title.render(char, True, color)
+            char_surf = render_text(font_title, char, color)
             screen.blit(char_surf, (char_x, title_y + wave_offset))
         
         # Subtítulo com glow
         subtitle_text = "Crie Arte Digital com suas Mãos!"
         glow_color = (100, 220, 255, 150)
+        subtitle = render_text(font_small, subtitle_text, glow_color)
         for offset in [(0, 0), (-2, 0), (2, 0), (0, -2), (0, 2)]:
-            s = pygame.Surface((700, 50), pygame.SRCALPHA)
-            subtitle = font_small.render(subtitle_text, True, glow_color)
-            s.blit(subtitle, (0, 0))
-            screen.blit(s, (SCREEN_WIDTH // 2 - 350 + offset[0], 190 + offset[1]))
+            screen.blit(subtitle, (SCREEN_WIDTH // 2 - 350 + offset[0], 190 + offset[1]))
         draw_text(screen, subtitle_text, font_small, (255, 255, 255), 
                  SCREEN_WIDTH // 2, 200)
         
@@ -613,17 +652,11 @@ def main_menu():
         card_height = 480
         
         # Sombra do card
-        shadow_surf = pygame.Surface((card_width + 20, card_height + 20), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surf, (0, 0, 0, 100), (0, 0, card_width + 20, card_height + 20), 
-                        border_radius=20)
-        screen.blit(shadow_surf, (card_x - 10, card_y - 10))
+        blit_overlay(screen, (0, 0, 0), 100, (card_x - 10, card_y - 10, card_width + 20, card_height + 20),
+                     border_radius=20)
         
         # Card com gradiente
-        card_surf = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-        for i in range(card_height):
-            alpha = 200 + int(30 * (i / card_height))
-            color = (25 + i // 20, 25 + i // 20, 45 + i // 15, alpha)
-            pygame.draw.line(card_surf, color, (0, i), (card_width, i))
+        card_surf = overlays.cached('menu_card', lambda: build_menu_card(card_width, card_height))
         screen.blit(card_surf, (card_x, card_y))
         
         # Borda animada do card
@@ -647,13 +680,9 @@ def main_menu():
         for btn in buttons:
             # Glow nos botões
             if btn.hover:
-                glow_surf = pygame.Surface((btn.rect.width + 30, btn.rect.height + 30), pygame.SRCALPHA)
                 pulse = 1.0 + 0.3 * math.sin(time_elapsed * 5)
                 glow_alpha = int(80 * pulse)
-                pygame.draw.rect(glow_surf, (*UI_ACCENT, glow_alpha), 
-                               (0, 0, btn.rect.width + 30, btn.rect.height + 30), 
-                               border_radius=15)
-                screen.blit(glow_surf, (btn.rect.x - 15, btn.rect.y - 15))
+                blit_overlay(screen, UI_ACCENT, glow_alpha, btn.rect.inflate(30, 30), border_radius=15)
             btn.draw(screen)
         
         # === FEATURES COM ÍCONES ===
@@ -677,7 +706,7 @@ def main_menu():
             x = card_x + 100
             
             # Ícone
-            icon_surf = font_large.render(icon, True, UI_ACCENT)
+            icon_surf = render_text(font_large, icon, UI_ACCENT)
             screen.blit(icon_surf, (x, y))
             
             # Texto
@@ -690,7 +719,7 @@ def main_menu():
             x = card_x + card_width // 2 + 50
             
             # Ícone
-            icon_surf = font_large.render(icon, True, UI_SUCCESS)
+            icon_surf = render_text(font_large, icon, UI_SUCCESS)
             screen.blit(icon_surf, (x, y))
             
             # Texto
@@ -701,10 +730,9 @@ def main_menu():
         footer_y = SCREEN_HEIGHT - 80
         
         # Painel de atalhos
-        shortcut_panel = pygame.Surface((700, 60), pygame.SRCALPHA)
-        pygame.draw.rect(shortcut_panel, (20, 20, 40, 220), (0, 0, 700, 60), border_radius=15)
-        pygame.draw.rect(shortcut_panel, UI_ACCENT, (0, 0, 700, 60), 3, border_radius=15)
-        screen.blit(shortcut_panel, (SCREEN_WIDTH // 2 - 350, footer_y))
+        panel_rect = (SCREEN_WIDTH // 2 - 350, footer_y, 700, 60)
+        blit_overlay(screen, (20, 20, 40), 220, panel_rect, border_radius=15)
+        pygame.draw.rect(screen, UI_ACCENT, panel_rect, 3, border_radius=15)
         
         # Atalhos
         draw_text(screen, "⌨️ ATALHOS RÁPIDOS", font_small, UI_ACCENT, 
@@ -797,7 +825,7 @@ def select_template_menu():
 
 def drawing_app(mode="free", template=None):
     """Aplicativo de desenho melhorado com ferramentas"""
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return
@@ -929,7 +957,7 @@ def drawing_app(mode="free", template=None):
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
         
         # Detecta gestos
@@ -1005,14 +1033,11 @@ def drawing_app(mode="free", template=None):
                 size = int(current_brush_size * (0.5 + 0.5 * i / len(cursor_trail)))
                 if current_tool == "eraser":
                     size = int(size * 1.5)
-                s = pygame.Surface((size * 2 + 4, size * 2 + 4), pygame.SRCALPHA)
-                
                 if is_drawing:
                     cursor_color = (255, 100, 100) if current_tool == "eraser" else current_color
-                    pygame.draw.circle(s, (*cursor_color, alpha), (size + 2, size + 2), size)
                 else:
-                    pygame.draw.circle(s, (255, 255, 255, alpha), (size + 2, size + 2), size)
-                screen.blit(s, (canvas_x + cx - size - 2, canvas_y + cy - size - 2))
+                    cursor_color = (255, 255, 255)
+                blit_circle(screen, cursor_color, (canvas_x + cx, canvas_y + cy), size, alpha)
             
             # Cursor principal
             cx, cy = cursor_trail[-1]
@@ -1064,14 +1089,11 @@ def drawing_app(mode="free", template=None):
         
         # Mensagem de salvamento
         if show_save_message and current_time - save_message_time < 2:
-            msg_surf = pygame.Surface((300, 70), pygame.SRCALPHA)
-            pygame.draw.rect(msg_surf, (50, 200, 100, 230), (0, 0, 300, 70), border_radius=15)
-            msg_surf.blit(font_small.render("✅ Salvo!", True, TEXT_PRIMARY), (100, 20))
-            screen.blit(msg_surf, (SCREEN_WIDTH // 2 - 150, 20))
+            blit_overlay(screen, (50, 200, 100), 230, (SCREEN_WIDTH // 2 - 150, 20, 300, 70), border_radius=15)
+            screen.blit(render_text(font_small, "✅ Salvo!", TEXT_PRIMARY), (SCREEN_WIDTH // 2 - 50, 40))
         
         # Webcam
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 20
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 15
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -1089,9 +1111,7 @@ def drawing_app(mode="free", template=None):
             status_text = "👋 Levante o indicador"
             status_color = TEXT_SECONDARY
         
-        status_bg = pygame.Surface((WEBCAM_WIDTH, 30), pygame.SRCALPHA)
-        pygame.draw.rect(status_bg, (30, 30, 40, 200), (0, 0, WEBCAM_WIDTH, 30))
-        screen.blit(status_bg, (webcam_x, webcam_y - 30))
+        blit_overlay(screen, (30, 30, 40), 200, (webcam_x, webcam_y - 30, WEBCAM_WIDTH, 30))
         draw_text(screen, status_text, font_tiny, status_color, 
                  webcam_x + WEBCAM_WIDTH // 2, webcam_y - 15)
         
@@ -4,6 +4,9 @@ import pygame
 import sys
 import math
 import random
+from captura_camera import CameraStream
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
 
 # --- Configurações do Jogo ---
 SCREEN_WIDTH = 1000
@@ -12,6 +15,7 @@ PADDLE_WIDTH = 20
 PADDLE_HEIGHT = 100
 BALL_SIZE = 20
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores
 WHITE = (255, 255, 255)
@@ -26,6 +30,7 @@ screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 clock = pygame.time.Clock()
 font = pygame.font.Font(None, 74) # Fonte maior para scores e Game Over
 small_font = pygame.font.Font(None, 48)
+info_font = pygame.font.Font(None, 24) # Velocidade da bola e dificuldade da IA
 
 # Carregar sons (se possível, descomente e ajuste os caminhos)
 # try:
@@ -137,8 +142,8 @@ class Ball:
 
 # --- Funções de Ajuda ---
 def draw_score(surface, player_score, opponent_score):
-    player_text = font.render(str(player_score), True, WHITE)
-    opponent_text = font.render(str(opponent_score), True, WHITE)
+    player_text = render_text(font, str(player_score), WHITE)
+    opponent_text = render_text(font, str(opponent_score), WHITE)
     surface.blit(player_text, (SCREEN_WIDTH // 4, 20))
     surface.blit(opponent_text, (SCREEN_WIDTH * 3 // 4 - opponent_text.get_width(), 20))
 
@@ -153,10 +158,10 @@ def game_over_screen(winner, final_score_player, final_score_opponent):
                     return # Volta para o menu principal ou reinicia
 
         screen.fill(BLACK)
-        game_over_text = font.render("GAME OVER", True, RED)
-        winner_text = small_font.render(f"Vencedor: {winner}", True, WHITE)
-        score_text = small_font.render(f"Pontuação Final: Jogador {final_score_player} - {final_score_opponent} IA", True, WHITE)
-        restart_text = small_font.render("Pressione ESPAÇO para jogar novamente", True, WHITE)
+        game_over_text = render_text(font, "GAME OVER", RED)
+        winner_text = render_text(small_font, f"Vencedor: {winner}", WHITE)
+        score_text = render_text(small_font, f"Pontuação Final: Jogador {final_score_player} - {final_score_opponent} IA", WHITE)
+        restart_text = render_text(small_font, "Pressione ESPAÇO para jogar novamente", WHITE)
 
         screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 4))
         screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
@@ -183,10 +188,10 @@ def main_menu():
                     hands_model = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
 
         screen.fill(BLACK)
-        title_text = font.render("Jogo Pong", True, WHITE)
-        choice_text = small_font.render("Escolha o modo de controle:", True, WHITE)
-        eyes_option = small_font.render("Pressione 1 para controlar com os olhos", True, WHITE)
-        hand_option = small_font.render("Pressione 2 para controlar com a mão", True, WHITE)
+        title_text = render_text(font, "Jogo Pong", WHITE)
+        choice_text = render_text(small_font, "Escolha o modo de controle:", WHITE)
+        eyes_option = render_text(small_font, "Pressione 1 para controlar com os olhos", WHITE)
+        hand_option = render_text(small_font, "Pressione 2 para controlar com a mão", WHITE)
 
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 4))
         screen.blit(choice_text, (SCREEN_WIDTH // 2 - choice_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
@@ -212,7 +217,7 @@ def game_loop(control_mode):
     speed_increase_counter = 0
     speed_increase_interval = 180  # Aumenta a cada 3 segundos (60 FPS * 3)
 
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("Erro ao abrir a câmera.")
         sys.exit()
@@ -241,7 +246,7 @@ def game_loop(control_mode):
             break
 
         frame = cv2.flip(frame, 1) # Espelha a imagem
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         
         # Variável para armazenar a posição vertical de controle (mapeada para a altura da tela do Pygame)
         control_y = SCREEN_HEIGHT // 2 
@@ -354,18 +359,16 @@ def game_loop(control_mode):
         draw_score(screen, player_score, opponent_score)
         
         # --- Informações adicionais na tela ---
-        info_font = pygame.font.Font(None, 24)
-        
         # Mostra a velocidade atual da bola
-        speed_text = info_font.render(f"Velocidade: {ball.speed_multiplier:.1f}x", True, WHITE)
+        speed_text = render_text(info_font, f"Velocidade: {ball.speed_multiplier:.1f}x", WHITE)
         screen.blit(speed_text, (SCREEN_WIDTH - 150, 10))
         
         # Mostra a dificuldade da IA
-        difficulty_text = info_font.render(f"IA: Vel {opponent_paddle.speed}", True, WHITE)
+        difficulty_text = render_text(info_font, f"IA: Vel {opponent_paddle.speed}", WHITE)
         screen.blit(difficulty_text, (SCREEN_WIDTH - 150, 35))
         
         # Mostra o modo de controle
-        control_text = info_font.render(f"Controle: {control_mode.upper()}", True, WHITE)
+        control_text = render_text(info_font, f"Controle: {control_mode.upper()}", WHITE)
         screen.blit(control_text, (10, 10))
         
         pygame.display.flip()
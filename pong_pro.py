@@ -24,11 +24,19 @@ import sys
 import math
 import random
 import time
+import numpy as np
+from captura_camera import CameraStream
+from cache_texto import register_effect, render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from particulas import ParticleSystem
+from inferencia_async import InferenceWorker
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
 SCREEN_HEIGHT = 900
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
 
 # Cores Neon Cyberpunk
 NEON_PINK = (255, 16, 240)
@@ -124,32 +132,6 @@ face_mesh = mp_face_mesh.FaceMesh(
 )
 
 # --- Classes ---
-class Particle:
-    """Partícula para efeitos visuais"""
-    def __init__(self, x, y, color, speed=5):
-        self.x = x
-        self.y = y
-        angle = random.uniform(0, 2 * math.pi)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.color = color
-        self.life = 60
-        self.max_life = 60
-        self.size = random.randint(3, 8)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.size = max(1, int(self.size * (self.life / self.max_life)))
-        return self.life > 0
-    
-    def draw(self, surface):
-        alpha = int(255 * (self.life / self.max_life))
-        s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, alpha), (self.size, self.size), self.size)
-        surface.blit(s, (int(self.x) - self.size, int(self.y) - self.size))
-
 class Paddle:
     """Raquete com efeitos neon"""
     def __init__(self, x, y, color, is_player=False):
@@ -213,7 +195,7 @@ class Ball:
         self.speed_multiplier = 1.0
         self.reset(level_config)
         self.trail = []
-        self.particles = []
+        self.particles = ParticleSystem(decay=1 / 60, shrink=True)  # 60 frames de vida
     
     def reset(self, level_config):
         self.rect = pygame.Rect(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, BALL_SIZE, BALL_SIZE)
@@ -254,59 +236,73 @@ class Ball:
     
     def create_particles(self, num_particles, color):
         """Cria partículas na posição da bola"""
-        for _ in range(num_particles):
-            self.particles.append(Particle(self.rect.centerx, self.rect.centery, 
-                                         color, speed=random.randint(3, 8)))
+        self.particles.emit(self.rect.centerx, self.rect.centery, color, num_particles, speed=(3, 8))
     
     def update_particles(self):
         """Atualiza partículas"""
-        self.particles = [p for p in self.particles if p.update()]
+        self.particles.update()
     
     def draw(self, surface):
         """Desenha bola com efeitos"""
         # Partículas
-        for particle in self.particles:
-            particle.draw(surface)
+        self.particles.draw(surface)
         
         # Trail
         for i, (tx, ty) in enumerate(self.trail):
             alpha = int(200 * (i / len(self.trail)))
             size = int(BALL_SIZE // 2 * (0.3 + 0.7 * i / len(self.trail)))
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
-            surface.blit(s, (tx - size, ty - size))
+            blit_circle(surface, self.color, (tx, ty), size, alpha)
         
         # Brilho externo
         for i in range(4):
             glow_size = BALL_SIZE // 2 + (4 - i) * 6
             alpha = 80 - i * 20
-            s = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (glow_size, glow_size), glow_size)
-            surface.blit(s, (self.rect.centerx - glow_size, self.rect.centery - glow_size))
+            blit_circle(surface, self.color, self.rect.center, glow_size, alpha)
         
         # Corpo
         pygame.draw.circle(surface, self.color, self.rect.center, BALL_SIZE // 2)
         pygame.draw.circle(surface, (255, 255, 255), self.rect.center, BALL_SIZE // 2, 2)
 
 # --- Funções Auxiliares ---
+GLOW_PADDING = 6  # Maior deslocamento do brilho (pixels)
+
+def build_glow_text(font, text, color, shifted):
+    """
+    Sprite do texto neon do tamanho exato do texto + margem do brilho:
+    3 passadas de brilho (alfa 100/70/40) e o texto principal por cima.
+    shifted=True desloca o brilho para cima/esquerda (texto não centralizado).
+    """
+    text_obj = render_text(font, text, color)
+    width, height = text_obj.get_size()
+    sprite = pygame.Surface((width + 2 * GLOW_PADDING, height + 2 * GLOW_PADDING), pygame.SRCALPHA)
+    
+    # Brilho
+    for i in range(3):
+        offset = (3 - i) * 2 if shifted else 0
+        glow = text_obj.copy()
+        glow.set_alpha(100 - i * 30)
+        sprite.blit(glow, (GLOW_PADDING - offset, GLOW_PADDING - offset))
+    
+    # Texto principal
+    sprite.blit(text_obj, (GLOW_PADDING, GLOW_PADDING))
+    return sprite
+
+register_effect('neon_glow', lambda font, text, color: build_glow_text(font, text, color, False))
+register_effect('neon_glow_shifted', lambda font, text, color: build_glow_text(font, text, color, True))
+
 def draw_text(surface, text, font, color, x, y, center=True, glow=True):
-    """Desenha texto com efeito neon"""
+    """Desenha texto com efeito neon (sprite pronto vindo do cache de texto)"""
     if glow:
-        # Brilho
-        for i in range(3):
-            offset = (3 - i) * 2
-            alpha = 100 - i * 30
-            s = pygame.Surface((surface.get_width(), surface.get_height()), pygame.SRCALPHA)
-            text_obj = font.render(text, True, (*color, alpha))
-            if center:
-                rect = text_obj.get_rect(center=(x, y))
-            else:
-                rect = (x - offset, y - offset)
-            s.blit(text_obj, rect)
-            surface.blit(s, (0, 0))
+        sprite = render_text(font, text, color, 'neon_glow' if center else 'neon_glow_shifted')
+        if center:
+            rect = sprite.get_rect(center=(x, y))
+        else:
+            rect = (x - GLOW_PADDING, y - GLOW_PADDING)
+        surface.blit(sprite, rect)
+        return
     
-    # Texto principal
-    text_obj = font.render(text, True, color)
+    # Texto simples
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -326,17 +322,21 @@ def draw_gradient_rect(surface, x, y, width, height, color1, color2, vertical=Tr
             color = tuple(int(color1[j] + (color2[j] - color1[j]) * factor) for j in range(3))
             pygame.draw.line(surface, color, (x + i, y), (x + i, y + height))
 
-def detect_eye_position(face_landmarks, frame_height):
+def extract_eye_point(results):
+    """Extrai o landmark do olho direito (159) como ponto normalizado (x, y)"""
+    if not results.multi_face_landmarks:
+        return None
+    
+    right_eye = results.multi_face_landmarks[0].landmark[159]
+    return np.array([[right_eye.x, right_eye.y]], dtype=np.float32)
+
+def detect_eye_position(eye_point):
     """Detecta posição vertical do olho"""
-    if not face_landmarks:
+    if eye_point is None:
         return SCREEN_HEIGHT // 2
     
-    # Usa landmark do olho direito
-    right_eye = face_landmarks.landmark[159]
-    
-    # Mapeia posição Y do olho para altura da tela
-    eye_y = right_eye.y * frame_height
-    screen_y = int(eye_y / frame_height * SCREEN_HEIGHT)
+    # Mapeia posição Y normalizada do olho para altura da tela
+    screen_y = int(eye_point[1] * SCREEN_HEIGHT)
     
     return screen_y
 
@@ -379,9 +379,7 @@ def main_menu():
         card_y = 350
         
         # Fundo do card com borda neon
-        s = pygame.Surface((1000, 400), pygame.SRCALPHA)
-        pygame.draw.rect(s, (20, 20, 40, 230), (0, 0, 1000, 400), border_radius=20)
-        screen.blit(s, (card_x, card_y))
+        blit_overlay(screen, (20, 20, 40), 230, (card_x, card_y, 1000, 400), border_radius=20)
         
         # Borda brilhante
         for i in range(3):
@@ -465,11 +463,19 @@ def game_loop(current_level):
     """Loop principal do jogo"""
     print(f"🎮 Iniciando Nível {current_level}...")
     
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return False, current_level
     
+    # Inferência do Face Mesh roda em thread própria; o jogo só consulta o resultado
+    worker = InferenceWorker(cap, face_mesh, extract_points=extract_eye_point, inference_width=INFERENCE_WIDTH).start()
+    if not worker.wait_ready():
+        print("❌ Câmera não entregou frames")
+        worker.stop()
+        cap.release()
+        return False, current_level
+    
     print("✅ Câmera inicializada!")
     
     # Configura janela da webcam separada
@@ -491,6 +497,7 @@ def game_loop(current_level):
     
     paused = False
     running = True
+    shown_frame_id = -1
     
     while running:
         for event in pygame.event.get():
@@ -503,31 +510,27 @@ def game_loop(current_level):
                     paused = not paused
         
         if not paused:
-            # Captura frame
-            ret, frame = cap.read()
-            if not ret:
+            # Último resultado da inferência (não bloqueia)
+            result = worker.latest()
+            if not worker.is_running():
                 break
             
-            frame = cv2.flip(frame, 1)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = face_mesh.process(frame_rgb)
-            
+            frame = result.frame
             h, w = frame.shape[:2]
-            face_detected = False
+            face_detected = result.points is not None
             
-            # Detecta posição do olho
-            if results.multi_face_landmarks:
-                for face_landmarks in results.multi_face_landmarks:
-                    face_detected = True
-                    
-                    # Posição do olho
-                    eye_y = detect_eye_position(face_landmarks, h)
-                    player_paddle.update_position(eye_y)
-                    
+            # Posição do olho extrapolada entre atualizações do tracking
+            eye_points = worker.predict_points()
+            if eye_points is not None:
+                player_paddle.update_position(detect_eye_position(eye_points[0]))
+            
+            # Desenha o feedback apenas quando chega um resultado novo
+            if result.frame_id != shown_frame_id:
+                shown_frame_id = result.frame_id
+                if face_detected:
                     # Indicador visual
-                    right_eye = face_landmarks.landmark[159]
-                    eye_x = int(right_eye.x * w)
-                    eye_y_frame = int(right_eye.y * h)
+                    eye_x = int(result.points[0][0] * w)
+                    eye_y_frame = int(result.points[0][1] * h)
                     
                     cv2.circle(frame, (eye_x, eye_y_frame), 10, (0, 255, 0), -1)
                     cv2.circle(frame, (eye_x, eye_y_frame), 15, (0, 255, 255), 3)
@@ -542,14 +545,14 @@ def game_loop(current_level):
                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                     cv2.putText(frame, f"Velocidade: {ball.speed_multiplier:.1f}x", (10, 90), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-            else:
-                cv2.putText(frame, "PROCURANDO ROSTO...", (w//2 - 150, h//2), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                cv2.putText(frame, "Posicione seu rosto na camera", (w//2 - 200, h//2 + 40), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            # Exibe webcam em janela separada
-            cv2.imshow(window_name, frame)
+                else:
+                    cv2.putText(frame, "PROCURANDO ROSTO...", (w//2 - 150, h//2), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                    cv2.putText(frame, "Posicione seu rosto na camera", (w//2 - 200, h//2 + 40), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                
+                # Exibe webcam em janela separada
+                cv2.imshow(window_name, frame)
             
             # IA
             ai_paddle.move_ai(ball.rect.centery, level_config["ai_speed"], 
@@ -595,11 +598,13 @@ def game_loop(current_level):
             
             # Verifica vitória/derrota
             if player_score >= level_config["win_score"]:
+                worker.stop()
                 cap.release()
                 cv2.destroyAllWindows()
                 return True, current_level + 1  # Próximo nível
             
             if ai_score >= level_config["win_score"]:
+                worker.stop()
                 cap.release()
                 cv2.destroyAllWindows()
                 return False, current_level  # Mesma fase
@@ -626,9 +631,7 @@ def game_loop(current_level):
             
             # HUD
             hud_height = 100
-            s = pygame.Surface((SCREEN_WIDTH, hud_height), pygame.SRCALPHA)
-            pygame.draw.rect(s, (10, 10, 25, 200), (0, 0, SCREEN_WIDTH, hud_height))
-            screen.blit(s, (0, 0))
+            blit_overlay(screen, (10, 10, 25), 200, (0, 0, SCREEN_WIDTH, hud_height))
             
             # Placar
             draw_text(screen, str(player_score), font_large, level_config["color"], 
@@ -660,9 +663,7 @@ def game_loop(current_level):
         
         else:
             # Tela de pausa
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
+            blit_overlay(screen, (0, 0, 0), 180)
             
             draw_text(screen, "PAUSADO", font_title, NEON_CYAN, 
                      SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
@@ -676,6 +677,7 @@ def game_loop(current_level):
         if cv2.waitKey(1) & 0xFF == ord('q'):
             running = False
     
+    worker.stop()
     cap.release()
     cv2.destroyAllWindows()
     return False, current_level
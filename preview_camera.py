@@ -0,0 +1,43 @@
+"""
+Preview da webcam na tela do jogo, sem alocações por frame
+Os jogos convertiam o frame com frame.swapaxes(0, 1) + make_surface +
+transform.scale a cada frame: três buffers do tamanho da câmera alocados só
+para mostrar uma miniatura (e, sem cvtColor, com os canais BGR trocados).
+Aqui o frame é reduzido pelo cv2 direto num buffer pré-alocado do tamanho do
+preview, convertido para RGB no mesmo buffer e copiado para uma Surface fixa.
+
+Uso:
+    preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+    frame_surface = preview.update(frame)     # frame BGR do cv2, qualquer tamanho
+    screen.blit(frame_surface, (x, y))
+"""
+
+import cv2
+import numpy as np
+import pygame
+
+
+class CameraPreview:
+    """Surface persistente com a miniatura do último frame (BGR -> RGB)."""
+
+    def __init__(self, size, bgr=True):
+        self.size = (int(size[0]), int(size[1]))
+        self.bgr = bgr
+        w, h = self.size
+        self._buffer = np.empty((h, w, 3), dtype=np.uint8)
+        self.surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()  # Mesmo formato da tela: blit mais rápido
+
+    def update(self, frame):
+        """Copia `frame` (redimensionado) para a Surface e a devolve."""
+        if frame.shape[1] > self.size[0]:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+        cv2.resize(frame, self.size, dst=self._buffer, interpolation=interpolation)
+        if self.bgr:
+            cv2.cvtColor(self._buffer, cv2.COLOR_BGR2RGB, dst=self._buffer)
+        # surfarray usa (largura, altura): swapaxes é só uma view, sem cópia
+        pygame.surfarray.blit_array(self.surface, self._buffer.swapaxes(0, 1))
+        return self.surface
@@ -19,6 +19,16 @@ import time
 import mediapipe as mp
 import numpy as np
 import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from overlays import blit_overlay
+from atlas_sprites import blit_circle
+from particulas import ParticleSystem
+from grade_blocos import BlockGrid
+from sprites_blocos import BlockSprites
+from roi_maos import HandROITracker
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +36,8 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 320
 WEBCAM_HEIGHT = 240
 FPS = 60
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
+SHOW_HAND_ROI = False  # Desenha na webcam o recorte usado pelo rastreamento de mãos (depuração)
 
 # Cores vibrantes estilo neon
 DARK_BG = (10, 10, 20)
@@ -53,6 +65,9 @@ POWERUP_CHANCE = 0.15
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH, WEBCAM_HEIGHT))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
+block_sprites = BlockSprites(BLOCK_WIDTH, BLOCK_HEIGHT, TEXT_PRIMARY)
 pygame.display.set_caption("🧱 Quebra Blocos - Controle por Mãos")
 clock = pygame.time.Clock()
 
@@ -63,9 +78,10 @@ font_medium = pygame.font.Font(None, 50)
 font_small = pygame.font.Font(None, 40)
 font_tiny = pygame.font.Font(None, 30)
 
-# MediaPipe Hands
+# MediaPipe Hands (roda só num recorte em volta da mão, ver roi_maos.py)
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
+hands = HandROITracker(
+    inference_width=INFERENCE_WIDTH,
     static_image_mode=False,
     max_num_hands=2,
     min_detection_confidence=0.6,
@@ -154,17 +170,13 @@ class Ball:
         for i, (tx, ty) in enumerate(self.trail):
             alpha = int(255 * (i / len(self.trail)))
             size = int(self.radius * (0.3 + 0.7 * i / len(self.trail)))
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
-            surface.blit(s, (tx - size, ty - size))
+            blit_circle(surface, self.color, (tx, ty), size, alpha)
         
         # Glow
         for i in range(3):
             size = self.radius + (3 - i) * 8
             alpha = 30 + int(20 * abs(math.sin(time.time() * 4)))
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
-            surface.blit(s, (self.x - size, self.y - size))
+            blit_circle(surface, self.color, (self.x, self.y), size, alpha)
         
         # Corpo
         pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.radius)
@@ -213,66 +225,11 @@ class Block:
         self.hit_animation = 1.0
         return self.hp <= 0
     
-    def update(self):
-        self.pulse = abs(math.sin(time.time() * 2 + self.x * 0.01)) * 10
+    def update(self, phase):
+        """phase: fase do pulso do frame (time.time() * 2), calculada uma vez para todos os blocos."""
+        self.pulse = abs(math.sin(phase + self.x * 0.01)) * 10
         if self.hit_animation > 0:
             self.hit_animation -= 0.05
-    
-    def draw(self, surface):
-        if self.hit_animation > 0:
-            # Animação de acerto
-            scale = 1 + self.hit_animation * 0.2
-            offset = (self.width * (scale - 1)) / 2
-            
-            s = pygame.Surface((int(self.width * scale), int(self.height * scale)), pygame.SRCALPHA)
-            pygame.draw.rect(s, (*self.color, int(255 * (1 - self.hit_animation))), 
-                           (0, 0, int(self.width * scale), int(self.height * scale)), border_radius=8)
-            surface.blit(s, (self.x - offset, self.y - offset))
-        
-        # Glow pulsante
-        pulse_size = int(self.pulse)
-        if pulse_size > 0:
-            s = pygame.Surface((self.width + pulse_size * 2, self.height + pulse_size * 2), pygame.SRCALPHA)
-            pygame.draw.rect(s, (*self.color, 40), 
-                           (0, 0, self.width + pulse_size * 2, self.height + pulse_size * 2), border_radius=8)
-            surface.blit(s, (self.x - pulse_size, self.y - pulse_size))
-        
-        # Corpo do bloco
-        pygame.draw.rect(surface, self.color, (self.x, self.y, self.width, self.height), border_radius=8)
-        
-        # Barra de HP
-        if self.hp < self.max_hp:
-            hp_width = (self.width - 10) * (self.hp / self.max_hp)
-            pygame.draw.rect(surface, (50, 50, 50), (self.x + 5, self.y + 5, self.width - 10, 5), border_radius=2)
-            pygame.draw.rect(surface, TEXT_PRIMARY, (self.x + 5, self.y + 5, int(hp_width), 5), border_radius=2)
-        
-        # Borda brilhante
-        pygame.draw.rect(surface, TEXT_PRIMARY, (self.x, self.y, self.width, self.height), 2, border_radius=8)
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(2, 8)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.life = 1.0
-        self.color = color
-        self.size = random.randint(3, 8)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.3  # Gravidade
-        self.life -= 0.02
-        return self.life > 0
-    
-    def draw(self, surface):
-        alpha = int(self.life * 255)
-        s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, alpha), (self.size, self.size), self.size)
-        surface.blit(s, (int(self.x - self.size), int(self.y - self.size)))
 
 # --- Funções UI ---
 def draw_rounded_rect(surface, color, rect, radius=15):
@@ -280,14 +237,14 @@ def draw_rounded_rect(surface, color, rect, radius=15):
 
 def draw_text(surface, text, font, color, x, y, center=True, shadow=True):
     if shadow:
-        text_obj = font.render(text, True, (0, 0, 0))
+        text_obj = render_text(font, text, (0, 0, 0))
         if center:
             rect = text_obj.get_rect(center=(x+3, y+3))
         else:
             rect = (x+3, y+3)
         surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -300,7 +257,7 @@ def draw_card(surface, x, y, width, height, color=(20, 20, 40)):
 
 # --- Telas ---
 def main_menu():
-    particles = []
+    particles = ParticleSystem(gravity=0.3, decay=0.02)
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -313,17 +270,15 @@ def main_menu():
         
         # Adiciona partículas de fundo
         if random.random() < 0.1:
-            particles.append(Particle(random.randint(0, SCREEN_WIDTH), 
-                                    random.randint(0, SCREEN_HEIGHT),
-                                    random.choice([NEON_CYAN, NEON_PINK, NEON_PURPLE])))
+            particles.emit(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT),
+                           random.choice([NEON_CYAN, NEON_PINK, NEON_PURPLE]), 1)
         
-        particles = [p for p in particles if p.update()]
+        particles.update()
         
         screen.fill(DARK_BG)
         
         # Partículas
-        for p in particles:
-            p.draw(screen)
+        particles.draw(screen)
         
         # Título animado
         title_y = 150 + int(20 * np.sin(time.time() * 2))
@@ -331,11 +286,8 @@ def main_menu():
                   SCREEN_WIDTH//2, title_y)
         
         # Efeito neon no título
-        title_surface = pygame.Surface((SCREEN_WIDTH, 150), pygame.SRCALPHA)
         glow = int(50 + 30 * abs(math.sin(time.time() * 3)))
-        pygame.draw.rect(title_surface, (*NEON_CYAN, glow), 
-                        (SCREEN_WIDTH//2 - 400, 0, 800, 100), border_radius=50)
-        screen.blit(title_surface, (0, title_y - 50))
+        blit_overlay(screen, NEON_CYAN, glow, (SCREEN_WIDTH//2 - 400, title_y - 50, 800, 100), border_radius=50)
         
         # Card de instruções
         card_x = SCREEN_WIDTH//2 - 500
@@ -364,7 +316,7 @@ def main_menu():
         clock.tick(FPS)
 
 def game_loop():
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return 0
@@ -372,19 +324,19 @@ def game_loop():
     # Inicialização
     paddle = Paddle()
     balls = [Ball(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 200)]
-    blocks = []
-    particles = []
+    particles = ParticleSystem(gravity=0.3, decay=0.02)
     
     # Cria blocos
     colors = [NEON_PINK, NEON_PURPLE, NEON_BLUE, NEON_GREEN, NEON_YELLOW, NEON_ORANGE]
     start_x = (SCREEN_WIDTH - BLOCK_COLS * BLOCK_WIDTH) // 2
     start_y = 180
+    blocks = BlockGrid(start_x, start_y, BLOCK_WIDTH, BLOCK_HEIGHT, BLOCK_ROWS, BLOCK_COLS)
     
     for row in range(BLOCK_ROWS):
         for col in range(BLOCK_COLS):
             x = start_x + col * BLOCK_WIDTH
             y = start_y + row * BLOCK_HEIGHT
-            blocks.append(Block(x, y, colors[row], row))
+            blocks.add(Block(x, y, colors[row], row), row, col)
     
     # Estado do jogo
     score = 0
@@ -411,6 +363,8 @@ def game_loop():
         frame = cv2.flip(frame, 1)
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = hands.process(frame_rgb)
+        if SHOW_HAND_ROI:
+            hands.draw_roi(frame)
         
         # Detecta mãos
         target_x = paddle.x + paddle.width // 2
@@ -428,7 +382,8 @@ def game_loop():
         # Atualiza jogo
         paddle.update(target_x)
         
-        for ball in balls:
+        for ball in balls[:]:
+            prev_x, prev_y = ball.x, ball.y
             ball.update()
             
             # Colisão com paddle
@@ -436,32 +391,30 @@ def game_loop():
                 combo += 1
                 max_combo = max(max_combo, combo)
             
-            # Colisão com blocos
-            for block in blocks[:]:
-                if (ball.x + ball.radius > block.x and 
-                    ball.x - ball.radius < block.x + block.width and
-                    ball.y + ball.radius > block.y and 
-                    ball.y - ball.radius < block.y + block.height):
-                    
-                    # Determina lado da colisão
-                    if abs(ball.y - block.y) < abs(ball.y - (block.y + block.height)):
-                        ball.vy *= -1
-                    else:
-                        ball.vx *= -1
+            # Colisão com blocos: só as células que a bola atravessou neste frame
+            hit = blocks.sweep(prev_x, prev_y, ball.x, ball.y, ball.radius)
+            if hit:
+                block, t, axis = hit
+                
+                # Volta a bola ao ponto de contato e inverte o lado atingido
+                t = max(0.0, t - 0.01)
+                ball.x = prev_x + (ball.x - prev_x) * t
+                ball.y = prev_y + (ball.y - prev_y) * t
+                if axis == 'x':
+                    ball.vx *= -1
+                else:
+                    ball.vy *= -1
+                
+                if block.hit():
+                    blocks.remove(block)
+                    points = (block.max_hp * 10) * (1 + combo * 0.1)
+                    score += int(points)
+                    combo += 1
+                    max_combo = max(max_combo, combo)
                     
-                    if block.hit():
-                        blocks.remove(block)
-                        points = (block.max_hp * 10) * (1 + combo * 0.1)
-                        score += int(points)
-                        combo += 1
-                        max_combo = max(max_combo, combo)
-                        
-                        # Partículas
-                        for _ in range(20):
-                            particles.append(Particle(block.x + block.width // 2, 
-                                                    block.y + block.height // 2, 
-                                                    block.color))
-                    break
+                    # Partículas
+                    particles.emit(block.x + block.width // 2, block.y + block.height // 2,
+                                   block.color, 20)
             
             # Perdeu bola
             if ball.y > SCREEN_HEIGHT:
@@ -473,10 +426,11 @@ def game_loop():
                         balls.append(Ball(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 200))
         
         # Atualiza blocos e partículas
+        pulse_phase = time.time() * 2
         for block in blocks:
-            block.update()
+            block.update(pulse_phase)
         
-        particles = [p for p in particles if p.update()]
+        particles.update()
         
         # --- Renderização ---
         screen.fill(DARK_BG)
@@ -506,12 +460,10 @@ def game_loop():
             draw_text(screen, combo_text, font_medium, combo_color, SCREEN_WIDTH - 200, 75)
         
         # Desenha partículas (atrás)
-        for particle in particles:
-            particle.draw(screen)
+        particles.draw(screen)
         
-        # Desenha blocos
-        for block in blocks:
-            block.draw(screen)
+        # Desenha blocos (sprites pré-renderizados, ver sprites_blocos.py)
+        block_sprites.draw(screen, blocks)
         
         # Desenha bolas
         for ball in balls:
@@ -521,8 +473,7 @@ def game_loop():
         paddle.draw(screen)
         
         # Webcam pequena
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH, WEBCAM_HEIGHT))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = SCREEN_WIDTH - WEBCAM_WIDTH - 30
         webcam_y = SCREEN_HEIGHT - WEBCAM_HEIGHT - 30
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -541,8 +492,10 @@ def game_loop():
     return show_results(score, max_combo, won, game_time)
 
 def show_results(score, max_combo, won, game_time):
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -574,7 +527,7 @@ def show_results(score, max_combo, won, game_time):
         draw_text(screen, "ESPAÇO para jogar novamente | ESC para sair", 
                   font_small, TEXT_SECONDARY, SCREEN_WIDTH//2, card_y + 520)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
@@ -0,0 +1,196 @@
+"""
+Agendamento de detecção + rastreamento leve entre detecções (Caça ao Objeto)
+O YOLO roda só a cada N frames (ou quando a resposta anterior chega, no modo
+adaptativo) e um rastreador por fluxo óptico (Lucas-Kanade) propaga as caixas
+nos frames intermediários, reduzindo bastante o uso de CPU.
+
+Uso:
+    scheduler = DetectionScheduler()
+    tracker = BoxTracker()
+    gray = tracker.prepare(frame)
+    if scheduler.should_detect():
+        request_id = detector.submit(frame)
+        scheduler.on_submit(request_id, gray)
+    ...
+    tracker.start(scheduler.on_result(result), result)   # Resultado novo
+    tracker.update(gray)                                   # Demais frames
+"""
+
+import math
+import time
+
+import cv2
+import numpy as np
+
+# --- Configurações ---
+DETECTION_INTERVAL = 5  # Frames entre detecções no modo fixo (e mínimo no adaptativo)
+MAX_INTERVAL = 30  # Limite superior do intervalo adaptativo
+REQUEST_TIMEOUT = 2.0  # Segundos sem resposta antes de reenviar um pedido
+TRACK_SCALE = 0.5  # Escala do frame em tons de cinza usado pelo fluxo óptico
+MAX_CORNERS = 30  # Pontos rastreados por caixa
+MIN_POINTS = 5  # Abaixo disso a caixa é considerada perdida
+LK_PARAMS = dict(
+    winSize=(15, 15),
+    maxLevel=2,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+)
+
+
+class DetectionScheduler:
+    """
+    Decide em quais frames a detecção deve rodar.
+
+    Fixo: a cada `interval` frames.
+    Adaptativo: no máximo um pedido em andamento; o intervalo acompanha a
+    latência medida (em frames do jogo), nunca abaixo de `interval`.
+    """
+
+    def __init__(self, interval=DETECTION_INTERVAL, adaptive=True, fps=30, max_interval=MAX_INTERVAL):
+        self.interval = interval
+        self.adaptive = adaptive
+        self.fps = fps
+        self.max_interval = max_interval
+        self.current_interval = interval
+        self._frames_since_submit = interval  # Detecta logo no primeiro frame
+        self._in_flight = None  # (request_id, instante do envio)
+        self._pending_frames = {}  # request_id -> frame cinza usado no envio
+        self.latency = None  # Latência suavizada (segundos) do envio até a resposta
+        self.detections_run = 0
+        self.frames_seen = 0
+
+    def should_detect(self):
+        """Chamado uma vez por frame; True quando um novo pedido deve ser enviado."""
+        self.frames_seen += 1
+        self._frames_since_submit += 1
+        if self._frames_since_submit < self.current_interval:
+            return False
+        if self.adaptive and self._in_flight is not None:
+            # Espera a resposta anterior, a menos que ela tenha se perdido
+            return time.perf_counter() - self._in_flight[1] > REQUEST_TIMEOUT
+        return True
+
+    def on_submit(self, request_id, gray=None):
+        self._frames_since_submit = 0
+        self._in_flight = (request_id, time.perf_counter())
+        self.detections_run += 1
+        if gray is not None:
+            self._pending_frames[request_id] = gray
+
+    def on_result(self, result):
+        """
+        Registra a chegada de um resultado e devolve o frame cinza em que ele foi
+        calculado (ou None), para o rastreador partir do ponto certo.
+        """
+        if self._in_flight is not None and result.request_id >= self._in_flight[0]:
+            elapsed = time.perf_counter() - self._in_flight[1]
+            self.latency = elapsed if self.latency is None else 0.7 * self.latency + 0.3 * elapsed
+            self._in_flight = None
+            if self.adaptive:
+                frames = math.ceil(self.latency * self.fps)
+                self.current_interval = min(max(self.interval, frames), self.max_interval)
+
+        gray = self._pending_frames.pop(result.request_id, None)
+        # Descarta frames de pedidos mais antigos que nunca terão resposta
+        for request_id in [r for r in self._pending_frames if r < result.request_id]:
+            del self._pending_frames[request_id]
+        return gray
+
+    def reset(self):
+        self._frames_since_submit = self.current_interval
+        self._in_flight = None
+        self._pending_frames.clear()
+
+
+class BoxTracker:
+    """
+    Propaga caixas de detecção com fluxo óptico esparso.
+    Cada caixa guarda seus pontos; o deslocamento mediano move a caixa e a
+    razão mediana das distâncias ao centro ajusta a escala.
+    """
+
+    def __init__(self, scale=TRACK_SCALE):
+        self.scale = scale
+        self.reset()
+
+    def reset(self):
+        self._prev_gray = None
+        self._points = []  # Lista de arrays (K, 1, 2) por caixa, em coordenadas reduzidas
+        self.xyxy = np.zeros((0, 4), dtype=np.float32)
+        self.conf = np.zeros(0, dtype=np.float32)
+        self.cls = np.zeros(0, dtype=np.int32)
+
+    def prepare(self, frame):
+        """Frame BGR -> tons de cinza reduzido (reutilizado por start/update)."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def __len__(self):
+        return len(self.conf)
+
+    def start(self, gray, result):
+        """Reinicia o rastreamento a partir de um resultado de detecção."""
+        self.xyxy = result.xyxy.astype(np.float32).copy()
+        self.conf = result.conf.copy()
+        self.cls = result.cls.copy()
+        self._prev_gray = gray
+        if gray is None:
+            # Sem o frame original não há como rastrear: mantém as caixas paradas
+            self._points = [None] * len(self.xyxy)
+        else:
+            self._points = [self._seed_points(gray, box) for box in self.xyxy]
+
+    def _seed_points(self, gray, box):
+        x1, y1, x2, y2 = (box * self.scale).astype(int)
+        h, w = gray.shape
+        x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+        if x2 - x1 < 4 or y2 - y1 < 4:
+            return None
+        mask = np.zeros_like(gray)
+        mask[y1:y2, x1:x2] = 255
+        return cv2.goodFeaturesToTrack(gray, MAX_CORNERS, 0.01, 3, mask=mask)
+
+    def update(self, gray):
+        """Move as caixas para o frame atual. Caixas sem pontos suficientes são descartadas."""
+        if self._prev_gray is None or len(self.xyxy) == 0:
+            self._prev_gray = gray
+            return self.xyxy
+
+        keep = []
+        for i, points in enumerate(self._points):
+            if points is None or len(points) < MIN_POINTS:
+                keep.append(points is None)  # Caixa sem pontos desde o início: fica parada
+                continue
+
+            new_points, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, points, None, **LK_PARAMS)
+            good = status.reshape(-1) == 1
+            if good.sum() < MIN_POINTS:
+                keep.append(False)
+                continue
+
+            old = points[good].reshape(-1, 2)
+            new = new_points[good].reshape(-1, 2)
+            dx, dy = np.median(new - old, axis=0) / self.scale
+
+            # Escala: razão mediana das distâncias ao centróide
+            old_spread = np.linalg.norm(old - old.mean(axis=0), axis=1)
+            new_spread = np.linalg.norm(new - new.mean(axis=0), axis=1)
+            valid = old_spread > 1e-3
+            scale = float(np.median(new_spread[valid] / old_spread[valid])) if valid.any() else 1.0
+            scale = min(max(scale, 0.8), 1.25)
+
+            x1, y1, x2, y2 = self.xyxy[i]
+            cx, cy = (x1 + x2) / 2 + dx, (y1 + y2) / 2 + dy
+            half_w, half_h = (x2 - x1) * scale / 2, (y2 - y1) * scale / 2
+            self.xyxy[i] = (cx - half_w, cy - half_h, cx + half_w, cy + half_h)
+            self._points[i] = new.reshape(-1, 1, 2)
+            keep.append(True)
+
+        keep = np.array(keep, dtype=bool)
+        self.xyxy = self.xyxy[keep]
+        self.conf = self.conf[keep]
+        self.cls = self.cls[keep]
+        self._points = [p for p, k in zip(self._points, keep) if k]
+        self._prev_gray = gray
+        return self.xyxy
@@ -0,0 +1,128 @@
+"""
+Rastreamento de mãos MediaPipe por região de interesse (ROI)
+Em vez de mandar o frame inteiro para o Hands todo frame, recorta um quadrado
+em volta da mão encontrada no frame anterior (com margem) e roda o modelo só
+nesse recorte. A cada REDETECT_INTERVAL frames, ou quando a mão some do
+recorte, volta ao frame inteiro para achar mãos novas.
+
+Substitui mp_hands.Hands diretamente (mesmos parâmetros e mesmo process()):
+    hands = HandROITracker(max_num_hands=2, min_detection_confidence=0.6)
+    results = hands.process(frame_rgb)   # Landmarks já nas coordenadas do frame inteiro
+    hands.roi                            # (x1, y1, x2, y2) usado neste frame, ou None
+"""
+
+import cv2
+import mediapipe as mp
+
+from inferencia_async import resize_for_inference
+
+# --- Configurações ---
+ROI_MARGIN = 0.35  # Margem em volta da caixa da mão (fração do maior lado)
+ROI_SIZE = 256  # Lado (px) do recorte entregue ao modelo
+MIN_ROI_FRACTION = 0.3  # Menor recorte, como fração do menor lado do frame
+REDETECT_INTERVAL = 15  # Frames seguidos em ROI antes de procurar no frame inteiro
+ROI_COLOR = (0, 255, 255)  # Cor (BGR) do retângulo de depuração
+
+
+class HandROITracker:
+    """
+    Hands com recorte automático em volta da(s) mão(s) do frame anterior.
+
+    Usa duas instâncias do modelo: uma para o frame inteiro e outra para o
+    recorte, assim o rastreamento interno do MediaPipe sempre vê imagens do
+    mesmo tamanho e enquadramento.
+    """
+
+    def __init__(self, margin=ROI_MARGIN, redetect_interval=REDETECT_INTERVAL, roi_size=ROI_SIZE,
+                 enabled=True, inference_width=None, **hands_kwargs):
+        self.margin = margin
+        self.redetect_interval = redetect_interval
+        self.roi_size = roi_size
+        self.enabled = enabled
+        self.inference_width = inference_width  # Largura usada nas buscas no frame inteiro
+        self._full_hands = mp.solutions.hands.Hands(**hands_kwargs)
+        self._roi_hands = mp.solutions.hands.Hands(**hands_kwargs) if enabled else None
+
+        self.roi = None  # Recorte usado no último process(), em pixels; None = frame inteiro
+        self._next_roi = None
+        self._frames_in_roi = 0
+
+        # Estatísticas
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.roi_misses = 0  # Recortes sem mão que precisaram do frame inteiro
+
+    def process(self, frame_rgb):
+        h, w = frame_rgb.shape[:2]
+
+        if self._next_roi is not None and self._frames_in_roi < self.redetect_interval:
+            x1, y1, x2, y2 = self._next_roi
+            crop = cv2.resize(frame_rgb[y1:y2, x1:x2], (self.roi_size, self.roi_size),
+                              interpolation=cv2.INTER_AREA if x2 - x1 > self.roi_size else cv2.INTER_LINEAR)
+            results = self._roi_hands.process(crop)
+            if results.multi_hand_landmarks:
+                self._to_frame_coords(results, self._next_roi, w, h)
+                self.roi = self._next_roi
+                self._next_roi = self._hand_box(results, w, h)
+                self._frames_in_roi += 1
+                self.roi_frames += 1
+                return results
+            self.roi_misses += 1
+
+        # Busca no frame inteiro (reduzido); o recorte acima sai do frame cheio
+        results = self._full_hands.process(resize_for_inference(frame_rgb, self.inference_width))
+        self.roi = None
+        self._frames_in_roi = 0
+        self.full_frames += 1
+        if self.enabled and results.multi_hand_landmarks:
+            self._next_roi = self._hand_box(results, w, h)
+        else:
+            self._next_roi = None
+        return results
+
+    def _hand_box(self, results, w, h):
+        """Quadrado (em pixels) que cobre todas as mãos com margem, dentro do frame."""
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        x_min, x_max = min(xs) * w, max(xs) * w
+        y_min, y_max = min(ys) * h, max(ys) * h
+
+        limit = min(w, h)
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * self.margin)
+        side = int(min(max(side, MIN_ROI_FRACTION * limit), limit))
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x1 = int(min(max(cx - side / 2, 0), w - side))
+        y1 = int(min(max(cy - side / 2, 0), h - side))
+        return x1, y1, x1 + side, y1 + side
+
+    @staticmethod
+    def _to_frame_coords(results, roi, w, h):
+        """Converte os landmarks (normalizados no recorte) para o frame inteiro."""
+        x1, y1, x2, y2 = roi
+        scale_x, scale_y = (x2 - x1) / w, (y2 - y1) / h
+        offset_x, offset_y = x1 / w, y1 / h
+        for hand in results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = offset_x + lm.x * scale_x
+                lm.y = offset_y + lm.y * scale_y
+                lm.z *= scale_x  # z usa a mesma escala de x no MediaPipe
+
+    def draw_roi(self, frame):
+        """Desenha o recorte atual no frame (depuração)."""
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            cv2.rectangle(frame, (x1, y1), (x2, y2), ROI_COLOR, 2)
+
+    def stats(self):
+        total = max(self.roi_frames + self.full_frames, 1)
+        return {
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'roi_misses': self.roi_misses,
+            'roi_ratio': self.roi_frames / total,
+        }
+
+    def close(self):
+        self._full_hands.close()
+        if self._roi_hands is not None:
+            self._roi_hands.close()
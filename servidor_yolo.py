@@ -0,0 +1,400 @@
+"""
+🛰️ Servidor local de detecção YOLO compartilhado
+Mantém o modelo carregado ("quente") em um processo separado e atende vários
+jogos ao mesmo tempo por socket local, agrupando pedidos simultâneos em lote.
+
+Execução:
+    python servidor_yolo.py          # Inicia o servidor com PyTorch (Ctrl+C para parar)
+    python servidor_yolo.py onnx     # ONNX Runtime em CPU (ou onnx-int8, ver backends_yolo.py)
+
+Nos jogos (caçaobjeto.py, teste_yolo.py):
+    detector = DetectionClient()      # Conecta (e inicia o servidor se preciso)
+    detector.submit(frame)            # Envia o frame sem bloquear
+    result = detector.latest()        # Último resultado recebido (ou None)
+
+Com DetectionClient(inference_width=640) o cliente envia uma cópia reduzida do
+frame (menos dados no socket e menos trabalho no servidor) e devolve as caixas
+já na escala do frame original.
+
+A conexão é autenticada com uma chave aleatória por instalação, criada na
+primeira execução em modelos_cache/servidor_yolo.key (só o dono lê): o
+socket desserializa (pickle) o que recebe, então uma chave fixa deixaria
+qualquer processo local executar código no servidor.
+"""
+
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from backends_yolo import CACHE_DIR, YOLO_BACKENDS, empty_detections, load_backend, warm_up
+from inferencia_async import resize_for_inference
+
+# --- Configurações ---
+SERVER_ADDRESS = ('127.0.0.1', 6010)
+AUTHKEY_FILE = os.path.join(CACHE_DIR, 'servidor_yolo.key')  # Chave compartilhada por servidor e jogos
+AUTHKEY_BYTES = 32
+YOLO_MODEL = 'yolov5su.pt'
+DEFAULT_BACKEND = 'torch'
+MAX_BATCH = 4  # Máximo de frames por lote de inferência
+BATCH_WINDOW = 0.005  # Segundos esperando outros pedidos para completar o lote
+CONNECT_TIMEOUT = 60.0  # Segundos esperando o servidor subir (inclui download do modelo)
+
+# Parâmetros padrão de inferência (os clientes podem sobrescrever por pedido)
+DEFAULT_PARAMS = {
+    'conf': 0.35,
+    'iou': 0.4,
+    'imgsz': 640,
+    'max_det': 50,
+}
+
+# Uma linha por detecção, já com área e marcação de alvo (ver detections_array)
+DETECTION_DTYPE = np.dtype([
+    ('xyxy', np.int32, (4,)),
+    ('conf', np.float32),
+    ('cls', np.int32),
+    ('area', np.int32),
+    ('is_target', np.bool_),
+])
+
+
+def load_authkey(path=AUTHKEY_FILE):
+    """
+    Chave de autenticação do socket: lida de `path` ou, na primeira vez,
+    gerada com secrets e gravada com permissão só do dono (0o600).
+    """
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+        if len(key) == AUTHKEY_BYTES:
+            return key
+    except FileNotFoundError:
+        pass
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Grava num temporário (mkstemp já cria com 0o600) e publica com os.link, que
+    # falha se outro processo criou a chave antes: servidor e jogos ficam com a mesma
+    key = secrets.token_bytes(AUTHKEY_BYTES)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.servidor_yolo_key')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            with open(path, 'rb') as f:
+                key = f.read()
+            if len(key) != AUTHKEY_BYTES:
+                raise RuntimeError(f"Chave do servidor YOLO inválida em {path} (apague o arquivo)")
+    finally:
+        os.remove(tmp_path)
+    return key
+
+
+def detections_array(xyxy, conf, cls, target_ids=None):
+    """
+    Converte as caixas para um array estruturado (DETECTION_DTYPE) de uma vez,
+    calculando área e máscara de alvo sem laço Python por caixa.
+    target_ids=None marca todas as caixas como alvo.
+    """
+    records = np.empty(len(conf), dtype=DETECTION_DTYPE)
+    boxes = xyxy.astype(np.int32)
+    records['xyxy'] = boxes
+    records['conf'] = conf
+    records['cls'] = cls
+    records['area'] = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    records['is_target'] = True if target_ids is None else np.isin(cls, target_ids)
+    return records
+
+
+class DetectionResult:
+    """Caixas detectadas em um frame, como arrays NumPy."""
+    __slots__ = ('request_id', 'xyxy', 'conf', 'cls', 'latency', 'received_at')
+
+    def __init__(self, request_id, xyxy, conf, cls, latency):
+        self.request_id = request_id  # Id devolvido por submit()/detect()
+        self.xyxy = xyxy  # (N, 4) float32
+        self.conf = conf  # (N,) float32
+        self.cls = cls  # (N,) int32
+        self.latency = latency  # Segundos de inferência no servidor (lote inteiro)
+        self.received_at = time.perf_counter()
+
+    def __len__(self):
+        return len(self.conf)
+
+    def as_array(self, target_ids=None):
+        """Detecções como array estruturado (ver detections_array)."""
+        return detections_array(self.xyxy, self.conf, self.cls, target_ids)
+
+
+# --- Servidor ---
+class DetectionServer:
+    """Processo que carrega o modelo uma vez e responde pedidos em lote."""
+
+    def __init__(self, address=SERVER_ADDRESS, authkey=None, model_path=YOLO_MODEL,
+                 backend=DEFAULT_BACKEND):
+        self.address = address
+        self.authkey = authkey if authkey is not None else load_authkey()
+        self.model_path = model_path
+        self.backend_name = backend
+        self.requests = queue.Queue()
+        self.backend = None
+
+    def load_model(self):
+        print(f"Carregando modelo {self.model_path} (backend: {self.backend_name})...")
+        self.backend = load_backend(self.backend_name, self.model_path, imgsz=DEFAULT_PARAMS['imgsz'])
+
+        # Aquecimento: a primeira inferência é sempre mais lenta
+        warm_up(self.backend, imgsz=DEFAULT_PARAMS['imgsz'])
+        print(f"✅ Modelo pronto em: {self.backend.device}")
+
+    def serve_forever(self):
+        # Abre a porta antes de carregar o modelo: um segundo servidor falha aqui,
+        # e clientes que chegam durante o carregamento ficam na fila do accept
+        try:
+            listener = Listener(self.address, authkey=self.authkey)
+        except OSError as e:
+            print(f"Servidor YOLO já está rodando em {self.address[0]}:{self.address[1]} ({e})")
+            return
+
+        self.load_model()
+        threading.Thread(target=self._batch_loop, name="YOLOBatch", daemon=True).start()
+
+        with listener:
+            print(f"🛰️ Servidor YOLO ouvindo em {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError) as e:
+                    print(f"Conexão recusada: {e}")
+                    continue
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _serve_client(self, conn):
+        send_lock = threading.Lock()
+        conn.send(('hello', {
+            'names': self.backend.names,
+            'device': self.backend.device,
+            'backend': self.backend_name,
+        }))
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == 'detect':
+                    _, request_id, frame, params = message
+                    self.requests.put((conn, send_lock, request_id, frame, params))
+                elif message[0] == 'ping':
+                    with send_lock:
+                        conn.send(('pong',))
+                elif message[0] == 'close':
+                    break
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _batch_loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.perf_counter() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Pedidos com os mesmos parâmetros rodam juntos em um lote
+            groups = {}
+            for item in batch:
+                groups.setdefault(_params_key(item[4]), []).append(item)
+            for items in groups.values():
+                self._run_batch(items)
+
+    def _run_batch(self, items):
+        params = dict(DEFAULT_PARAMS)
+        params.update(items[0][4])
+        frames = [item[3] for item in items]
+
+        start = time.perf_counter()
+        try:
+            detections = self.backend.detect(frames, **params)
+        except Exception as e:
+            print(f"Erro na inferência: {e}")
+            detections = [empty_detections() for _ in items]
+        latency = time.perf_counter() - start
+
+        for (conn, send_lock, request_id, _, _), (xyxy, conf, cls) in zip(items, detections):
+            try:
+                with send_lock:
+                    conn.send(('result', request_id, xyxy, conf, cls, latency))
+            except (OSError, EOFError):
+                pass  # Cliente desconectou no meio do lote
+
+
+def _params_key(params):
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()))
+
+
+# --- Cliente ---
+class DetectionClient:
+    """
+    Conexão de um jogo com o servidor de detecção.
+
+    submit()/latest() são assíncronos: uma thread envia sempre o frame mais
+    recente e guarda a última resposta, então o loop do jogo nunca espera a
+    inferência. detect() é a versão bloqueante (scripts de teste/benchmark).
+    Não misture os dois modos na mesma instância.
+
+    inference_width: largura do frame enviado ao servidor (None = sem reduzir).
+    """
+
+    def __init__(self, address=SERVER_ADDRESS, authkey=None, autostart=True,
+                 timeout=CONNECT_TIMEOUT, backend=DEFAULT_BACKEND, inference_width=None):
+        self.address = address
+        self.authkey = authkey if authkey is not None else load_authkey()
+        self.inference_width = inference_width
+        self._conn = self._connect(autostart, timeout, backend)
+
+        _, info = self._conn.recv()
+        self.names = info['names']
+        self.device = info['device']
+        self.backend = info['backend']
+        if self.backend != backend:
+            print(f"⚠️ Servidor YOLO já estava rodando com backend '{self.backend}' (pedido: '{backend}')")
+
+        self._cond = threading.Condition()
+        self._pending = None
+        self._latest = None
+        self._next_id = 0
+        self._running = True
+        self._thread = None
+
+    def _connect(self, autostart, timeout, backend):
+        try:
+            return Client(self.address, authkey=self.authkey)
+        except (ConnectionRefusedError, OSError):
+            if not autostart:
+                raise
+
+        # Servidor não está rodando: inicia em segundo plano e espera ficar pronto
+        print("Iniciando servidor YOLO em segundo plano...")
+        start_server_process(backend)
+        deadline = time.time() + timeout
+        while True:
+            try:
+                return Client(self.address, authkey=self.authkey)
+            except (ConnectionRefusedError, OSError):
+                if time.time() > deadline:
+                    raise TimeoutError("Servidor YOLO não respondeu a tempo")
+                time.sleep(0.25)
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def _send(self, request_id, frame, params):
+        """Envia o frame (reduzido para inference_width) e retorna a escala aplicada."""
+        small = resize_for_inference(frame, self.inference_width)
+        self._conn.send(('detect', request_id, small, params))
+        return small.shape[1] / frame.shape[1]
+
+    # --- Modo bloqueante ---
+    def detect(self, frame, **params):
+        request_id = self._new_id()
+        scale = self._send(request_id, frame, params)
+        return self._receive(scale)
+
+    def _receive(self, scale=1.0):
+        message = self._conn.recv()
+        _, request_id, xyxy, conf, cls, latency = message
+        if scale != 1.0:
+            xyxy = xyxy / np.float32(scale)  # Volta para as coordenadas do frame original
+        return DetectionResult(request_id, xyxy, conf, cls, latency)
+
+    # --- Modo assíncrono ---
+    def submit(self, frame, **params):
+        """Agenda o frame para detecção e retorna seu id. Substitui um pedido ainda não enviado."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._async_loop, name="DetectionClient", daemon=True)
+                self._thread.start()
+            request_id = self._new_id()
+            self._pending = (request_id, frame, params)
+            self._cond.notify()
+            return request_id
+
+    def latest(self):
+        """Último resultado recebido, ou None se nenhum chegou ainda."""
+        with self._cond:
+            return self._latest
+
+    @property
+    def last_request_id(self):
+        return self._next_id
+
+    def _async_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                request_id, frame, params = self._pending
+                self._pending = None
+            try:
+                scale = self._send(request_id, frame, params)
+                result = self._receive(scale)
+            except (EOFError, OSError):
+                with self._cond:
+                    self._running = False
+                return
+            with self._cond:
+                self._latest = result
+
+    def is_connected(self):
+        return self._running
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        try:
+            self._conn.send(('close',))
+        except (OSError, EOFError):
+            pass
+        self._conn.close()
+
+
+def start_server_process(backend=DEFAULT_BACKEND):
+    """Inicia este módulo como processo independente (continua vivo entre jogos)."""
+    script = os.path.abspath(__file__)
+    kwargs = {'cwd': os.path.dirname(script)}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen([sys.executable, script, backend], **kwargs)
+
+
+# --- Início do Servidor ---
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BACKEND
+    if backend not in YOLO_BACKENDS:
+        print(f"❌ Backend inválido: {backend} (use um de {', '.join(YOLO_BACKENDS)})")
+        sys.exit(1)
+    try:
+        DetectionServer(backend=backend).serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Servidor YOLO encerrado")
@@ -18,7 +18,13 @@ import random
 import time
 import mediapipe as mp
 import numpy as np
-import math
+from captura_camera import CameraStream
+from preview_camera import CameraPreview
+from dirty_rects import ScreenUpdater
+from cache_texto import render_text
+from inferencia_async import resize_for_inference
+from landmarks_pose import PoseFeatures
+from classificador_poses import PoseClassifier, MATCH_CONFIDENCE
 
 # --- Configurações ---
 SCREEN_WIDTH = 1400
@@ -26,6 +32,8 @@ SCREEN_HEIGHT = 900
 WEBCAM_WIDTH = 640
 WEBCAM_HEIGHT = 480
 FPS = 30
+INFERENCE_WIDTH = 480  # Largura do frame entregue ao MediaPipe (o preview da webcam continua em resolução cheia)
+SHOW_POSE_HINTS = True  # Painel com a confiança de todas as poses ao lado da webcam
 
 # Cores vibrantes
 DARK_BG = (15, 20, 35)
@@ -46,6 +54,8 @@ MAX_ROUNDS = 10
 # --- Inicialização ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+webcam_preview = CameraPreview((WEBCAM_WIDTH * 1.5, WEBCAM_HEIGHT * 1.5))
+screen_updater = ScreenUpdater()  # Atualização parcial nas telas estáticas (F2 alterna)
 pygame.display.set_caption("🕺 Simon Diz - Jogo de Poses")
 clock = pygame.time.Clock()
 
@@ -66,178 +76,76 @@ pose = mp_pose.Pose(
 )
 
 # --- Definição de Poses ---
+# "rules": condições (atributo, '<' ou '>', limiar) sobre classificador_poses.FEATURE_NAMES,
+# todas obrigatórias; uma lista interna vale se qualquer condição dela valer
 POSES = {
     "T": {
         "name": "Letra T",
         "emoji": "🙆",
         "description": "Braços na horizontal",
-        "check": lambda lm: check_t_pose(lm)
+        "rules": [('left_elbow_angle', '>', 160), ('right_elbow_angle', '>', 160),
+                  ('left_wrist_to_elbow_y', '<', 0.1)]
     },
     "Y": {
         "name": "Letra Y",
         "emoji": "🙌",
         "description": "Braços para cima em V",
-        "check": lambda lm: check_y_pose(lm)
+        "rules": [('left_wrist_to_nose_y', '<', 0), ('right_wrist_to_nose_y', '<', 0)]
     },
     "squat": {
         "name": "Agachamento",
         "emoji": "🧘",
         "description": "Agache com braços para frente",
-        "check": lambda lm: check_squat(lm)
+        "rules": [('left_knee_angle', '<', 120)]
     },
     "warrior": {
         "name": "Guerreiro",
         "emoji": "🧘‍♂️",
         "description": "Uma perna para trás, braços abertos",
-        "check": lambda lm: check_warrior(lm)
+        "rules": [('ankle_gap_y', '>', 0.15), ('left_wrist_y', '<', 0.7), ('right_wrist_y', '<', 0.7)]
     },
     "star": {
         "name": "Estrela",
         "emoji": "⭐",
         "description": "Pernas e braços abertos",
-        "check": lambda lm: check_star(lm)
+        "rules": [('ankle_spread_x', '>', 0.3), ('wrist_spread_x', '>', 0.6)]
     },
     "flamingo": {
         "name": "Flamingo",
         "emoji": "🦩",
         "description": "Uma perna levantada",
-        "check": lambda lm: check_flamingo(lm)
+        "rules": [[('ankle_gap_y', '>', 0.2), ('knee_gap_y', '>', 0.15)]]
     },
     "airplane": {
         "name": "Avião",
         "emoji": "✈️",
         "description": "Inclinado com braços abertos",
-        "check": lambda lm: check_airplane(lm)
+        "rules": [('nose_to_hips_y', '<', -0.1)]
     },
     "dab": {
         "name": "Dab",
         "emoji": "💪",
         "description": "Dab clássico!",
-        "check": lambda lm: check_dab(lm)
+        "rules": [('left_wrist_to_nose', '<', 0.2)]
     }
 }
 
-# --- Funções de Detecção de Poses ---
-def get_angle(a, b, c):
-    """Calcula ângulo entre três pontos"""
-    radians = math.atan2(c[1] - b[1], c[0] - b[0]) - math.atan2(a[1] - b[1], a[0] - b[0])
-    angle = abs(math.degrees(radians))
-    if angle > 180:
-        angle = 360 - angle
-    return angle
-
-def check_t_pose(landmarks):
-    """Verifica pose em T"""
-    left_shoulder = [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x,
-                     landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y]
-    left_elbow = [landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].x,
-                  landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].y]
-    left_wrist = [landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x,
-                  landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y]
-    
-    right_shoulder = [landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].x,
-                      landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y]
-    right_elbow = [landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value].x,
-                   landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value].y]
-    right_wrist = [landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].x,
-                   landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].y]
-    
-    left_angle = get_angle(left_wrist, left_elbow, left_shoulder)
-    right_angle = get_angle(right_wrist, right_elbow, right_shoulder)
-    
-    # Braços devem estar retos (próximo de 180°) e na horizontal
-    return left_angle > 160 and right_angle > 160 and left_wrist[1] < left_elbow[1] + 0.1
-
-def check_y_pose(landmarks):
-    """Verifica pose em Y"""
-    nose = [landmarks[mp_pose.PoseLandmark.NOSE.value].x,
-            landmarks[mp_pose.PoseLandmark.NOSE.value].y]
-    left_wrist = [landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x,
-                  landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y]
-    right_wrist = [landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].x,
-                   landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].y]
-    
-    # Mãos devem estar acima da cabeça
-    return left_wrist[1] < nose[1] and right_wrist[1] < nose[1]
-
-def check_squat(landmarks):
-    """Verifica agachamento"""
-    left_hip = [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x,
-                landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y]
-    left_knee = [landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].x,
-                 landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y]
-    left_ankle = [landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].x,
-                  landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y]
-    
-    angle = get_angle(left_hip, left_knee, left_ankle)
-    # Joelho dobrado (menos de 120°)
-    return angle < 120
-
-def check_warrior(landmarks):
-    """Verifica pose do guerreiro"""
-    left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y
-    right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y
-    left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y
-    right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].y
-    
-    # Uma perna mais atrás e braços abertos
-    return abs(left_ankle - right_ankle) > 0.15 and left_wrist < 0.7 and right_wrist < 0.7
-
-def check_star(landmarks):
-    """Verifica pose em estrela"""
-    left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].x
-    right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].x
-    left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x
-    right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].x
-    
-    # Pernas e braços bem abertos
-    leg_spread = abs(left_ankle - right_ankle)
-    arm_spread = abs(left_wrist - right_wrist)
-    return leg_spread > 0.3 and arm_spread > 0.6
-
-def check_flamingo(landmarks):
-    """Verifica pose de flamingo"""
-    left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y
-    right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y
-    left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y
-    right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value].y
-    
-    # Uma perna levantada
-    return abs(left_ankle - right_ankle) > 0.2 or abs(left_knee - right_knee) > 0.15
-
-def check_airplane(landmarks):
-    """Verifica pose de avião"""
-    nose = landmarks[mp_pose.PoseLandmark.NOSE.value].y
-    hip = (landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y + 
-           landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y) / 2
-    
-    # Corpo inclinado para frente
-    return nose < hip - 0.1
-
-def check_dab(landmarks):
-    """Verifica dab"""
-    left_wrist = [landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x,
-                  landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y]
-    nose = [landmarks[mp_pose.PoseLandmark.NOSE.value].x,
-            landmarks[mp_pose.PoseLandmark.NOSE.value].y]
-    
-    # Uma mão perto do rosto
-    distance = math.sqrt((left_wrist[0] - nose[0])**2 + (left_wrist[1] - nose[1])**2)
-    return distance < 0.2
+# Pontua as oito poses de uma vez a partir de um único vetor de atributos por frame
+pose_classifier = PoseClassifier({key: info["rules"] for key, info in POSES.items()})
 
 # --- Funções de UI ---
 def draw_rounded_rect(surface, color, rect, radius=20):
     pygame.draw.rect(surface, color, rect, border_radius=radius)
 
 def draw_text(surface, text, font, color, x, y, center=True):
-    text_obj = font.render(text, True, (0, 0, 0))
+    text_obj = render_text(font, text, (0, 0, 0))
     if center:
         rect = text_obj.get_rect(center=(x+3, y+3))
     else:
         rect = (x+3, y+3)
     surface.blit(text_obj, rect)
     
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     if center:
         rect = text_obj.get_rect(center=(x, y))
     else:
@@ -256,6 +164,24 @@ def draw_progress_bar(surface, x, y, width, height, progress, color=ACCENT_BLUE)
         prog_width = int(width * progress)
         draw_rounded_rect(surface, color, (x, y, prog_width, height), 10)
 
+def draw_pose_hints(surface, confidences, current_pose):
+    """Painel lateral com a confiança do classificador para cada pose"""
+    x = SCREEN_WIDTH - 205
+    y = 180
+    draw_card(surface, x, y, 190, 460, CARD_BG)
+    draw_text(surface, "Parece:", font_tiny, TEXT_SECONDARY, x + 95, y + 25)
+    
+    best_pose, _ = pose_classifier.best(confidences)
+    for i, (key, confidence) in enumerate(confidences.items()):
+        row_y = y + 55 + i * 50
+        if key == current_pose:
+            color = ACCENT_GREEN if confidence > MATCH_CONFIDENCE else ACCENT_YELLOW
+        else:
+            color = ACCENT_BLUE if key == best_pose and confidence > MATCH_CONFIDENCE else TEXT_SECONDARY
+        name_color = color if key == current_pose else TEXT_PRIMARY
+        draw_text(surface, POSES[key]["name"], font_tiny, name_color, x + 15, row_y, center=False)
+        draw_progress_bar(surface, x + 15, row_y + 25, 160, 10, confidence, color)
+
 # --- Telas ---
 def main_menu():
     """Menu principal"""
@@ -317,14 +243,11 @@ def main_menu():
 
 def game_loop():
     """Loop principal do jogo"""
-    cap = cv2.VideoCapture(0)
+    cap = CameraStream(0, width=WEBCAM_WIDTH, height=WEBCAM_HEIGHT)
     if not cap.isOpened():
         print("❌ Erro ao abrir câmera")
         return 0
     
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_HEIGHT)
-    
     # Estado do jogo
     score = 0
     round_num = 0
@@ -358,10 +281,11 @@ def game_loop():
             break
         
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(resize_for_inference(frame, INFERENCE_WIDTH), cv2.COLOR_BGR2RGB)
         results = pose.process(frame_rgb)
         
-        # Detecta pose
+        # Classifica todas as poses de uma vez (a confiança de cada uma alimenta as dicas)
+        confidences = pose_classifier.classify(PoseFeatures.from_results(results))
         pose_correct = False
         if results.pose_landmarks:
             mp_drawing.draw_landmarks(
@@ -370,8 +294,7 @@ def game_loop():
                 mp_drawing.DrawingSpec(color=(0, 255, 255), thickness=2)
             )
             
-            pose_info = POSES[current_pose]
-            pose_correct = pose_info["check"](results.pose_landmarks.landmark)
+            pose_correct = confidences[current_pose] > MATCH_CONFIDENCE
             
             if pose_correct:
                 pose_detected_frames += 1
@@ -396,8 +319,7 @@ def game_loop():
         screen.fill(DARK_BG)
         
         # Webcam (grande, centralizada)
-        frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        frame_surface = pygame.transform.scale(frame_surface, (WEBCAM_WIDTH * 1.5, WEBCAM_HEIGHT * 1.5))
+        frame_surface = webcam_preview.update(frame)
         webcam_x = (SCREEN_WIDTH - WEBCAM_WIDTH * 1.5) // 2
         webcam_y = 180
         screen.blit(frame_surface, (webcam_x, webcam_y))
@@ -436,6 +358,10 @@ def game_loop():
                 progress = min(1.0, pose_detected_frames / 15)
                 draw_progress_bar(screen, 70, card_y + 15, 310, 15, progress, ACCENT_GREEN)
         
+        # Dicas: confiança de todas as poses
+        if SHOW_POSE_HINTS:
+            draw_pose_hints(screen, confidences, current_pose)
+        
         # Feedback
         if feedback and (time.time() - feedback_time < 1.5):
             feedback_color = ACCENT_GREEN if "ACERTOU" in feedback else ACCENT_RED
@@ -456,8 +382,10 @@ def show_results(score):
     max_score = MAX_ROUNDS * 100
     accuracy = (score / max_score) * 100 if max_score > 0 else 0
     
+    screen_updater.invalidate()  # Tela estática: só o primeiro frame é enviado inteiro
     while True:
         for event in pygame.event.get():
+            screen_updater.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -508,7 +436,7 @@ def show_results(score):
         draw_text(screen, "ESPAÇO para jogar novamente  |  ESC para sair", 
                   font_small, TEXT_SECONDARY, SCREEN_WIDTH//2, card_y + 560)
         
-        pygame.display.flip()
+        screen_updater.present()
         clock.tick(FPS)
 
 # --- Main ---
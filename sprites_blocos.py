@@ -0,0 +1,100 @@
+"""
+Sprites pré-renderizados dos blocos do quebra_blocos
+Cada bloco criava dois Surfaces SRCALPHA por frame (glow pulsante e animação de
+acerto) e redesenhava corpo, barra de HP e borda. O glow já era arredondado
+para pixels inteiros (0 a 10) e a animação de acerto anda em passos de 0.05,
+então cada combinação (cor, pulso, HP) e (cor, passo do acerto) vira um sprite
+criado uma vez, e a parede inteira é desenhada com um único surface.blits().
+
+Uso:
+    block_sprites = BlockSprites(BLOCK_WIDTH, BLOCK_HEIGHT, TEXT_PRIMARY)
+    ...
+    phase = time.time() * 2          # Fase do pulso, uma vez por frame
+    for block in blocks:
+        block.update(phase)
+    block_sprites.draw(screen, blocks)
+"""
+
+import pygame
+
+# --- Configurações ---
+HIT_LEVELS = 20  # Passos da animação de acerto (hit_animation cai 0.05 por frame)
+GLOW_ALPHA = 40  # Transparência do glow pulsante
+BORDER_RADIUS = 8
+
+
+class BlockSprites:
+    """Cache de sprites de bloco por (cor, pulso, HP) e da animação de acerto por (cor, passo)."""
+
+    def __init__(self, width, height, border_color):
+        self.width = width
+        self.height = height
+        self.border_color = border_color
+        self._bodies = {}
+        self._hits = {}
+
+    @staticmethod
+    def _new_surface(size):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def body(self, color, pulse, hp, max_hp):
+        """Glow de `pulse` px + corpo + barra de HP + borda; o sprite começa em (x - pulse, y - pulse)."""
+        key = (color, pulse, hp, max_hp)
+        sprite = self._bodies.get(key)
+        if sprite is None:
+            sprite = self._bodies[key] = self._build_body(color, pulse, hp, max_hp)
+        return sprite
+
+    def _build_body(self, color, pulse, hp, max_hp):
+        w, h = self.width, self.height
+        surface = self._new_surface((w + pulse * 2, h + pulse * 2))
+        if pulse > 0:
+            pygame.draw.rect(surface, (*color, GLOW_ALPHA), surface.get_rect(), border_radius=BORDER_RADIUS)
+
+        pygame.draw.rect(surface, color, (pulse, pulse, w, h), border_radius=BORDER_RADIUS)
+        if hp < max_hp:
+            hp_width = (w - 10) * (hp / max_hp)
+            pygame.draw.rect(surface, (50, 50, 50), (pulse + 5, pulse + 5, w - 10, 5), border_radius=2)
+            pygame.draw.rect(surface, self.border_color, (pulse + 5, pulse + 5, int(hp_width), 5), border_radius=2)
+        pygame.draw.rect(surface, self.border_color, (pulse, pulse, w, h), 2, border_radius=BORDER_RADIUS)
+        return surface
+
+    def hit(self, color, hit_animation):
+        """Sprite da animação de acerto e o deslocamento dele em relação a (x, y)."""
+        level = min(HIT_LEVELS, max(1, round(hit_animation * HIT_LEVELS)))
+        key = (color, level)
+        cached = self._hits.get(key)
+        if cached is None:
+            cached = self._hits[key] = self._build_hit(color, level / HIT_LEVELS)
+        return cached
+
+    def _build_hit(self, color, hit_animation):
+        scale = 1 + hit_animation * 0.2
+        size = (int(self.width * scale), int(self.height * scale))
+        surface = self._new_surface(size)
+        pygame.draw.rect(surface, (*color, int(255 * (1 - hit_animation))),
+                         (0, 0, *size), border_radius=BORDER_RADIUS)
+        return surface, int((self.width * (scale - 1)) / 2)
+
+    def draw(self, surface, blocks):
+        """Desenha todos os blocos (na ordem dada) com um único blits()."""
+        sequence = []
+        for block in blocks:
+            if block.hit_animation > 0:
+                sprite, offset = self.hit(block.color, block.hit_animation)
+                sequence.append((sprite, (int(block.x) - offset, int(block.y) - offset)))
+            pulse = int(block.pulse)
+            sprite = self.body(block.color, pulse, block.hp, block.max_hp)
+            sequence.append((sprite, (int(block.x) - pulse, int(block.y) - pulse)))
+        if sequence:
+            surface.blits(sequence, False)
+
+    def __len__(self):
+        return len(self._bodies) + len(self._hits)
+
+    def clear(self):
+        self._bodies.clear()
+        self._hits.clear()
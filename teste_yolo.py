@@ -4,16 +4,21 @@ Mostra todos os objetos detectados em tempo real com estatísticas
 """
 
 import cv2
+import numpy as np
+import sys
 import time
-from ultralytics import YOLO
-import torch
+from captura_camera import CameraStream
+from servidor_yolo import DetectionClient
 
-# Carrega o modelo
-print("Carregando modelo YOLO...")
-model = YOLO('yolov5su.pt')
-device = 'cuda' if torch.cuda.is_available() else 'cpu'
-model.to(device)
-print(f"Modelo carregado! Usando: {device}")
+# Conecta ao servidor de detecção (modelo já carregado, ou iniciado agora)
+# Backend do servidor: torch, onnx ou onnx-int8 (ver backends_yolo.py)
+BACKEND = sys.argv[1] if len(sys.argv) > 1 else 'torch'
+INFERENCE_WIDTH = 640  # Largura do frame enviado ao YOLO (a janela mostra 1280x720)
+
+print("Conectando ao servidor YOLO...")
+detector = DetectionClient(backend=BACKEND, inference_width=INFERENCE_WIDTH)
+device = detector.device
+print(f"Servidor conectado! Usando: {device} ({detector.backend})")
 
 # Configurações
 CONFIDENCE = 0.35
@@ -22,9 +27,7 @@ IMGSZ = 640
 
 # Abre a webcam
 print("\nAbrindo webcam...")
-cap = cv2.VideoCapture(0)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+cap = CameraStream(0, width=1280, height=720)
 
 if not cap.isOpened():
     print("❌ Erro ao abrir a webcam!")
@@ -41,6 +44,8 @@ print("="*60 + "\n")
 frame_count = 0
 start_time = time.time()
 detection_count = {}
+detection_updates = 0  # Resultados novos recebidos do servidor
+last_result_id = 0
 
 try:
     while True:
@@ -52,51 +57,46 @@ try:
         # Pré-processamento
         processed_frame = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
         
-        # Detecção
-        results = model(
+        # Detecção (assíncrona: usa o resultado mais recente do servidor)
+        detector.submit(
             processed_frame,
             conf=CONFIDENCE,
             iou=IOU,
-            imgsz=IMGSZ,
-            verbose=False,
-            half=True if device == 'cuda' else False
+            imgsz=IMGSZ
         )
+        detection = detector.latest()
+        new_result = detection is not None and detection.request_id != last_result_id
+        if new_result:
+            last_result_id = detection.request_id
+            detection_updates += 1
+        
+        # Processa detecções (array estruturado: xyxy, conf, cls, area)
+        detected_objects = detection.as_array() if detection is not None else []
+        
+        # Atualiza contador (uma vez por resultado novo)
+        if new_result and len(detected_objects):
+            classes, counts = np.unique(detected_objects['cls'], return_counts=True)
+            for cls_id, count in zip(classes.tolist(), counts.tolist()):
+                class_name = detector.names[cls_id]
+                detection_count[class_name] = detection_count.get(class_name, 0) + count
         
-        # Processa detecções
-        detected_objects = []
-        for r in results:
-            for box in r.boxes:
-                cls_id = int(box.cls[0])
-                class_name = model.names[cls_id]
-                conf = float(box.conf[0])
-                
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                box_area = (x2 - x1) * (y2 - y1)
-                
-                detected_objects.append({
-                    'class': class_name,
-                    'conf': conf,
-                    'area': box_area,
-                    'bbox': (x1, y1, x2, y2)
-                })
-                
-                # Atualiza contador
-                if class_name not in detection_count:
-                    detection_count[class_name] = 0
-                detection_count[class_name] += 1
-                
-                # Desenha no frame
-                color = (0, 255, 0) if conf >= 0.5 else (0, 165, 255)  # Verde ou Laranja
-                thickness = 3 if conf >= 0.5 else 2
-                
-                cv2.rectangle(processed_frame, (x1, y1), (x2, y2), color, thickness)
-                
-                # Label com fundo
-                label = f"{class_name}: {conf:.2f}"
-                (text_w, text_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
-                cv2.rectangle(processed_frame, (x1, y1 - text_h - 10), (x1 + text_w + 5, y1), color, -1)
-                cv2.putText(processed_frame, label, (x1 + 2, y1 - 5), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        for obj in detected_objects:
+            x1, y1, x2, y2 = obj['xyxy'].tolist()
+            class_name = detector.names[int(obj['cls'])]
+            conf = float(obj['conf'])
+            
+            # Desenha no frame
+            color = (0, 255, 0) if conf >= 0.5 else (0, 165, 255)  # Verde ou Laranja
+            thickness = 3 if conf >= 0.5 else 2
+            
+            cv2.rectangle(processed_frame, (x1, y1), (x2, y2), color, thickness)
+            
+            # Label com fundo
+            label = f"{class_name}: {conf:.2f}"
+            (text_w, text_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+            cv2.rectangle(processed_frame, (x1, y1 - text_h - 10), (x1 + text_w + 5, y1), color, -1)
+            cv2.putText(processed_frame, label, (x1 + 2, y1 - 5), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
         # Calcula FPS
         frame_count += 1
@@ -106,20 +106,20 @@ try:
             
             # Mostra estatísticas no console
             print(f"\n{'='*60}")
-            print(f"⏱️  FPS: {fps:.1f}")
+            print(f"⏱️  FPS: {fps:.1f}  |  Detecções/s: {detection_updates / elapsed:.1f}")
             print(f"🎯 Detecções neste frame: {len(detected_objects)}")
-            if detected_objects:
+            if len(detected_objects):
                 print(f"\n📦 Objetos detectados:")
                 for obj in detected_objects:
-                    print(f"  • {obj['class']:20} Confiança: {obj['conf']:.2%}  Área: {obj['area']:6d}px")
+                    print(f"  • {detector.names[int(obj['cls'])]:20} Confiança: {obj['conf']:.2%}  Área: {obj['area']:6d}px")
         
         # Adiciona info no frame
         elapsed = time.time() - start_time
         fps = frame_count / elapsed if elapsed > 0 else 0
         
         info_y = 30
-        cv2.rectangle(processed_frame, (10, 10), (400, info_y + 80), (0, 0, 0), -1)
-        cv2.putText(processed_frame, f"FPS: {fps:.1f}", (20, info_y), 
+        cv2.rectangle(processed_frame, (10, 10), (480, info_y + 80), (0, 0, 0), -1)
+        cv2.putText(processed_frame, f"FPS: {fps:.1f}  YOLO: {detection_updates / elapsed if elapsed > 0 else 0:.1f}/s", (20, info_y), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         cv2.putText(processed_frame, f"Detectados: {len(detected_objects)}", (20, info_y + 30), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
@@ -168,10 +168,15 @@ finally:
     print(f"\n⏱️  Tempo total: {elapsed:.1f}s")
     print(f"🎬 Frames processados: {frame_count}")
     print(f"📊 FPS médio: {fps_avg:.1f}")
+    print(f"🎯 Detecções/s: {detection_updates / elapsed if elapsed > 0 else 0:.1f}")
     print(f"💻 Device: {device.upper()}")
+    camera_stats = cap.stats()
+    print(f"📷 Câmera: {camera_stats['captured']} capturados, {camera_stats['dropped']} descartados, "
+          f"{camera_stats['capture_fps']:.1f} FPS de captura")
     print("\n" + "="*60)
     
     cap.release()
+    detector.close()
     cv2.destroyAllWindows()
     print("\n✅ Teste finalizado!")
 
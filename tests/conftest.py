@@ -0,0 +1,50 @@
+"""Captura falsa compartilhada pelos testes de câmera e inferência."""
+
+import time
+
+import numpy as np
+import pytest
+
+import captura_camera
+
+
+class FakeCapture:
+    """cv2.VideoCapture falso: entrega `frames` frames e depois só falhas."""
+
+    def __init__(self, frames):
+        self.remaining = frames
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        time.sleep(0.001)
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        frame = np.full((4, 6, 3), self.remaining % 256, dtype=np.uint8)
+        if image is not None:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+@pytest.fixture
+def fake_capture(monkeypatch):
+    def install(frames):
+        monkeypatch.setattr(captura_camera.cv2, 'VideoCapture', lambda src: FakeCapture(frames))
+    return install
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
@@ -0,0 +1,15 @@
+"""Nomes das classes do backend ONNX."""
+
+import pytest
+
+from backends_yolo import _class_names
+
+
+def test_names_from_onnx_metadata():
+    metadata = {'names': "{0: 'person', 1: 'bicycle'}"}
+    assert _class_names(metadata, 'yolov5su.pt', 'yolov5su_640.onnx') == {0: 'person', 1: 'bicycle'}
+
+
+def test_missing_names_without_pt_model_fails_at_load(tmp_path):
+    with pytest.raises(ValueError, match="sem nomes de classes"):
+        _class_names({}, str(tmp_path / 'ausente.pt'), str(tmp_path / 'modelo.onnx'))
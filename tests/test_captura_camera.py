@@ -0,0 +1,34 @@
+"""CameraStream com uma captura falsa que para de entregar frames."""
+
+import time
+
+from captura_camera import CameraStream
+from conftest import wait_until
+
+
+def test_is_opened_turns_false_when_camera_is_lost(fake_capture):
+    fake_capture(5)
+    cap = CameraStream(0)
+    assert cap.isOpened()
+    assert wait_until(lambda: not cap.isOpened())
+    assert cap.read() == (False, None)
+    cap.release()
+
+
+def test_is_opened_false_after_release(fake_capture):
+    fake_capture(10_000)
+    cap = CameraStream(0)
+    assert cap.isOpened()
+    cap.release()
+    assert not cap.isOpened()
+
+
+def test_read_latest_timed_returns_capture_time(fake_capture):
+    fake_capture(5)
+    cap = CameraStream(0)
+    assert wait_until(lambda: not cap.isOpened())
+    time.sleep(0.1)
+    frame_id, frame, captured_at = cap.read_latest_timed(0, timeout=0.1)
+    assert frame_id == 5 and frame is not None
+    assert time.perf_counter() - captured_at >= 0.1  # Momento da captura, não da leitura
+    cap.release()
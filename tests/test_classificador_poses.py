@@ -0,0 +1,84 @@
+"""Classificador de poses contra as antigas funções check_* do Simon Diz."""
+
+import ast
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from classificador_poses import PoseClassifier, MATCH_CONFIDENCE
+from landmarks_pose import (PoseFeatures, NUM_LANDMARKS, NOSE, LEFT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+                            LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE)
+
+
+def simon_rules():
+    """Regras de POSES lidas do simon_diz.py sem importá-lo (ele abre câmera e janela)."""
+    source = Path(__file__).resolve().parent.parent / 'simon_diz.py'
+    for node in ast.parse(source.read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'POSES' for t in node.targets):
+            poses = ast.literal_eval(node.value)
+            return {key: info['rules'] for key, info in poses.items()}
+    raise AssertionError("POSES não encontrado no simon_diz.py")
+
+
+# Funções de detecção de antes do classificador (uma por pose)
+OLD_CHECKS = {
+    'T': lambda f: (f.angle('left_elbow') > 160 and f.angle('right_elbow') > 160 and
+                    f.y[LEFT_WRIST] < f.y[LEFT_ELBOW] + 0.1),
+    'Y': lambda f: f.y[LEFT_WRIST] < f.y[NOSE] and f.y[RIGHT_WRIST] < f.y[NOSE],
+    'squat': lambda f: f.angle('left_knee') < 120,
+    'warrior': lambda f: (abs(f.y[LEFT_ANKLE] - f.y[RIGHT_ANKLE]) > 0.15 and
+                          f.y[LEFT_WRIST] < 0.7 and f.y[RIGHT_WRIST] < 0.7),
+    'star': lambda f: (abs(f.x[LEFT_ANKLE] - f.x[RIGHT_ANKLE]) > 0.3 and
+                       abs(f.x[LEFT_WRIST] - f.x[RIGHT_WRIST]) > 0.6),
+    'flamingo': lambda f: (abs(f.y[LEFT_ANKLE] - f.y[RIGHT_ANKLE]) > 0.2 or
+                           abs(f.y[LEFT_KNEE] - f.y[RIGHT_KNEE]) > 0.15),
+    'airplane': lambda f: f.y[NOSE] < (f.y[LEFT_HIP] + f.y[RIGHT_HIP]) / 2 - 0.1,
+    'dab': lambda f: f.distance(LEFT_WRIST, NOSE) < 0.2,
+}
+
+
+def random_poses(count, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        points = rng.uniform(0, 1, (NUM_LANDMARKS, 4)).astype(np.float32)
+        yield PoseFeatures(points)
+
+
+def test_matches_old_check_functions():
+    rules = simon_rules()
+    assert set(rules) == set(OLD_CHECKS)
+    classifier = PoseClassifier(rules)
+
+    outcomes = {name: set() for name in rules}
+    for pose in random_poses(2000):
+        confidences = classifier.classify(pose)
+        for name, check in OLD_CHECKS.items():
+            expected = bool(check(pose))
+            assert (confidences[name] > MATCH_CONFIDENCE) == expected, name
+            outcomes[name].add(expected)
+
+    # Cada pose foi vista feita e não feita pelo menos uma vez
+    assert all(seen == {True, False} for seen in outcomes.values()), outcomes
+
+
+def test_all_nan_pose_scores_zero():
+    classifier = PoseClassifier(simon_rules())
+    pose = PoseFeatures(np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32))
+    assert classifier.classify(pose) == dict.fromkeys(classifier.names, 0.0)
+
+
+def test_no_pose_scores_zero():
+    classifier = PoseClassifier(simon_rules())
+    assert classifier.classify(None) == dict.fromkeys(classifier.names, 0.0)
+
+
+@pytest.mark.parametrize("rules", [
+    {'vazia': [[]]},
+    {'vazia': [('left_wrist_y', '<', 0.5), []]},
+    {'sem_regras': []},
+    {'operador': [('left_wrist_y', '=', 0.5)]},
+])
+def test_invalid_rules_raise(rules):
+    with pytest.raises(ValueError):
+        PoseClassifier(rules)
@@ -0,0 +1,102 @@
+"""BlockGrid.sweep contra a força bruta (todos os blocos numa lista)."""
+
+import random
+
+import pytest
+
+from benchmark_colisao_blocos import SimBlock, BLOCK_WIDTH, BLOCK_HEIGHT, BALL_RADIUS
+from grade_blocos import BlockGrid, _segment_box
+
+ROWS, COLS = 6, 14
+WIDTH, HEIGHT = COLS * BLOCK_WIDTH, (ROWS + 4) * BLOCK_HEIGHT
+
+
+def make_wall(rng, keep=0.6):
+    """Grade com parte dos blocos já quebrada, e a lista dos que sobraram (ordem linha a linha)."""
+    grid = BlockGrid(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT, ROWS, COLS)
+    blocks = []
+    for r in range(ROWS):
+        for c in range(COLS):
+            block = SimBlock(c * BLOCK_WIDTH, r * BLOCK_HEIGHT)
+            grid.add(block, r, c)
+            if rng.random() < keep:
+                blocks.append(block)
+            else:
+                grid.remove(block)
+    return grid, blocks
+
+
+def brute_sweep(blocks, x0, y0, x1, y1, radius):
+    """Trecho testado contra todos os blocos; vale o menor t."""
+    best = None
+    for block in blocks:
+        hit = _segment_box(x0, y0, x1 - x0, y1 - y0,
+                           block.x - radius, block.y - radius,
+                           block.x + block.width + radius, block.y + block.height + radius)
+        if hit is not None and (best is None or hit[0] < best[1]):
+            best = (block, hit[0], hit[1])
+    return best
+
+
+def list_overlaps(blocks, x, y):
+    """Teste discreto da versão com lista (benchmark_colisao_blocos.run_list)."""
+    return [block for block in blocks
+            if x + BALL_RADIUS > block.x and x - BALL_RADIUS < block.x + block.width and
+            y + BALL_RADIUS > block.y and y - BALL_RADIUS < block.y + block.height]
+
+
+def random_point(rng):
+    return rng.uniform(-20, WIDTH + 20), rng.uniform(-20, HEIGHT + 20)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sweep_matches_brute_force(seed):
+    rng = random.Random(seed)
+    grid, blocks = make_wall(rng)
+    assert len(grid) == len(blocks)
+
+    hits = 0
+    for _ in range(3000):
+        (x0, y0), (x1, y1) = random_point(rng), random_point(rng)
+        expected = brute_sweep(blocks, x0, y0, x1, y1, BALL_RADIUS)
+        assert grid.sweep(x0, y0, x1, y1, BALL_RADIUS) == expected
+        hits += expected is not None
+    assert hits > 100
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sweep_catches_every_overlap_of_the_list_check(seed):
+    """Passos curtos saindo de fora dos blocos: a lista achar colisão implica a varredura achar."""
+    rng = random.Random(seed)
+    grid, blocks = make_wall(rng)
+
+    overlaps = 0
+    for _ in range(3000):
+        x0, y0 = random_point(rng)
+        if list_overlaps(blocks, x0, y0):
+            continue
+        x1, y1 = x0 + rng.uniform(-8, 8), y0 + rng.uniform(-8, 8)
+        hit = grid.sweep(x0, y0, x1, y1, BALL_RADIUS)
+        if list_overlaps(blocks, x1, y1):
+            overlaps += 1
+            assert hit is not None
+        if hit is None:
+            assert not list_overlaps(blocks, x1, y1)
+    assert overlaps > 20
+
+
+def test_fast_ball_does_not_tunnel():
+    grid = BlockGrid(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT, 1, 1)
+    block = SimBlock(0, 0)
+    grid.add(block, 0, 0)
+
+    # Atravessa o bloco inteiro num único passo: a lista não vê nada nas pontas
+    x0, y0, x1, y1 = 45, 80, 45, -60
+    assert not list_overlaps([block], x0, y0) and not list_overlaps([block], x1, y1)
+    hit_block, t, axis = grid.sweep(x0, y0, x1, y1, BALL_RADIUS)
+    assert hit_block is block and axis == 'y'
+    assert t == pytest.approx((80 - (BLOCK_HEIGHT + BALL_RADIUS)) / 140)
+
+    grid.remove(block)
+    assert len(grid) == 0
+    assert grid.sweep(x0, y0, x1, y1, BALL_RADIUS) is None
@@ -0,0 +1,58 @@
+"""SpatialHash contra BruteForce (todos contra todos) com círculos aleatórios."""
+
+import math
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from hash_espacial import SpatialHash, BruteForce
+
+
+@dataclass(eq=False)
+class Circle:
+    x: float
+    y: float
+    radius: float
+
+
+def overlaps(target, projectile):
+    return math.hypot(target.x - projectile.x, target.y - projectile.y) < target.radius + projectile.radius
+
+
+def random_circles(rng, count, max_radius):
+    return [Circle(rng.uniform(-50, 850), rng.uniform(-50, 650), rng.uniform(1, max_radius))
+            for _ in range(count)]
+
+
+def hits(grid, targets, projectiles, remove_hit):
+    grid.clear()
+    for target in targets:
+        grid.insert(target, target.x, target.y, target.radius)
+    pairs = []
+    for projectile, target in grid.first_hits(projectiles, overlaps):
+        pairs.append((projectile, target))
+        if remove_hit:
+            grid.remove(target)
+    return pairs
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("remove_hit", [False, True])
+def test_first_hits_matches_brute_force(seed, remove_hit):
+    rng = random.Random(seed)
+    targets = random_circles(rng, 60, 60)
+    projectiles = random_circles(rng, 200, 8)
+
+    expected = hits(BruteForce(), targets, projectiles, remove_hit)
+    assert expected  # Os círculos se cruzam o bastante para haver acertos
+    assert hits(SpatialHash(cell_size=50), targets, projectiles, remove_hit) == expected
+
+
+def test_remove_takes_target_out_of_every_cell():
+    grid = SpatialHash(cell_size=10)
+    big = Circle(15, 15, 12)  # Cobre várias células
+    grid.insert(big, big.x, big.y, big.radius)
+    grid.remove(big)
+    assert len(grid) == 0
+    assert grid.query(15, 15, 30) == []
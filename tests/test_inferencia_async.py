@@ -0,0 +1,22 @@
+"""InferenceWorker quando a câmera para de entregar frames."""
+
+from captura_camera import CameraStream
+from conftest import wait_until
+from inferencia_async import InferenceWorker
+
+
+class FakeModel:
+    def process(self, rgb):
+        return None
+
+
+def test_worker_stops_when_camera_is_lost(fake_capture):
+    fake_capture(5)
+    cap = CameraStream(0)
+    worker = InferenceWorker(cap, FakeModel()).start()
+    try:
+        assert worker.wait_ready(timeout=2.0)
+        assert wait_until(lambda: not worker.is_running())
+    finally:
+        worker.stop()
+        cap.release()
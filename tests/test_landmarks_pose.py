@@ -0,0 +1,60 @@
+"""Ângulos e normalização vetorizados do landmarks_pose contra a conta ponto a ponto."""
+
+import math
+
+import numpy as np
+import pytest
+
+from landmarks_pose import (JOINT_ANGLES, NUM_LANDMARKS, TORSO, LEFT_SHOULDER, RIGHT_SHOULDER,
+                            LEFT_HIP, MIN_SHOULDER_DISTANCE, PoseFeatures, joint_angles, normalize,
+                            points_from_dict)
+
+
+def scalar_angle(a, b, c):
+    """Ângulo em b (graus, 0 a 180), como o get_angle antigo do simon_diz."""
+    radians = math.atan2(c[1] - b[1], c[0] - b[0]) - math.atan2(a[1] - b[1], a[0] - b[0])
+    angle = abs(math.degrees(radians))
+    return 360 - angle if angle > 180 else angle
+
+
+def random_points(seed):
+    return np.random.default_rng(seed).uniform(0, 1, (NUM_LANDMARKS, 4)).astype(np.float32)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_joint_angles_match_scalar_atan2(seed):
+    points = random_points(seed)
+    expected = [scalar_angle(*(points[i, :2].astype(float) for i in joint)) for joint in JOINT_ANGLES.values()]
+    angles = joint_angles(points)
+    np.testing.assert_allclose(angles, expected, atol=1e-3)
+    assert ((angles >= 0) & (angles <= 180)).all()
+
+    pose = PoseFeatures(points)
+    for name, value in zip(JOINT_ANGLES, expected):
+        assert pose.angle(name) == pytest.approx(value, abs=1e-3)
+
+
+def test_normalize_centers_and_scales_on_torso():
+    points = random_points(0)
+    normalized = normalize(points)
+    np.testing.assert_allclose(normalized[list(TORSO)].mean(axis=0), 0, atol=1e-5)
+    assert np.hypot(*(normalized[RIGHT_SHOULDER] - normalized[LEFT_SHOULDER])) == pytest.approx(1, abs=1e-5)
+
+
+def test_normalize_with_nan_torso_returns_raw_xy():
+    points = points_from_dict({0: (0.5, 0.2, 0.0), LEFT_SHOULDER: (0.4, 0.4, 0.0)})
+    normalized = normalize(points)
+    np.testing.assert_array_equal(normalized, points[:, :2])
+    assert normalized is not points[:, :2]
+    normalized[0] = 0  # Cópia: não altera os landmarks
+    assert points[0, 0] == pytest.approx(0.5)
+
+
+def test_normalize_with_coincident_shoulders():
+    points = random_points(1)
+    points[RIGHT_SHOULDER, :2] = points[LEFT_SHOULDER, :2]
+    normalized = normalize(points)
+    assert np.isfinite(normalized).all()
+    center = points[list(TORSO), :2].mean(axis=0)
+    np.testing.assert_allclose(normalized[LEFT_HIP], (points[LEFT_HIP, :2] - center) / MIN_SHOULDER_DISTANCE,
+                               rtol=1e-5)
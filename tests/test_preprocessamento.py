@@ -0,0 +1,30 @@
+"""Escolha do modo 'adaptive' a partir do ruído estimado em frames sintéticos."""
+
+import numpy as np
+import pytest
+
+from preprocessamento import FramePreprocessor
+
+# Ruído independente por canal BGR cai por este fator na conversão para cinza
+GRAY_NOISE_FACTOR = float(np.sqrt(0.114 ** 2 + 0.587 ** 2 + 0.299 ** 2))
+
+
+def noisy_frame(sigma, seed=0, size=(720, 1280)):
+    """Gradiente suave (sem textura) + ruído gaussiano de desvio `sigma`."""
+    h, w = size
+    gradient = np.linspace(90, 160, w, dtype=np.float32)[None, :].repeat(h, axis=0)
+    noise = np.random.default_rng(seed).normal(0, sigma, (h, w, 3))
+    return np.clip(gradient[..., None] + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("sigma", [5, 10, 20])
+def test_noise_estimate_tracks_sensor_noise(sigma):
+    noise = FramePreprocessor().measure(noisy_frame(sigma))['noise']
+    assert noise == pytest.approx(sigma * GRAY_NOISE_FACTOR, rel=0.15)
+
+
+@pytest.mark.parametrize("sigma, expected", [(0, 'none'), (6, 'temporal'), (20, 'downscaled')])
+def test_adaptive_branch(sigma, expected):
+    preprocessor = FramePreprocessor('adaptive')
+    preprocessor.process(noisy_frame(sigma))
+    assert preprocessor.last_mode == expected
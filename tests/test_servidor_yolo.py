@@ -0,0 +1,34 @@
+"""Chave de autenticação do servidor YOLO."""
+
+import os
+import stat
+
+import pytest
+
+from servidor_yolo import AUTHKEY_BYTES, load_authkey
+
+
+def test_authkey_created_once_and_reused(tmp_path):
+    path = tmp_path / 'modelos_cache' / 'servidor_yolo.key'
+    key = load_authkey(str(path))
+    assert len(key) == AUTHKEY_BYTES
+    assert load_authkey(str(path)) == key
+    assert os.listdir(path.parent) == ['servidor_yolo.key']  # Sem temporários sobrando
+
+
+def test_authkey_differs_between_installs(tmp_path):
+    assert load_authkey(str(tmp_path / 'a.key')) != load_authkey(str(tmp_path / 'b.key'))
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="permissões POSIX")
+def test_authkey_readable_only_by_owner(tmp_path):
+    path = tmp_path / 'servidor_yolo.key'
+    load_authkey(str(path))
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_broken_authkey_file_is_reported(tmp_path):
+    path = tmp_path / 'servidor_yolo.key'
+    path.write_bytes(b'curta')
+    with pytest.raises(RuntimeError):
+        load_authkey(str(path))